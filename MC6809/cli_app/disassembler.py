@@ -5,7 +5,7 @@ from typing import Annotated
 import tyro
 from cli_base.cli_tools.verbosity import setup_logging
 from cli_base.tyro_commands import TyroVerbosityArgType
-from rich import print  # noqa
+from rich import print
 
 from MC6809.cli_app import app
 from MC6809.components.mc6809_disassembler import Disassembly, iter_disassembly_lines
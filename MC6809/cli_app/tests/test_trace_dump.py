@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from bx_py_utils.test_utils.redirect import RedirectOut
+from cli_base.cli_tools.test_utils.assertion import assert_in
+from cli_base.cli_tools.test_utils.rich_test_utils import NoColorEnvRich
+
+from MC6809 import cli_app
+from MC6809.components.mc6809_trace_file import FLAG_EA, TraceWriter
+
+
+class TraceDumpCliTestCase(unittest.TestCase):
+    def test_happy_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            trace_file = Path(temp_dir, 'test.trace')
+            with trace_file.open('wb') as f:
+                writer = TraceWriter(f)
+                for address in (0x4000, 0x4003, 0x4006):
+                    writer.add_record(
+                        address, 0xbd, 3, b'\xbd\x40\x10',
+                        0, 0, 0, 0, 0, 0, 0, 0x7ffe, 0x4010,
+                        address * 2, 0x4010, 0, FLAG_EA,
+                    )
+                writer.close()
+
+            with NoColorEnvRich(), RedirectOut() as buffer:
+                cli_app.main(args=('trace-dump', str(trace_file), '--skip', '1', '--count', '1'))
+
+        self.assertEqual(buffer.stderr, '')
+        assert_in(
+            buffer.stdout,
+            parts=(
+                '4003| bd4010      JSR     ea:4010 ',
+                ' s=7ffe | ........ | cycles=32774',
+            ),
+        )
+        self.assertNotIn('4000|', buffer.stdout)
+        self.assertNotIn('4006|', buffer.stdout)
+
+    def test_profile(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            trace_file = Path(temp_dir, 'test.trace')
+            with trace_file.open('wb') as f:
+                writer = TraceWriter(f)
+                for address in (0x4000, 0x4003, 0x4003, 0x4003):
+                    writer.add_record(address, 0x12, 1, b'\x12', 0, 0, 0, 0, 0, 0, 0, 0, address + 1, 0, 0, 0, 0)
+                writer.close()
+
+            with NoColorEnvRich(), RedirectOut() as buffer:
+                cli_app.main(args=('trace-dump', str(trace_file), '--profile', '10'))
+
+        self.assertEqual(buffer.stderr, '')
+        assert_in(
+            buffer.stdout,
+            parts=(
+                '4003| NOP              3   75.0%',
+                '4000| NOP              1   25.0%',
+            ),
+        )
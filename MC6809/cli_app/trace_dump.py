@@ -0,0 +1,50 @@
+import itertools
+import logging
+import sys
+from pathlib import Path
+from typing import Annotated
+
+import tyro
+from cli_base.cli_tools.verbosity import setup_logging
+from cli_base.tyro_commands import TyroVerbosityArgType
+from rich import print
+
+from MC6809.cli_app import app
+from MC6809.components.mc6809_trace_file import (
+    format_trace_record,
+    get_op_address_profile,
+    iter_trace_records,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@app.command
+def trace_dump(
+    file: Annotated[Path, tyro.conf.arg(help='Binary trace file (created via the "trace_file" config)')],
+    /,
+    skip: Annotated[int, tyro.conf.arg(help='Skip the first records')] = 0,
+    count: Annotated[int, tyro.conf.arg(help='Max. number of records to print (0 = all)')] = 0,
+    profile: Annotated[int, tyro.conf.arg(help='Print only the N most traced/sampled addresses')] = 0,
+    verbosity: TyroVerbosityArgType = 1,
+):
+    """
+    Print a binary MC6809 trace file as text lines
+    """
+    setup_logging(verbosity=verbosity)
+
+    with file.open('rb') as f:
+        records = itertools.islice(iter_trace_records(f), skip, skip + count if count else None)
+        if profile:
+            profile_data = get_op_address_profile(records, count=profile)
+            total = sum(record_count for __, __, record_count in profile_data) or 1
+            for op_address, mnemonic, record_count in profile_data:
+                print(f'{op_address:04x}| {mnemonic:<7} {record_count:>10d} {record_count / total:7.1%}')
+            return
+
+        # Use no rich print(): The lines are formatted only on output and the trace can be huge
+        write = sys.stdout.write
+        for record in records:
+            write(format_trace_record(record))
+            write('\n')
@@ -11,7 +11,7 @@
 """
 
 
-from MC6809.components.MC6809data.MC6809_op_data import OP_DATA
+from MC6809.components.MC6809data.MC6809_op_data import INDEXED, INDEXED_WORD, OP_DATA
 
 
 def get_flat_opdata(OP_DATA):
@@ -31,6 +31,54 @@ MC6809OP_DATA_DICT = get_flat_opdata(OP_DATA)
 
 del OP_DATA
 
+
+def get_indexed_operand_bytes(postbyte):
+    """
+    Returns the number of operand bytes after a indexed addressing postbyte
+
+    >>> get_indexed_operand_bytes(0x04)  # 4,X (5-bit offset)
+    0
+    >>> get_indexed_operand_bytes(0x84)  # ,X
+    0
+    >>> get_indexed_operand_bytes(0x88)  # n,X (8-bit offset)
+    1
+    >>> get_indexed_operand_bytes(0xa9)  # n,Y (16-bit offset)
+    2
+    >>> get_indexed_operand_bytes(0x8c)  # n,PCR (8-bit offset)
+    1
+    >>> get_indexed_operand_bytes(0x9d)  # [n,PCR] (16-bit offset)
+    2
+    >>> get_indexed_operand_bytes(0x9f)  # [n] (extended indirect)
+    2
+    """
+    if not postbyte & 0x80:
+        return 0  # 5-bit offset in the postbyte
+    addr_mode = postbyte & 0x0f
+    if addr_mode in (0x8, 0xc):
+        return 1
+    if addr_mode in (0x9, 0xd, 0xf):
+        return 2
+    return 0
+
+
+def get_op_length(op_data, postbyte):
+    """
+    Returns the length of a instruction in bytes. The 'bytes' of the op data
+    contains the indexed postbyte, but not the operand bytes after it.
+    'postbyte' is the byte after the (one or two bytes) opcode.
+
+    >>> get_op_length(MC6809OP_DATA_DICT[0xa6], postbyte=0x88)  # LDA n,X
+    3
+    >>> get_op_length(MC6809OP_DATA_DICT[0x10ae], postbyte=0x9f)  # LDY [n]
+    5
+    >>> get_op_length(MC6809OP_DATA_DICT[0x86], postbyte=0x88)  # LDA #$88
+    2
+    """
+    if op_data["addr_mode"] in (INDEXED, INDEXED_WORD):
+        return op_data["bytes"] + get_indexed_operand_bytes(postbyte)
+    return op_data["bytes"]
+
+
 if __name__ == '__main__':
     import pprint
 
@@ -21,18 +21,28 @@
 """
 
 
+import functools
 import logging
 
 from MC6809.components.mc6809_addressing import AddressingMixin
 from MC6809.components.mc6809_base import CPUBase
+from MC6809.components.mc6809_block_cache import BlockCacheMixin
+from MC6809.components.mc6809_breakpoints import BreakpointMixin
+from MC6809.components.mc6809_cc_lazy import LazyConditionCodeRegisterMixin
+from MC6809.components.mc6809_cc_packed import PackedConditionCodeRegisterMixin
 from MC6809.components.mc6809_cc_register import CPUConditionCodeRegisterMixin
+from MC6809.components.mc6809_delay_loop import DelayLoopMixin
+from MC6809.components.mc6809_fast_engine import FastEngineMixin
+from MC6809.components.mc6809_idle_loop import IdleLoopMixin
 from MC6809.components.mc6809_interrupt import InterruptMixin
 from MC6809.components.mc6809_ops_branches import OpsBranchesMixin
 from MC6809.components.mc6809_ops_load_store import OpsLoadStoreMixin
 from MC6809.components.mc6809_ops_logic import OpsLogicalMixin
 from MC6809.components.mc6809_ops_test import OpsTestMixin
+from MC6809.components.mc6809_reverse import ReverseMixin
 from MC6809.components.mc6809_speedlimited import CPUSpeedLimitMixin
 from MC6809.components.mc6809_stack import StackMixin
+from MC6809.components.mc6809_table_dispatch import TableDispatchMixin
 from MC6809.components.mc6809_tools import CPUThreadedStatusMixin, CPUTypeAssertMixin
 from MC6809.core.cpu_control_server import CPUControlServerMixin
 
@@ -45,7 +55,7 @@ HTML_TRACE = False
 
 
 class CPU(CPUBase, AddressingMixin, StackMixin, InterruptMixin, OpsLoadStoreMixin, OpsBranchesMixin,
-          OpsTestMixin, OpsLogicalMixin, CPUConditionCodeRegisterMixin, CPUThreadedStatusMixin):
+          OpsTestMixin, OpsLogicalMixin, BreakpointMixin, CPUConditionCodeRegisterMixin, CPUThreadedStatusMixin):
 
     def to_speed_limit(self):
         return change_cpu(self, CPUSpeedLimit)
@@ -57,6 +67,54 @@ class CPUSpeedLimit(CPUSpeedLimitMixin, CPU):
         return change_cpu(self, CPU)
 
 
+class CPUTableDispatch(TableDispatchMixin, CPU):
+    """
+    CPU that dispatch the opcodes via dense lookup tables
+    """
+
+
+class CPUBlockCache(BlockCacheMixin, CPU):
+    """
+    CPU that run translated basic blocks
+    """
+
+
+class CPULazyFlags(LazyConditionCodeRegisterMixin, CPU):
+    """
+    CPU that calculate the condition code flags only on demand
+    """
+
+
+class CPUPackedFlags(PackedConditionCodeRegisterMixin, CPU):
+    """
+    CPU with one integer condition code register and 8-bit ALU flag tables
+    """
+
+
+class CPUFast(FastEngineMixin, CPU):
+    """
+    CPU that execute the ops via generated concrete functions per opcode
+    """
+
+
+class CPUIdleLoop(IdleLoopMixin, CPU):
+    """
+    CPU that fast-forward idle loops to the next cycle event
+    """
+
+
+class CPUDelayLoop(DelayLoopMixin, CPU):
+    """
+    CPU that calculates counted delay loops in one step
+    """
+
+
+class CPUReverse(ReverseMixin, CPU):
+    """
+    CPU with a undo log for step_back() and run_back_to_last_write()
+    """
+
+
 class CPUTypeAssert(CPUTypeAssertMixin, CPU):
     pass
 
@@ -69,8 +127,23 @@ def change_cpu(old_cpu, NewCPU):
     old_cpu.running = False
     cpu_state = old_cpu.get_state()
 
-    new_cpu = NewCPU(memory=old_cpu.memory, cfg=old_cpu.cfg)
+    # Continue the binary trace of the old CPU, without truncating cfg.trace_file:
+    new_cpu = NewCPU(memory=old_cpu.memory, cfg=old_cpu.cfg, trace=False, trace_writer=old_cpu.trace_writer)
+    old_cpu.trace_writer = None
     new_cpu.set_state(cpu_state)
+    new_cpu.last_op_address = old_cpu.last_op_address
+
+    # The interrupt lines belong to the periphery, e.g.: a asserted IRQ line stays asserted:
+    if "irq_enabled" in old_cpu.__dict__:
+        new_cpu.irq_enabled = old_cpu.irq_enabled
+    new_cpu.interrupt_lines = old_cpu.interrupt_lines
+    new_cpu._nmi_line = old_cpu._nmi_line
+    new_cpu.update_interrupts()
+
+    # Move the cycle events (e.g.: the sync callbacks of the periphery):
+    events = old_cpu.scheduler.get_events()
+    old_cpu.scheduler.clear()
+    new_cpu.scheduler.set_events(events)
 
     log.critical("Change CPU from %r to %r",
                  old_cpu.__class__.__name__,
@@ -78,3 +151,69 @@ def change_cpu(old_cpu, NewCPU):
                  )
 
     return new_cpu
+
+
+# The combinable CPU features of get_cpu_class() in the MRO order of the mixins:
+CPU_FEATURES = {
+    "reverse": ReverseMixin,  # First: Records every op via get_and_call_next_op()
+    "block_cache": BlockCacheMixin,  # Before the loop mixins: Its burst_run() stops before the deadlines
+    "table_dispatch": TableDispatchMixin,  # Before the loop mixins: The tables get the replaced branch ops
+    "idle_loop": IdleLoopMixin,
+    "delay_loop": DelayLoopMixin,
+    "fast": FastEngineMixin,
+    "lazy_flags": LazyConditionCodeRegisterMixin,
+    "packed_flags": PackedConditionCodeRegisterMixin,
+}
+
+# The features in one set can't be combined:
+EXCLUSIVE_CPU_FEATURES = (
+    {"fast", "lazy_flags", "packed_flags"},  # The condition code register storage (fast uses the packed one)
+    {"idle_loop", "delay_loop"},  # Both replace the BNE op
+    {"reverse", "block_cache"},  # The blocks don't call get_and_call_next_op()
+    {"reverse", "table_dispatch"},  # The dispatcher closure replaces get_and_call_next_op()
+)
+
+_FEATURE_CLASSES = {  # The CPU classes above with only one feature
+    ("block_cache",): CPUBlockCache,
+    ("delay_loop",): CPUDelayLoop,
+    ("fast",): CPUFast,
+    ("idle_loop",): CPUIdleLoop,
+    ("lazy_flags",): CPULazyFlags,
+    ("packed_flags",): CPUPackedFlags,
+    ("reverse",): CPUReverse,
+    ("table_dispatch",): CPUTableDispatch,
+}
+
+
+def get_cpu_class(*features):
+    """
+    Returns the CPU class with the given features from CPU_FEATURES, e.g.:
+        get_cpu_class("block_cache", "idle_loop")
+
+    The order of the features doesn't matter. Raise ValueError for unknown
+    features and for the combinations in EXCLUSIVE_CPU_FEATURES. All other
+    combinations are tested, see: tests/test_cpu_features.py
+    """
+    return _get_cpu_class(tuple(sorted(set(features))))
+
+
+@functools.cache
+def _get_cpu_class(features):
+    for feature in features:
+        if feature not in CPU_FEATURES:
+            raise ValueError(f"Unknown CPU feature {feature!r}, existing are: {', '.join(CPU_FEATURES)}")
+    for exclusive in EXCLUSIVE_CPU_FEATURES:
+        combined = sorted(exclusive.intersection(features))
+        if len(combined) > 1:
+            raise ValueError(f"The CPU features {', '.join(combined)} can't be combined")
+
+    if not features:
+        return CPU
+    try:
+        return _FEATURE_CLASSES[features]
+    except KeyError:
+        pass
+
+    mixins = tuple(mixin for feature, mixin in CPU_FEATURES.items() if feature in features)
+    name = "CPU" + "".join(feature.title().replace("_", "") for feature in CPU_FEATURES if feature in features)
+    return type(name, (*mixins, CPU), {"__doc__": f"CPU with the features: {', '.join(features)}"})
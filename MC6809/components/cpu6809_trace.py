@@ -6,6 +6,10 @@
 
     Create trace lines for every OP call.
 
+    InstructionTrace writes formatted text lines to stdout,
+    BinaryInstructionTrace writes records into cpu.trace_writer,
+    see: mc6809_trace_file.py
+
     :copyleft: 2014 by the MC6809 team, see AUTHORS for more details.
     :license: GNU GPL v3 or above, see LICENSE for more details.
 """
@@ -15,6 +19,7 @@ import logging
 import sys
 
 from MC6809.components.cpu_utils.instruction_call import PrepagedInstructions
+from MC6809.components.mc6809_trace_file import FLAG_EA, FLAG_M
 from MC6809.components.MC6809data.MC6809_data_utils import MC6809OP_DATA_DICT
 
 
@@ -54,10 +59,7 @@ class InstructionTrace(PrepagedInstructions):
 
         ob_bytes = op_code_data["bytes"]
 
-        op_bytes = "".join(
-            f"{value:02x}"
-            for __, value in self.cpu.memory.iter_bytes(op_address, op_address + ob_bytes)
-        )
+        op_bytes = self.cpu.memory.peek_range(op_address, op_address + ob_bytes).hex()
 
         kwargs_info = []
         if "register" in kwargs:
@@ -80,12 +82,37 @@ class InstructionTrace(PrepagedInstructions):
 
         if not op_bytes.startswith(f"{opcode:02x}"):
             self.cpu.memory.print_dump(op_address, op_address + ob_bytes)
-            self.cpu.memory.print_dump(op_address - 10, op_address + ob_bytes + 10)
+            self.cpu.memory.print_dump(max(op_address - 10, 0), op_address + ob_bytes + 10)
         assert op_bytes.startswith(f"{opcode:02x}"), f"{op_bytes} doesn't start with {self.opcode:02x}"
 
         return result
 
 
+class BinaryInstructionTrace(PrepagedInstructions):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__origin_instr_func = self.instr_func
+        self.instr_func = self.__call_instr_func
+        self.__add_cpu_record = self.cpu.trace_writer.add_cpu_record
+
+    def __call_instr_func(self, opcode, *args, **kwargs):
+        result = self.__origin_instr_func(opcode, *args, **kwargs)
+
+        if opcode in (0x10, 0x11):
+            return result  # The paged op is traced
+
+        flags = 0
+        ea = kwargs.get("ea", 0)
+        if "ea" in kwargs:
+            flags |= FLAG_EA
+        m = kwargs.get("m", 0)
+        if "m" in kwargs:
+            flags |= FLAG_M
+
+        self.__add_cpu_record(self.cpu, self.cpu.last_op_address, opcode, ea & 0xffff, m & 0xffff, flags)
+        return result
+
+
 # ------------------------------------------------------------------------------
 
 
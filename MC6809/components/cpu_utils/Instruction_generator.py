@@ -9,6 +9,8 @@
 """
 
 
+import inspect
+import io
 import os
 import sys
 
@@ -118,7 +120,7 @@ def generate_code(f):
             write_to_memory = mnemonic_data["write_to_memory"]
             needs_ea = mnemonic_data["needs_ea"]
             register = mnemonic_data["register"]
-            for op_code, op_data in list(mnemonic_data["ops"].items()):  # noqa: B007
+            for op_code, op_data in list(mnemonic_data["ops"].items()):
                 addr_mode = op_data["addr_mode"]
 #                print(hex(op_code),
 
@@ -157,15 +159,13 @@ def generate_code(f):
 
     for register in sorted(REGISTER_DICT[register] for register in registers):
         f.write(
-            "        self.{r}=self.cpu.{r}\n".format(
-                r=register,
-            )
+            f"        self.{register}=self.cpu.{register}\n"
         )
     f.write("\n")
 
     for addr_mode in sorted(addr_modes):
         f.write(
-            "        self.{a}=self.cpu.{a}\n".format(a=addr_mode)
+            f"        self.{addr_mode}=self.cpu.{addr_mode}\n"
         )
     f.write("\n")
 
@@ -211,10 +211,447 @@ def generate_code(f):
         f.write("\n")
 
 
-def generate(filename):
-    with open(filename, "w") as f:
-        #        generate_code(sys.stdout)
-        generate_code(f)
+# ---- Fast engine: One concrete function per opcode ----
+
+FAST_INIT_CODE = f'''
+""\"
+    This file was generated with: "{os.path.basename(__file__)}"
+    Please don't change it directly ;)
+    {DOC}
+""\"
+
+
+def build_fast_ops(cpu):
+    ""\"
+    Build a concrete function for every opcode, for a CPU with register file
+    and packed CC register. The addressing mode, the register and the memory
+    read/write are inlined. Returns a dict: {{op_code: func}}
+    ""\"
+    registers = cpu.registers
+    memory = cpu.memory
+    read_byte = memory.read_byte
+    read_word = memory.read_word
+    write_byte = memory.write_byte
+    write_word = memory.write_word
+    get_ea_indexed = cpu.get_ea_indexed
+    add_flags = cpu.add_flags
+    sub_flags = cpu.sub_flags
+    inc_flags = cpu.inc_flags
+    dec_flags = cpu.dec_flags
+'''
+
+# The register slots in RegisterFile
+REGISTER_SLOTS = {
+    REG_A: "a",
+    REG_B: "b",
+    REG_DP: "dp",
+    REG_X: "x",
+    REG_Y: "y",
+    REG_U: "u",
+    REG_S: "s",
+    REG_PC: "pc",
+}
+
+
+def get_register(register):
+    if register == REG_D:
+        return "(registers.a << 8 | registers.b)"
+    return f"registers.{REGISTER_SLOTS[register]}"
+
+
+def set_register(register, value, width):
+    if register == REG_D:
+        return [
+            f"d = {value}",
+            "registers.a = (d >> 8) & 0xff",
+            "registers.b = d & 0xff",
+        ]
+    mask = "0xff" if width == 8 else "0xffff"
+    if " " in value:
+        value = f"({value})"
+    return [f"registers.{REGISTER_SLOTS[register]} = {value} & {mask}"]
+
+
+def register_width(register):
+    if register in (REG_A, REG_B, REG_DP, REG_CC):
+        return 8
+    return 16
+
+
+def flags_NZ0_8(value):
+    return [f"cpu.cc = cpu.cc & 0xf1 | ({value} & 0x80) >> 4 | (0 if {value} else 0x04)"]
+
+
+def flags_NZ0_16(value):
+    return [f"cpu.cc = cpu.cc & 0xf1 | ({value} & 0x8000) >> 12 | (0 if {value} else 0x04)"]
+
+
+def flags_NZVC_16(a, b, r):
+    return [
+        "cpu.cc = (",
+        "    cpu.cc & 0xf0",
+        f"    | ({r} & 0x8000) >> 12",
+        f"    | (0 if {r} & 0xffff else 0x04)",
+        f"    | (({a} ^ {b} ^ {r} ^ ({r} >> 1)) & 0x8000) >> 14",
+        f"    | ({r} & 0x10000) >> 16",
+        ")",
+    ]
+
+
+def get_addressing_code(op_data, calc_ea=True):
+    """
+    Code that calculate 'ea' and/or 'm' like the get_ea_*/get_m_* methods.
+    """
+    addr_mode = op_data["addr_mode"]
+    needs_ea = op_data["needs_ea"]
+    read = op_data["read_from_memory"]
+
+    if addr_mode == "INHERENT":
+        return []
+
+    if addr_mode in ("IMMEDIATE", "IMMEDIATE_WORD"):
+        assert not needs_ea
+        return [
+            "pc = registers.pc",
+            f"m = read_{'word' if read == WORD else 'byte'}(pc)",
+            f"registers.pc = (pc + {2 if read == WORD else 1}) & 0xffff",
+        ]
+
+    if addr_mode in ("RELATIVE", "RELATIVE_WORD") and not calc_ea:
+        return [
+            "pc = registers.pc",
+            f"read_{'word' if addr_mode == 'RELATIVE_WORD' else 'byte'}(pc)",
+            f"registers.pc = (pc + {2 if addr_mode == 'RELATIVE_WORD' else 1}) & 0xffff",
+        ]
+    if addr_mode == "RELATIVE":
+        return [
+            "pc = registers.pc",
+            "x = read_byte(pc)",
+            "registers.pc = pc = (pc + 1) & 0xffff",
+            "ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff",
+        ]
+    if addr_mode == "RELATIVE_WORD":
+        return [
+            "pc = registers.pc",
+            "x = read_word(pc)",
+            "registers.pc = pc = (pc + 2) & 0xffff",
+            "ea = (pc + x) & 0xffff",
+        ]
+
+    if addr_mode in ("DIRECT", "DIRECT_WORD"):
+        code = [
+            "pc = registers.pc",
+            "ea = registers.dp << 8 | read_byte(pc)",
+            "registers.pc = (pc + 1) & 0xffff",
+        ]
+    elif addr_mode in ("EXTENDED", "EXTENDED_WORD"):
+        code = [
+            "pc = registers.pc",
+            "ea = read_word(pc)",
+            "registers.pc = (pc + 2) & 0xffff",
+        ]
+    elif addr_mode in ("INDEXED", "INDEXED_WORD"):
+        code = ["ea = get_ea_indexed()"]
+    else:
+        raise ValueError(f"Unknown addressing mode: {addr_mode!r}")
+
+    if read == BYTE:
+        code.append("m = read_byte(ea)")
+    elif read == WORD:
+        code.append("m = read_word(ea)")
+    return code
+
+
+def fast_LD(op_data, register):
+    width = register_width(register)
+    code = set_register(register, "m", width)
+    if width == 8:
+        return code + flags_NZ0_8("m")
+    return code + flags_NZ0_16("m")
+
+
+def fast_ST(op_data, register):
+    if register_width(register) == 8:
+        return [f"value = {get_register(register)}"] + flags_NZ0_8("value") + ["write_byte(ea, value)"]
+    return [f"value = {get_register(register)}"] + flags_NZ0_16("value") + ["write_word(ea, value)"]
+
+
+def fast_ADD8(op_data, register):
+    return [f"a = {get_register(register)}"] + set_register(register, "a + m", 8) + [
+        "cpu.cc = cpu.cc & 0xd0 | add_flags[a << 8 | m]",
+    ]
+
+
+def fast_ADC(op_data, register):
+    return ["cc = cpu.cc", f"a = {get_register(register)}"] + set_register(register, "a + m + (cc & 0x01)", 8) + [
+        "cpu.cc = cc & 0xd0 | add_flags[(cc & 0x01) << 16 | a << 8 | m]",
+    ]
+
+
+def fast_SUB(op_data, register):
+    if register_width(register) == 8:
+        return [f"a = {get_register(register)}"] + set_register(register, "a - m", 8) + [
+            "cpu.cc = cpu.cc & 0xf0 | sub_flags[a << 8 | m]",
+        ]
+    return [f"a = {get_register(register)}", "r = a - m"] + set_register(register, "r", 16) + flags_NZVC_16(
+        "a", "m", "r"
+    )
+
+
+def fast_SBC(op_data, register):
+    return ["cc = cpu.cc", f"a = {get_register(register)}"] + set_register(register, "a - m - (cc & 0x01)", 8) + [
+        "cpu.cc = cc & 0xf0 | sub_flags[(cc & 0x01) << 16 | a << 8 | m]",
+    ]
+
+
+def fast_CMP8(op_data, register):
+    return [f"cpu.cc = cpu.cc & 0xf0 | sub_flags[{get_register(register)} << 8 | m]"]
+
+
+def fast_CMP16(op_data, register):
+    return [f"a = {get_register(register)}", "r = a - m"] + flags_NZVC_16("a", "m", "r")
+
+
+def fast_ADD16(op_data, register):
+    return [f"a = {get_register(register)}", "r = a + m"] + set_register(register, "r", 16) + flags_NZVC_16(
+        "a", "m", "r"
+    )
+
+
+def fast_logical(operator):
+    def fast_func(op_data, register):
+        return [f"r = {get_register(register)} {operator} m"] + set_register(register, "r", 8) + flags_NZ0_8("r")
+    return fast_func
+
+
+def fast_BIT(op_data, register):
+    return [f"r = {get_register(register)} & m"] + flags_NZ0_8("r")
+
+
+def fast_TST_register(op_data, register):
+    return [f"x = {get_register(register)}"] + flags_NZ0_8("x")
+
+
+def fast_TST_memory(op_data, register):
+    return flags_NZ0_8("m")
+
+
+def fast_CLR_register(op_data, register):
+    return set_register(register, "0", 8) + ["cpu.cc = cpu.cc & 0xf0 | 0x04"]
+
+
+def fast_CLR_memory(op_data, register):
+    return ["cpu.cc = cpu.cc & 0xf0 | 0x04", "write_byte(ea, 0x00)"]
+
+
+def fast_INC_DEC_register(operator, table):
+    def fast_func(op_data, register):
+        return [
+            f"a = {get_register(register)}",
+            f"cpu.cc = cpu.cc & 0xf1 | {table}[a]",
+        ] + set_register(register, f"a {operator} 1", 8)
+    return fast_func
+
+
+def fast_INC_DEC_memory(operator, table):
+    def fast_func(op_data, register):
+        return [
+            f"cpu.cc = cpu.cc & 0xf1 | {table}[m]",
+            f"write_byte(ea, (m {operator} 1) & 0xff)",
+        ]
+    return fast_func
+
+
+def fast_branch(condition):
+    def fast_func(op_data, register):
+        return [
+            f"if {condition}:",
+            "    registers.pc = ea",
+        ]
+    return fast_func
+
+
+def fast_jump(op_data, register):
+    return ["registers.pc = ea"]
+
+
+def fast_BSR_JSR(op_data, register):
+    return [
+        "registers.s = s = (registers.s - 2) & 0xffff",
+        "write_word(s, registers.pc)",
+        "registers.pc = ea",
+    ]
+
+
+def fast_RTS(op_data, register):
+    return [
+        "s = registers.s",
+        "registers.pc = read_word(s)",
+        "registers.s = (s + 2) & 0xffff",
+    ]
+
+
+def fast_LEA_register(op_data, register):
+    # Note: get_ea_indexed() doesn't limit the address for the 5-bit offset mode
+    return set_register(register, "ea", 16) + ["cpu.cc = cpu.cc & 0xfb | (0 if ea & 0xffff else 0x04)"]
+
+
+def fast_LEA_pointer(op_data, register):
+    return set_register(register, "ea", 16)
+
+
+def fast_ABX(op_data, register):
+    return ["registers.x = (registers.x + registers.b) & 0xffff"]
+
+
+def fast_NOP(op_data, register):
+    return []
+
+
+# CPU method name -> code generator of the inlined operation
+FAST_OPS = {
+    "instruction_ABX": fast_ABX,
+    "instruction_ADC": fast_ADC,
+    "instruction_ADD16": fast_ADD16,
+    "instruction_ADD8": fast_ADD8,
+    "instruction_AND": fast_logical("&"),
+    "instruction_BEQ": fast_branch("cpu.cc & 0x04"),
+    "instruction_BGE": fast_branch("not ((cpu.cc >> 2) ^ cpu.cc) & 0x02"),  # N == V
+    "instruction_BGT": fast_branch("not (cpu.cc & 0x04 or ((cpu.cc >> 2) ^ cpu.cc) & 0x02)"),
+    "instruction_BHI": fast_branch("not cpu.cc & 0x05"),  # C == 0 and Z == 0
+    "instruction_BHS": fast_branch("not cpu.cc & 0x01"),
+    "instruction_BIT": fast_BIT,
+    "instruction_BLE": fast_branch("cpu.cc & 0x04 or ((cpu.cc >> 2) ^ cpu.cc) & 0x02"),
+    "instruction_BLO": fast_branch("cpu.cc & 0x01"),
+    "instruction_BLS": fast_branch("cpu.cc & 0x05"),  # C == 1 or Z == 1
+    "instruction_BLT": fast_branch("((cpu.cc >> 2) ^ cpu.cc) & 0x02"),  # N xor V
+    "instruction_BMI": fast_branch("cpu.cc & 0x08"),
+    "instruction_BNE": fast_branch("not cpu.cc & 0x04"),
+    "instruction_BPL": fast_branch("not cpu.cc & 0x08"),
+    "instruction_BRA": fast_jump,
+    "instruction_BRN": fast_NOP,  # Branch never: The offset is read, but not used
+    "instruction_BSR_JSR": fast_BSR_JSR,
+    "instruction_BVC": fast_branch("not cpu.cc & 0x02"),
+    "instruction_BVS": fast_branch("cpu.cc & 0x02"),
+    "instruction_CLR_memory": fast_CLR_memory,
+    "instruction_CLR_register": fast_CLR_register,
+    "instruction_CMP16": fast_CMP16,
+    "instruction_CMP8": fast_CMP8,
+    "instruction_DEC_memory": fast_INC_DEC_memory("-", "dec_flags"),
+    "instruction_DEC_register": fast_INC_DEC_register("-", "dec_flags"),
+    "instruction_EOR": fast_logical("^"),
+    "instruction_INC_memory": fast_INC_DEC_memory("+", "inc_flags"),
+    "instruction_INC_register": fast_INC_DEC_register("+", "inc_flags"),
+    "instruction_JMP": fast_jump,
+    "instruction_LD16": fast_LD,
+    "instruction_LD8": fast_LD,
+    "instruction_LEA_pointer": fast_LEA_pointer,
+    "instruction_LEA_register": fast_LEA_register,
+    "instruction_NOP": fast_NOP,
+    "instruction_OR": fast_logical("|"),
+    "instruction_RTS": fast_RTS,
+    "instruction_SBC": fast_SBC,
+    "instruction_ST16": fast_ST,
+    "instruction_ST8": fast_ST,
+    "instruction_SUB": fast_SUB,
+    "instruction_TST_memory": fast_TST_memory,
+    "instruction_TST_register": fast_TST_register,
+}
+
+
+def get_op_code2method_name():
+    """
+    Collect the CPU method name of every op code
+    """
+    from MC6809.components.cpu6809 import CPU
+
+    op_code2method_name = {}
+    for name, cls_method in inspect.getmembers(CPU):
+        for op_code in getattr(cls_method, "_opcodes", ()):
+            op_code2method_name[op_code] = name
+    return op_code2method_name
+
+
+def generic_call_code(op_data, method_name, register):
+    """
+    Call the CPU method with positional arguments, for all ops without inlined code.
+    """
+    args = ["opcode"]
+    if op_data["needs_ea"]:
+        args.append("ea")
+    if op_data["read_from_memory"]:
+        args.append("m")
+    if register:
+        args.append(REGISTER_DICT[register])
+
+    call = f"{method_name}({', '.join(args)})"
+    write = op_data["write_to_memory"]
+    if write == BYTE:
+        return [f"ea, value = {call}", "write_byte(ea, value)"]
+    elif write == WORD:
+        return [f"ea, value = {call}", "write_word(ea, value)"]
+    return [call]
+
+
+def generate_fast_code(f):
+    op_code2method_name = get_op_code2method_name()
+
+    for line in FAST_INIT_CODE.lstrip().splitlines():
+        f.write(f"{line.rstrip()}\n")
+
+    functions = []
+    generic_methods = set()
+    generic_registers = set()
+    code_lines = []
+    for op_code, op_data in sorted(MC6809OP_DATA_DICT.items()):
+        if op_data["addr_mode"] is None:
+            # special function (RESET/ PAGE1,2) are called via PrepagedInstructions
+            continue
+
+        method_name = op_code2method_name[op_code]
+        register = op_data["register"]
+        func_name = f"op_{op_code:02x}_{op_data['mnemonic']}_{op_data['addr_mode'].lower()}"
+        functions.append((op_code, func_name))
+
+        code = get_addressing_code(op_data, calc_ea=method_name != "instruction_BRN")
+        try:
+            fast_func = FAST_OPS[method_name]
+        except KeyError:
+            generic_methods.add(method_name)
+            if register:
+                generic_registers.add(REGISTER_DICT[register])
+            code += generic_call_code(op_data, method_name, register)
+        else:
+            code += fast_func(op_data, register) or (["pass"] if not code else [])
+
+        code_lines.append(f"    def {func_name}(opcode):")
+        for line in code:
+            code_lines.append(f"        {line}")
+        code_lines.append("")
+
+    for register in sorted(generic_registers):
+        f.write(f"    {register} = cpu.{register}\n")
+    f.write("\n")
+    for method_name in sorted(generic_methods):
+        f.write(f"    {method_name} = cpu.{method_name}\n")
+    f.write("\n")
+
+    for line in code_lines:
+        f.write(f"{line}\n")
+
+    f.write("    return {\n")
+    for op_code, func_name in functions:
+        f.write(f"        0x{op_code:02x}: {func_name},\n")
+    f.write("    }\n")
+
+
+def generate(filename, generate_func=generate_code):
+    # Generate the code first: generate_fast_code() imports the CPU, that imports the generated modules
+    f = io.StringIO()
+    #    generate_code(sys.stdout)
+    generate_func(f)
+    with open(filename, "w") as f2:
+        f2.write(f.getvalue())
     sys.stderr.write(f"New {filename!r} generated.\n")
 
 
@@ -222,3 +659,4 @@ if __name__ == "__main__":
     # print("LDA immediate:", func_name_from_op_code(0x96))
 
     generate("instruction_call.py")
+    generate("instruction_fast.py", generate_func=generate_fast_code)
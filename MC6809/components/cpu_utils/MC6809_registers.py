@@ -12,6 +12,7 @@
 """
 
 
+import functools
 import logging
 
 
@@ -112,6 +113,121 @@ class ConcatenatedAccumulator:
         return f"{self.name}={self.value:04x}"
 
 
+class RegisterFile:
+    """
+    Plain integer storage of all CPU registers, except CC.
+    D is not stored, it's always 'a << 8 | b'.
+    The values are not limited here: Wrap around is done with masks on write.
+
+    >>> registers = RegisterFile()
+    >>> registers.a = 0x12
+    >>> registers.b = 0x34
+    >>> hex(registers.a << 8 | registers.b)
+    '0x1234'
+    """
+    __slots__ = ("a", "b", "dp", "pc", "s", "u", "x", "y")
+
+    def __init__(self):
+        self.a = 0  # A - 8 bit accumulator
+        self.b = 0  # B - 8 bit accumulator
+        self.dp = 0  # DP - 8 bit direct page register
+        self.x = 0  # X - 16 bit index register
+        self.y = 0  # Y - 16 bit index register
+        self.u = 0  # U - 16 bit user-stack pointer
+        self.s = 0  # S - 16 bit system-stack pointer
+        self.pc = 0  # PC - 16 bit program counter register
+
+
+class RegisterViewBase:
+    """
+    A thin view to one register in a RegisterFile with the same API as the
+    ValueStorage objects, used for register_str2object, TFR, EXG and the ops
+    that get the register as argument.
+    """
+    __slots__ = ("name", "registers")
+
+    def __init__(self, name, registers):
+        self.name = name
+        self.registers = registers
+
+    def decrement(self, value=1):
+        self.set(self.value - value)
+
+    def increment(self, value=1):
+        self.set(self.value + value)
+
+    def __str__(self):
+        return f"{self.name}={self.value:0{self.WIDTH // 4}x}"
+    __repr__ = __str__
+
+
+_REGISTER_VIEW_TEMPLATE = """
+class RegisterView_{slot}(RegisterViewBase):
+    __slots__ = ()
+    WIDTH = {width}
+
+    def set(self, v):
+        self.registers.{slot} = v & {mask}
+
+    @property
+    def value(self):
+        return self.registers.{slot}
+
+    @value.setter
+    def value(self, v):
+        self.registers.{slot} = v & {mask}
+"""
+
+
+@functools.cache
+def _register_view_class(slot, width):
+    # The class is generated, because a fixed attribute access is much faster than getattr()/setattr()
+    namespace = {"RegisterViewBase": RegisterViewBase}
+    exec(_REGISTER_VIEW_TEMPLATE.format(slot=slot, width=width, mask=hex((1 << width) - 1)), namespace)
+    return namespace[f"RegisterView_{slot}"]
+
+
+def register_view(name, registers, slot, width):
+    """
+    >>> registers = RegisterFile()
+    >>> accu_a = register_view("A", registers, "a", width=8)
+    >>> accu_a.set(0x1ff)
+    >>> accu_a, registers.a
+    (A=ff, 255)
+    >>> accu_a.value = -1
+    >>> hex(registers.a)
+    '0xff'
+    """
+    return _register_view_class(slot, width)(name, registers)
+
+
+class ConcatenatedAccumulatorView(RegisterViewBase):
+    """
+    D - 16 bit concatenated reg. (A + B) view to a RegisterFile
+
+    >>> registers = RegisterFile()
+    >>> accu_d = ConcatenatedAccumulatorView("D", registers)
+    >>> accu_d.set(0x1234)
+    >>> hex(registers.a), hex(registers.b)
+    ('0x12', '0x34')
+    >>> accu_d.decrement(0x35)
+    >>> accu_d
+    D=11ff
+    """
+    __slots__ = ()
+    WIDTH = 16  # 16 Bit
+
+    def set(self, value):
+        registers = self.registers
+        registers.a = (value >> 8) & 0xff
+        registers.b = value & 0xff
+
+    @property
+    def value(self):
+        registers = self.registers
+        return registers.a << 8 | registers.b
+
+
 def convert_differend_width(src_reg, dst_reg):
     """
     e.g.:
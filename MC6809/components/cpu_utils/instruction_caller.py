@@ -9,14 +9,54 @@
 """
 
 
+import array
 import inspect
 
-from MC6809.components.cpu6809_trace import InstructionTrace
+from MC6809.components.cpu6809_trace import BinaryInstructionTrace, InstructionTrace
 from MC6809.components.cpu_utils.instruction_call import PrepagedInstructions
+from MC6809.components.cpu_utils.instruction_fast import build_fast_ops
 from MC6809.components.cpu_utils.Instruction_generator import func_name_from_op_code
 from MC6809.components.MC6809data.MC6809_data_utils import MC6809OP_DATA_DICT
 
 
+_OP_PLANS = {}  # CPU class -> op plan, see: get_op_plan()
+
+
+def get_op_plan(cls):
+    """
+    Returns the ops of a CPU class as a tuple of:
+        (method name, ((op code, address mode func name, cycles), ...))
+
+    The plan depends only on the class, so it's collected only once
+    and a new CPU instance (e.g.: from cpu.clone()) just binds the methods.
+    """
+    try:
+        return _OP_PLANS[cls]
+    except KeyError:
+        pass
+
+    plan = []
+    # Get the members not from class instance, so that's possible to
+    # exclude properties without "activate" them.
+    for name, cls_method in inspect.getmembers(cls):
+        if name.startswith("_") or isinstance(cls_method, property):
+            continue
+
+        try:
+            opcodes = cls_method._opcodes
+        except AttributeError:
+            continue
+
+        ops = tuple(
+            (op_code, func_name_from_op_code(op_code), MC6809OP_DATA_DICT[op_code]["cycles"])
+            for op_code in opcodes
+        )
+        plan.append((name, ops))
+
+    plan = _OP_PLANS[cls] = tuple(plan)
+    return plan
+
+
 def opcode(*opcodes):
     """A decorator for opcodes"""
     def decorator(func):
@@ -30,51 +70,121 @@ class OpCollection:
     def __init__(self, cpu):
         self.cpu = cpu
         self.opcode_dict = {}
+        self.instr_func_dict = {}  # The origin CPU methods, without the address mode wrapper
         self.collect_ops()
+        if cpu.fast_engine and not cpu.cfg.trace:
+            self.add_fast_ops()
 
     def get_opcode_dict(self):
         return self.opcode_dict
 
-    def collect_ops(self):
-        # Get the members not from class instance, so that's possible to
-        # exclude properties without "activate" them.
-        cls = type(self.cpu)
-        for name, cls_method in inspect.getmembers(cls):
-            if name.startswith("_") or isinstance(cls_method, property):
-                continue
-
-            try:
-                opcodes = cls_method._opcodes
-            except AttributeError:
-                continue
+    def get_opcode_tables(self, illegal_func):
+        """
+        Build dense lookup tables from the collected opcodes.
 
-            instr_func = getattr(self.cpu, name)
-            self._add_ops(opcodes, instr_func)
-
-    def _add_ops(self, opcodes, instr_func):
-        #         log.debug("%20s: %s" % (
-        #             instr_func.__name__, ",".join(["$%x" % c for c in opcodes])
-        #         ))
-        for op_code in opcodes:
-            assert op_code not in self.opcode_dict, \
-                f"Opcode ${op_code:x} ({instr_func.__name__}) defined more then one time!"
+        Returns a dict with a 256 entry function list and a parallel cycles
+        array for every opcode page: $00 (the normal ops) and $10, $11
+        (PAGE 2 and PAGE 3 ops). All unused slots are filled with
+        'illegal_func', so a lookup will never fail.
+        """
+        tables = {}
+        for page in (0x00, 0x10, 0x11):
+            tables[page] = ([illegal_func] * 256, array.array("b", [0] * 256))
 
-            op_code_data = MC6809OP_DATA_DICT[op_code]
+        for op_code, (cycles, func) in self.opcode_dict.items():
+            page, index = divmod(op_code, 256)
+            funcs, cycles_table = tables[page]
+            funcs[index] = func
+            cycles_table[index] = cycles
 
-            func_name = func_name_from_op_code(op_code)
+        return tables
 
-            if self.cpu.cfg.trace:
-                InstructionClass = InstructionTrace
-            else:
-                InstructionClass = PrepagedInstructions
+    def collect_ops(self):
+        if self.cpu.trace_writer is not None:
+            InstructionClass = BinaryInstructionTrace
+        elif self.cpu.cfg.trace:
+            InstructionClass = InstructionTrace
+        else:
+            InstructionClass = PrepagedInstructions
+        self._collect_ops(self.opcode_dict, InstructionClass)
+        self.instruction_class = InstructionClass  # see: clone()
+
+    def clone(self, cpu):
+        """
+        Returns a OpCollection for 'cpu', a clone() of self.cpu.
+
+        The instruction instances of 'cpu' get the attributes of one new
+        instance: They differ only in the CPU method, so the ~35 attribute
+        lookups per instance in PrepagedInstructions.__init__() are not needed.
+        """
+        if self.instruction_class is not PrepagedInstructions:
+            return OpCollection(cpu)  # The trace classes wrap the CPU methods per instance
+
+        attributes = PrepagedInstructions(cpu, instr_func=None).__dict__
+        opcode_dict = {}
+        instr_func_dict = {}
+        for name, ops in get_op_plan(type(cpu)):
+            instr_func = getattr(cpu, name)
+            instruction = object.__new__(PrepagedInstructions)
+            instruction.__dict__.update(attributes)
+            instruction.instr_func = instr_func
+            for op_code, func_name, cycles in ops:
+                opcode_dict[op_code] = (cycles, getattr(instruction, func_name))
+                instr_func_dict[op_code] = instr_func
+
+        op_collection = object.__new__(OpCollection)
+        op_collection.cpu = cpu
+        op_collection.opcode_dict = opcode_dict
+        op_collection.instr_func_dict = instr_func_dict
+        op_collection.instruction_class = PrepagedInstructions
+        if cpu.fast_engine:
+            op_collection.add_fast_ops()
+        return op_collection
+
+    def get_untraced_opcode_dict(self):
+        """
+        Returns a new opcode dict without the trace, e.g.: for the
+        code outside of a TraceFilter.
+        """
+        opcode_dict = {}
+        self._collect_ops(opcode_dict, PrepagedInstructions)
+        if self.cpu.fast_engine:
+            self.add_fast_ops(opcode_dict)
+        return opcode_dict
+
+    def add_fast_ops(self, opcode_dict=None):
+        """
+        Replace the ops with the generated concrete functions from instruction_fast.py
+        The special ops (RESET, PAGE 1/2) are still called via PrepagedInstructions.
+        """
+        if opcode_dict is None:
+            opcode_dict = self.opcode_dict
+        for op_code, func in build_fast_ops(self.cpu).items():
+            cycles, __ = opcode_dict[op_code]
+            opcode_dict[op_code] = (cycles, func)
+
+    def _collect_ops(self, opcode_dict, InstructionClass):
+        for name, ops in get_op_plan(type(self.cpu)):
+            instr_func = getattr(self.cpu, name)
+            self._add_ops(opcode_dict, ops, instr_func, InstructionClass)
+
+    def _add_ops(self, opcode_dict, ops, instr_func, InstructionClass):
+        """
+        Add the ops from get_op_plan(): All ops of one CPU method
+        share one instruction class instance.
+        """
+        instrution_class = InstructionClass(self.cpu, instr_func)
+        for op_code, func_name, cycles in ops:
+            assert op_code not in opcode_dict, \
+                f"Opcode ${op_code:x} ({instr_func.__name__}) defined more then one time!"
 
-            instrution_class = InstructionClass(self.cpu, instr_func)
             try:
                 func = getattr(instrution_class, func_name)
             except AttributeError as err:
                 raise AttributeError(f"{err} (op code: ${op_code:02x})")
 
-            self.opcode_dict[op_code] = (op_code_data["cycles"], func)
+            opcode_dict[op_code] = (cycles, func)
+            self.instr_func_dict[op_code] = instr_func
 
 
 if __name__ == "__main__":
@@ -0,0 +1,2433 @@
+"""
+    This file was generated with: "Instruction_generator.py"
+    Please don't change it directly ;)
+
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+
+"""
+
+
+def build_fast_ops(cpu):
+    """
+    Build a concrete function for every opcode, for a CPU with register file
+    and packed CC register. The addressing mode, the register and the memory
+    read/write are inlined. Returns a dict: {op_code: func}
+    """
+    registers = cpu.registers
+    memory = cpu.memory
+    read_byte = memory.read_byte
+    read_word = memory.read_word
+    write_byte = memory.write_byte
+    write_word = memory.write_word
+    get_ea_indexed = cpu.get_ea_indexed
+    add_flags = cpu.add_flags
+    sub_flags = cpu.sub_flags
+    inc_flags = cpu.inc_flags
+    dec_flags = cpu.dec_flags
+    accu_a = cpu.accu_a
+    accu_b = cpu.accu_b
+    cc_register = cpu.cc_register
+    system_stack_pointer = cpu.system_stack_pointer
+    user_stack_pointer = cpu.user_stack_pointer
+
+    instruction_ANDCC = cpu.instruction_ANDCC
+    instruction_ASR_memory = cpu.instruction_ASR_memory
+    instruction_ASR_register = cpu.instruction_ASR_register
+    instruction_COM_memory = cpu.instruction_COM_memory
+    instruction_COM_register = cpu.instruction_COM_register
+    instruction_CWAI = cpu.instruction_CWAI
+    instruction_DAA = cpu.instruction_DAA
+    instruction_EXG = cpu.instruction_EXG
+    instruction_LSL_memory = cpu.instruction_LSL_memory
+    instruction_LSL_register = cpu.instruction_LSL_register
+    instruction_LSR_memory = cpu.instruction_LSR_memory
+    instruction_LSR_register = cpu.instruction_LSR_register
+    instruction_MUL = cpu.instruction_MUL
+    instruction_NEG_memory = cpu.instruction_NEG_memory
+    instruction_NEG_register = cpu.instruction_NEG_register
+    instruction_ORCC = cpu.instruction_ORCC
+    instruction_PSH = cpu.instruction_PSH
+    instruction_PUL = cpu.instruction_PUL
+    instruction_ROL_memory = cpu.instruction_ROL_memory
+    instruction_ROL_register = cpu.instruction_ROL_register
+    instruction_ROR_memory = cpu.instruction_ROR_memory
+    instruction_ROR_register = cpu.instruction_ROR_register
+    instruction_RTI = cpu.instruction_RTI
+    instruction_SEX = cpu.instruction_SEX
+    instruction_SWI = cpu.instruction_SWI
+    instruction_SWI2 = cpu.instruction_SWI2
+    instruction_SWI3 = cpu.instruction_SWI3
+    instruction_SYNC = cpu.instruction_SYNC
+    instruction_TFR = cpu.instruction_TFR
+
+    def op_00_NEG_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_NEG_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_03_COM_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_COM_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_04_LSR_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_LSR_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_06_ROR_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_ROR_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_07_ASR_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_ASR_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_08_LSL_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_LSL_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_09_ROL_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_ROL_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_0a_DEC_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf1 | dec_flags[m]
+        write_byte(ea, (m - 1) & 0xff)
+
+    def op_0c_INC_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf1 | inc_flags[m]
+        write_byte(ea, (m + 1) & 0xff)
+
+    def op_0d_TST_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x80) >> 4 | (0 if m else 0x04)
+
+    def op_0e_JMP_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        registers.pc = ea
+
+    def op_0f_CLR_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        cpu.cc = cpu.cc & 0xf0 | 0x04
+        write_byte(ea, 0x00)
+
+    def op_12_NOP_inherent(opcode):
+        pass
+
+    def op_13_SYNC_inherent(opcode):
+        instruction_SYNC(opcode)
+
+    def op_16_LBRA_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        registers.pc = ea
+
+    def op_17_LBSR_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        registers.s = s = (registers.s - 2) & 0xffff
+        write_word(s, registers.pc)
+        registers.pc = ea
+
+    def op_19_DAA_inherent(opcode):
+        instruction_DAA(opcode)
+
+    def op_1a_ORCC_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        instruction_ORCC(opcode, m, cc_register)
+
+    def op_1c_ANDCC_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        instruction_ANDCC(opcode, m, cc_register)
+
+    def op_1d_SEX_inherent(opcode):
+        instruction_SEX(opcode)
+
+    def op_1e_EXG_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        instruction_EXG(opcode, m)
+
+    def op_1f_TFR_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        instruction_TFR(opcode, m)
+
+    def op_20_BRA_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        registers.pc = ea
+
+    def op_21_BRN_relative(opcode):
+        pc = registers.pc
+        read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+
+    def op_22_BHI_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if not cpu.cc & 0x05:
+            registers.pc = ea
+
+    def op_23_BLS_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if cpu.cc & 0x05:
+            registers.pc = ea
+
+    def op_24_BCC_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if not cpu.cc & 0x01:
+            registers.pc = ea
+
+    def op_25_BLO_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if cpu.cc & 0x01:
+            registers.pc = ea
+
+    def op_26_BNE_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if not cpu.cc & 0x04:
+            registers.pc = ea
+
+    def op_27_BEQ_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if cpu.cc & 0x04:
+            registers.pc = ea
+
+    def op_28_BVC_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if not cpu.cc & 0x02:
+            registers.pc = ea
+
+    def op_29_BVS_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if cpu.cc & 0x02:
+            registers.pc = ea
+
+    def op_2a_BPL_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if not cpu.cc & 0x08:
+            registers.pc = ea
+
+    def op_2b_BMI_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if cpu.cc & 0x08:
+            registers.pc = ea
+
+    def op_2c_BGE_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if not ((cpu.cc >> 2) ^ cpu.cc) & 0x02:
+            registers.pc = ea
+
+    def op_2d_BLT_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if ((cpu.cc >> 2) ^ cpu.cc) & 0x02:
+            registers.pc = ea
+
+    def op_2e_BGT_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if not (cpu.cc & 0x04 or ((cpu.cc >> 2) ^ cpu.cc) & 0x02):
+            registers.pc = ea
+
+    def op_2f_BLE_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        if cpu.cc & 0x04 or ((cpu.cc >> 2) ^ cpu.cc) & 0x02:
+            registers.pc = ea
+
+    def op_30_LEAX_indexed(opcode):
+        ea = get_ea_indexed()
+        registers.x = ea & 0xffff
+        cpu.cc = cpu.cc & 0xfb | (0 if ea & 0xffff else 0x04)
+
+    def op_31_LEAY_indexed(opcode):
+        ea = get_ea_indexed()
+        registers.y = ea & 0xffff
+        cpu.cc = cpu.cc & 0xfb | (0 if ea & 0xffff else 0x04)
+
+    def op_32_LEAS_indexed(opcode):
+        ea = get_ea_indexed()
+        registers.s = ea & 0xffff
+
+    def op_33_LEAU_indexed(opcode):
+        ea = get_ea_indexed()
+        registers.u = ea & 0xffff
+
+    def op_34_PSHS_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        instruction_PSH(opcode, m, system_stack_pointer)
+
+    def op_35_PULS_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        instruction_PUL(opcode, m, system_stack_pointer)
+
+    def op_36_PSHU_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        instruction_PSH(opcode, m, user_stack_pointer)
+
+    def op_37_PULU_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        instruction_PUL(opcode, m, user_stack_pointer)
+
+    def op_39_RTS_inherent(opcode):
+        s = registers.s
+        registers.pc = read_word(s)
+        registers.s = (s + 2) & 0xffff
+
+    def op_3a_ABX_inherent(opcode):
+        registers.x = (registers.x + registers.b) & 0xffff
+
+    def op_3b_RTI_inherent(opcode):
+        instruction_RTI(opcode)
+
+    def op_3c_CWAI_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        instruction_CWAI(opcode, m)
+
+    def op_3d_MUL_inherent(opcode):
+        instruction_MUL(opcode)
+
+    def op_3f_SWI_inherent(opcode):
+        instruction_SWI(opcode)
+
+    def op_40_NEGA_inherent(opcode):
+        instruction_NEG_register(opcode, accu_a)
+
+    def op_43_COMA_inherent(opcode):
+        instruction_COM_register(opcode, accu_a)
+
+    def op_44_LSRA_inherent(opcode):
+        instruction_LSR_register(opcode, accu_a)
+
+    def op_46_RORA_inherent(opcode):
+        instruction_ROR_register(opcode, accu_a)
+
+    def op_47_ASRA_inherent(opcode):
+        instruction_ASR_register(opcode, accu_a)
+
+    def op_48_LSLA_inherent(opcode):
+        instruction_LSL_register(opcode, accu_a)
+
+    def op_49_ROLA_inherent(opcode):
+        instruction_ROL_register(opcode, accu_a)
+
+    def op_4a_DECA_inherent(opcode):
+        a = registers.a
+        cpu.cc = cpu.cc & 0xf1 | dec_flags[a]
+        registers.a = (a - 1) & 0xff
+
+    def op_4c_INCA_inherent(opcode):
+        a = registers.a
+        cpu.cc = cpu.cc & 0xf1 | inc_flags[a]
+        registers.a = (a + 1) & 0xff
+
+    def op_4d_TSTA_inherent(opcode):
+        x = registers.a
+        cpu.cc = cpu.cc & 0xf1 | (x & 0x80) >> 4 | (0 if x else 0x04)
+
+    def op_4f_CLRA_inherent(opcode):
+        registers.a = 0 & 0xff
+        cpu.cc = cpu.cc & 0xf0 | 0x04
+
+    def op_50_NEGB_inherent(opcode):
+        instruction_NEG_register(opcode, accu_b)
+
+    def op_53_COMB_inherent(opcode):
+        instruction_COM_register(opcode, accu_b)
+
+    def op_54_LSRB_inherent(opcode):
+        instruction_LSR_register(opcode, accu_b)
+
+    def op_56_RORB_inherent(opcode):
+        instruction_ROR_register(opcode, accu_b)
+
+    def op_57_ASRB_inherent(opcode):
+        instruction_ASR_register(opcode, accu_b)
+
+    def op_58_LSLB_inherent(opcode):
+        instruction_LSL_register(opcode, accu_b)
+
+    def op_59_ROLB_inherent(opcode):
+        instruction_ROL_register(opcode, accu_b)
+
+    def op_5a_DECB_inherent(opcode):
+        a = registers.b
+        cpu.cc = cpu.cc & 0xf1 | dec_flags[a]
+        registers.b = (a - 1) & 0xff
+
+    def op_5c_INCB_inherent(opcode):
+        a = registers.b
+        cpu.cc = cpu.cc & 0xf1 | inc_flags[a]
+        registers.b = (a + 1) & 0xff
+
+    def op_5d_TSTB_inherent(opcode):
+        x = registers.b
+        cpu.cc = cpu.cc & 0xf1 | (x & 0x80) >> 4 | (0 if x else 0x04)
+
+    def op_5f_CLRB_inherent(opcode):
+        registers.b = 0 & 0xff
+        cpu.cc = cpu.cc & 0xf0 | 0x04
+
+    def op_60_NEG_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        ea, value = instruction_NEG_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_63_COM_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        ea, value = instruction_COM_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_64_LSR_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        ea, value = instruction_LSR_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_66_ROR_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        ea, value = instruction_ROR_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_67_ASR_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        ea, value = instruction_ASR_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_68_LSL_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        ea, value = instruction_LSL_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_69_ROL_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        ea, value = instruction_ROL_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_6a_DEC_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf1 | dec_flags[m]
+        write_byte(ea, (m - 1) & 0xff)
+
+    def op_6c_INC_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf1 | inc_flags[m]
+        write_byte(ea, (m + 1) & 0xff)
+
+    def op_6d_TST_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x80) >> 4 | (0 if m else 0x04)
+
+    def op_6e_JMP_indexed(opcode):
+        ea = get_ea_indexed()
+        registers.pc = ea
+
+    def op_6f_CLR_indexed(opcode):
+        ea = get_ea_indexed()
+        cpu.cc = cpu.cc & 0xf0 | 0x04
+        write_byte(ea, 0x00)
+
+    def op_70_NEG_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_NEG_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_73_COM_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_COM_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_74_LSR_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_LSR_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_76_ROR_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_ROR_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_77_ASR_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_ASR_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_78_LSL_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_LSL_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_79_ROL_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        ea, value = instruction_ROL_memory(opcode, ea, m)
+        write_byte(ea, value)
+
+    def op_7a_DEC_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf1 | dec_flags[m]
+        write_byte(ea, (m - 1) & 0xff)
+
+    def op_7c_INC_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf1 | inc_flags[m]
+        write_byte(ea, (m + 1) & 0xff)
+
+    def op_7d_TST_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x80) >> 4 | (0 if m else 0x04)
+
+    def op_7e_JMP_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        registers.pc = ea
+
+    def op_7f_CLR_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        cpu.cc = cpu.cc & 0xf0 | 0x04
+        write_byte(ea, 0x00)
+
+    def op_80_SUBA_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        a = registers.a
+        registers.a = (a - m) & 0xff
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[a << 8 | m]
+
+    def op_81_CMPA_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[registers.a << 8 | m]
+
+    def op_82_SBCA_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        cc = cpu.cc
+        a = registers.a
+        registers.a = (a - m - (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xf0 | sub_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_83_SUBD_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        a = (registers.a << 8 | registers.b)
+        r = a - m
+        d = r
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_84_ANDA_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        r = registers.a & m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_85_BITA_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        r = registers.a & m
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_86_LDA_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        registers.a = m & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x80) >> 4 | (0 if m else 0x04)
+
+    def op_88_EORA_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        r = registers.a ^ m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_89_ADCA_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        cc = cpu.cc
+        a = registers.a
+        registers.a = (a + m + (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xd0 | add_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_8a_ORA_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        r = registers.a | m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_8b_ADDA_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        a = registers.a
+        registers.a = (a + m) & 0xff
+        cpu.cc = cpu.cc & 0xd0 | add_flags[a << 8 | m]
+
+    def op_8c_CMPX_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        a = registers.x
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_8d_BSR_relative(opcode):
+        pc = registers.pc
+        x = read_byte(pc)
+        registers.pc = pc = (pc + 1) & 0xffff
+        ea = (pc + (x - 0x100 if x & 0x80 else x)) & 0xffff
+        registers.s = s = (registers.s - 2) & 0xffff
+        write_word(s, registers.pc)
+        registers.pc = ea
+
+    def op_8e_LDX_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        registers.x = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_90_SUBA_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        a = registers.a
+        registers.a = (a - m) & 0xff
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[a << 8 | m]
+
+    def op_91_CMPA_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[registers.a << 8 | m]
+
+    def op_92_SBCA_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.a
+        registers.a = (a - m - (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xf0 | sub_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_93_SUBD_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        a = (registers.a << 8 | registers.b)
+        r = a - m
+        d = r
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_94_ANDA_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        r = registers.a & m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_95_BITA_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        r = registers.a & m
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_96_LDA_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        registers.a = m & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x80) >> 4 | (0 if m else 0x04)
+
+    def op_97_STA_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        value = registers.a
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x80) >> 4 | (0 if value else 0x04)
+        write_byte(ea, value)
+
+    def op_98_EORA_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        r = registers.a ^ m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_99_ADCA_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.a
+        registers.a = (a + m + (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xd0 | add_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_9a_ORA_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        r = registers.a | m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_9b_ADDA_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        a = registers.a
+        registers.a = (a + m) & 0xff
+        cpu.cc = cpu.cc & 0xd0 | add_flags[a << 8 | m]
+
+    def op_9c_CMPX_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        a = registers.x
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_9d_JSR_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        registers.s = s = (registers.s - 2) & 0xffff
+        write_word(s, registers.pc)
+        registers.pc = ea
+
+    def op_9e_LDX_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        registers.x = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_9f_STX_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        value = registers.x
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_a0_SUBA_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        a = registers.a
+        registers.a = (a - m) & 0xff
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[a << 8 | m]
+
+    def op_a1_CMPA_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[registers.a << 8 | m]
+
+    def op_a2_SBCA_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.a
+        registers.a = (a - m - (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xf0 | sub_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_a3_SUBD_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        a = (registers.a << 8 | registers.b)
+        r = a - m
+        d = r
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_a4_ANDA_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        r = registers.a & m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_a5_BITA_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        r = registers.a & m
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_a6_LDA_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        registers.a = m & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x80) >> 4 | (0 if m else 0x04)
+
+    def op_a7_STA_indexed(opcode):
+        ea = get_ea_indexed()
+        value = registers.a
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x80) >> 4 | (0 if value else 0x04)
+        write_byte(ea, value)
+
+    def op_a8_EORA_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        r = registers.a ^ m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_a9_ADCA_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.a
+        registers.a = (a + m + (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xd0 | add_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_aa_ORA_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        r = registers.a | m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_ab_ADDA_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        a = registers.a
+        registers.a = (a + m) & 0xff
+        cpu.cc = cpu.cc & 0xd0 | add_flags[a << 8 | m]
+
+    def op_ac_CMPX_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        a = registers.x
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_ad_JSR_indexed(opcode):
+        ea = get_ea_indexed()
+        registers.s = s = (registers.s - 2) & 0xffff
+        write_word(s, registers.pc)
+        registers.pc = ea
+
+    def op_ae_LDX_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        registers.x = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_af_STX_indexed(opcode):
+        ea = get_ea_indexed()
+        value = registers.x
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_b0_SUBA_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        a = registers.a
+        registers.a = (a - m) & 0xff
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[a << 8 | m]
+
+    def op_b1_CMPA_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[registers.a << 8 | m]
+
+    def op_b2_SBCA_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.a
+        registers.a = (a - m - (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xf0 | sub_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_b3_SUBD_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        a = (registers.a << 8 | registers.b)
+        r = a - m
+        d = r
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_b4_ANDA_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        r = registers.a & m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_b5_BITA_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        r = registers.a & m
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_b6_LDA_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        registers.a = m & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x80) >> 4 | (0 if m else 0x04)
+
+    def op_b7_STA_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        value = registers.a
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x80) >> 4 | (0 if value else 0x04)
+        write_byte(ea, value)
+
+    def op_b8_EORA_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        r = registers.a ^ m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_b9_ADCA_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.a
+        registers.a = (a + m + (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xd0 | add_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_ba_ORA_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        r = registers.a | m
+        registers.a = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_bb_ADDA_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        a = registers.a
+        registers.a = (a + m) & 0xff
+        cpu.cc = cpu.cc & 0xd0 | add_flags[a << 8 | m]
+
+    def op_bc_CMPX_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        a = registers.x
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_bd_JSR_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        registers.s = s = (registers.s - 2) & 0xffff
+        write_word(s, registers.pc)
+        registers.pc = ea
+
+    def op_be_LDX_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        registers.x = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_bf_STX_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        value = registers.x
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_c0_SUBB_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        a = registers.b
+        registers.b = (a - m) & 0xff
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[a << 8 | m]
+
+    def op_c1_CMPB_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[registers.b << 8 | m]
+
+    def op_c2_SBCB_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        cc = cpu.cc
+        a = registers.b
+        registers.b = (a - m - (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xf0 | sub_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_c3_ADDD_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        a = (registers.a << 8 | registers.b)
+        r = a + m
+        d = r
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_c4_ANDB_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        r = registers.b & m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_c5_BITB_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        r = registers.b & m
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_c6_LDB_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        registers.b = m & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x80) >> 4 | (0 if m else 0x04)
+
+    def op_c8_EORB_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        r = registers.b ^ m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_c9_ADCB_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        cc = cpu.cc
+        a = registers.b
+        registers.b = (a + m + (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xd0 | add_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_ca_ORB_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        r = registers.b | m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_cb_ADDB_immediate(opcode):
+        pc = registers.pc
+        m = read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        a = registers.b
+        registers.b = (a + m) & 0xff
+        cpu.cc = cpu.cc & 0xd0 | add_flags[a << 8 | m]
+
+    def op_cc_LDD_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        d = m
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_ce_LDU_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        registers.u = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_d0_SUBB_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        a = registers.b
+        registers.b = (a - m) & 0xff
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[a << 8 | m]
+
+    def op_d1_CMPB_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[registers.b << 8 | m]
+
+    def op_d2_SBCB_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.b
+        registers.b = (a - m - (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xf0 | sub_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_d3_ADDD_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        a = (registers.a << 8 | registers.b)
+        r = a + m
+        d = r
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_d4_ANDB_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        r = registers.b & m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_d5_BITB_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        r = registers.b & m
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_d6_LDB_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        registers.b = m & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x80) >> 4 | (0 if m else 0x04)
+
+    def op_d7_STB_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        value = registers.b
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x80) >> 4 | (0 if value else 0x04)
+        write_byte(ea, value)
+
+    def op_d8_EORB_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        r = registers.b ^ m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_d9_ADCB_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.b
+        registers.b = (a + m + (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xd0 | add_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_da_ORB_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        r = registers.b | m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_db_ADDB_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_byte(ea)
+        a = registers.b
+        registers.b = (a + m) & 0xff
+        cpu.cc = cpu.cc & 0xd0 | add_flags[a << 8 | m]
+
+    def op_dc_LDD_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        d = m
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_dd_STD_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        value = (registers.a << 8 | registers.b)
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_de_LDU_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        registers.u = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_df_STU_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        value = registers.u
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_e0_SUBB_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        a = registers.b
+        registers.b = (a - m) & 0xff
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[a << 8 | m]
+
+    def op_e1_CMPB_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[registers.b << 8 | m]
+
+    def op_e2_SBCB_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.b
+        registers.b = (a - m - (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xf0 | sub_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_e3_ADDD_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        a = (registers.a << 8 | registers.b)
+        r = a + m
+        d = r
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_e4_ANDB_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        r = registers.b & m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_e5_BITB_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        r = registers.b & m
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_e6_LDB_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        registers.b = m & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x80) >> 4 | (0 if m else 0x04)
+
+    def op_e7_STB_indexed(opcode):
+        ea = get_ea_indexed()
+        value = registers.b
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x80) >> 4 | (0 if value else 0x04)
+        write_byte(ea, value)
+
+    def op_e8_EORB_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        r = registers.b ^ m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_e9_ADCB_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.b
+        registers.b = (a + m + (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xd0 | add_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_ea_ORB_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        r = registers.b | m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_eb_ADDB_indexed(opcode):
+        ea = get_ea_indexed()
+        m = read_byte(ea)
+        a = registers.b
+        registers.b = (a + m) & 0xff
+        cpu.cc = cpu.cc & 0xd0 | add_flags[a << 8 | m]
+
+    def op_ec_LDD_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        d = m
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_ed_STD_indexed(opcode):
+        ea = get_ea_indexed()
+        value = (registers.a << 8 | registers.b)
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_ee_LDU_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        registers.u = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_ef_STU_indexed(opcode):
+        ea = get_ea_indexed()
+        value = registers.u
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_f0_SUBB_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        a = registers.b
+        registers.b = (a - m) & 0xff
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[a << 8 | m]
+
+    def op_f1_CMPB_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        cpu.cc = cpu.cc & 0xf0 | sub_flags[registers.b << 8 | m]
+
+    def op_f2_SBCB_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.b
+        registers.b = (a - m - (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xf0 | sub_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_f3_ADDD_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        a = (registers.a << 8 | registers.b)
+        r = a + m
+        d = r
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_f4_ANDB_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        r = registers.b & m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_f5_BITB_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        r = registers.b & m
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_f6_LDB_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        registers.b = m & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x80) >> 4 | (0 if m else 0x04)
+
+    def op_f7_STB_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        value = registers.b
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x80) >> 4 | (0 if value else 0x04)
+        write_byte(ea, value)
+
+    def op_f8_EORB_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        r = registers.b ^ m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_f9_ADCB_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        cc = cpu.cc
+        a = registers.b
+        registers.b = (a + m + (cc & 0x01)) & 0xff
+        cpu.cc = cc & 0xd0 | add_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    def op_fa_ORB_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        r = registers.b | m
+        registers.b = r & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (r & 0x80) >> 4 | (0 if r else 0x04)
+
+    def op_fb_ADDB_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_byte(ea)
+        a = registers.b
+        registers.b = (a + m) & 0xff
+        cpu.cc = cpu.cc & 0xd0 | add_flags[a << 8 | m]
+
+    def op_fc_LDD_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        d = m
+        registers.a = (d >> 8) & 0xff
+        registers.b = d & 0xff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_fd_STD_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        value = (registers.a << 8 | registers.b)
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_fe_LDU_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        registers.u = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_ff_STU_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        value = registers.u
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_1021_LBRN_relative_word(opcode):
+        pc = registers.pc
+        read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+
+    def op_1022_LBHI_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if not cpu.cc & 0x05:
+            registers.pc = ea
+
+    def op_1023_LBLS_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if cpu.cc & 0x05:
+            registers.pc = ea
+
+    def op_1024_LBCC_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if not cpu.cc & 0x01:
+            registers.pc = ea
+
+    def op_1025_LBCS_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if cpu.cc & 0x01:
+            registers.pc = ea
+
+    def op_1026_LBNE_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if not cpu.cc & 0x04:
+            registers.pc = ea
+
+    def op_1027_LBEQ_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if cpu.cc & 0x04:
+            registers.pc = ea
+
+    def op_1028_LBVC_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if not cpu.cc & 0x02:
+            registers.pc = ea
+
+    def op_1029_LBVS_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if cpu.cc & 0x02:
+            registers.pc = ea
+
+    def op_102a_LBPL_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if not cpu.cc & 0x08:
+            registers.pc = ea
+
+    def op_102b_LBMI_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if cpu.cc & 0x08:
+            registers.pc = ea
+
+    def op_102c_LBGE_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if not ((cpu.cc >> 2) ^ cpu.cc) & 0x02:
+            registers.pc = ea
+
+    def op_102d_LBLT_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if ((cpu.cc >> 2) ^ cpu.cc) & 0x02:
+            registers.pc = ea
+
+    def op_102e_LBGT_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if not (cpu.cc & 0x04 or ((cpu.cc >> 2) ^ cpu.cc) & 0x02):
+            registers.pc = ea
+
+    def op_102f_LBLE_relative_word(opcode):
+        pc = registers.pc
+        x = read_word(pc)
+        registers.pc = pc = (pc + 2) & 0xffff
+        ea = (pc + x) & 0xffff
+        if cpu.cc & 0x04 or ((cpu.cc >> 2) ^ cpu.cc) & 0x02:
+            registers.pc = ea
+
+    def op_103f_SWI2_inherent(opcode):
+        instruction_SWI2(opcode)
+
+    def op_1083_CMPD_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        a = (registers.a << 8 | registers.b)
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_108c_CMPY_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        a = registers.y
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_108e_LDY_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        registers.y = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_1093_CMPD_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        a = (registers.a << 8 | registers.b)
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_109c_CMPY_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        a = registers.y
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_109e_LDY_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        registers.y = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_109f_STY_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        value = registers.y
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_10a3_CMPD_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        a = (registers.a << 8 | registers.b)
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_10ac_CMPY_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        a = registers.y
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_10ae_LDY_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        registers.y = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_10af_STY_indexed(opcode):
+        ea = get_ea_indexed()
+        value = registers.y
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_10b3_CMPD_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        a = (registers.a << 8 | registers.b)
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_10bc_CMPY_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        a = registers.y
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_10be_LDY_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        registers.y = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_10bf_STY_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        value = registers.y
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_10ce_LDS_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        registers.s = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_10de_LDS_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        registers.s = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_10df_STS_direct(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        value = registers.s
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_10ee_LDS_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        registers.s = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_10ef_STS_indexed(opcode):
+        ea = get_ea_indexed()
+        value = registers.s
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_10fe_LDS_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        registers.s = m & 0xffff
+        cpu.cc = cpu.cc & 0xf1 | (m & 0x8000) >> 12 | (0 if m else 0x04)
+
+    def op_10ff_STS_extended(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        value = registers.s
+        cpu.cc = cpu.cc & 0xf1 | (value & 0x8000) >> 12 | (0 if value else 0x04)
+        write_word(ea, value)
+
+    def op_113f_SWI3_inherent(opcode):
+        instruction_SWI3(opcode)
+
+    def op_1183_CMPU_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        a = registers.u
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_118c_CMPS_immediate_word(opcode):
+        pc = registers.pc
+        m = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        a = registers.s
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_1193_CMPU_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        a = registers.u
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_119c_CMPS_direct_word(opcode):
+        pc = registers.pc
+        ea = registers.dp << 8 | read_byte(pc)
+        registers.pc = (pc + 1) & 0xffff
+        m = read_word(ea)
+        a = registers.s
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_11a3_CMPU_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        a = registers.u
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_11ac_CMPS_indexed_word(opcode):
+        ea = get_ea_indexed()
+        m = read_word(ea)
+        a = registers.s
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_11b3_CMPU_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        a = registers.u
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def op_11bc_CMPS_extended_word(opcode):
+        pc = registers.pc
+        ea = read_word(pc)
+        registers.pc = (pc + 2) & 0xffff
+        m = read_word(ea)
+        a = registers.s
+        r = a - m
+        cpu.cc = (
+            cpu.cc & 0xf0
+            | (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ m ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    return {
+        0x00: op_00_NEG_direct,
+        0x03: op_03_COM_direct,
+        0x04: op_04_LSR_direct,
+        0x06: op_06_ROR_direct,
+        0x07: op_07_ASR_direct,
+        0x08: op_08_LSL_direct,
+        0x09: op_09_ROL_direct,
+        0x0a: op_0a_DEC_direct,
+        0x0c: op_0c_INC_direct,
+        0x0d: op_0d_TST_direct,
+        0x0e: op_0e_JMP_direct,
+        0x0f: op_0f_CLR_direct,
+        0x12: op_12_NOP_inherent,
+        0x13: op_13_SYNC_inherent,
+        0x16: op_16_LBRA_relative_word,
+        0x17: op_17_LBSR_relative_word,
+        0x19: op_19_DAA_inherent,
+        0x1a: op_1a_ORCC_immediate,
+        0x1c: op_1c_ANDCC_immediate,
+        0x1d: op_1d_SEX_inherent,
+        0x1e: op_1e_EXG_immediate,
+        0x1f: op_1f_TFR_immediate,
+        0x20: op_20_BRA_relative,
+        0x21: op_21_BRN_relative,
+        0x22: op_22_BHI_relative,
+        0x23: op_23_BLS_relative,
+        0x24: op_24_BCC_relative,
+        0x25: op_25_BLO_relative,
+        0x26: op_26_BNE_relative,
+        0x27: op_27_BEQ_relative,
+        0x28: op_28_BVC_relative,
+        0x29: op_29_BVS_relative,
+        0x2a: op_2a_BPL_relative,
+        0x2b: op_2b_BMI_relative,
+        0x2c: op_2c_BGE_relative,
+        0x2d: op_2d_BLT_relative,
+        0x2e: op_2e_BGT_relative,
+        0x2f: op_2f_BLE_relative,
+        0x30: op_30_LEAX_indexed,
+        0x31: op_31_LEAY_indexed,
+        0x32: op_32_LEAS_indexed,
+        0x33: op_33_LEAU_indexed,
+        0x34: op_34_PSHS_immediate,
+        0x35: op_35_PULS_immediate,
+        0x36: op_36_PSHU_immediate,
+        0x37: op_37_PULU_immediate,
+        0x39: op_39_RTS_inherent,
+        0x3a: op_3a_ABX_inherent,
+        0x3b: op_3b_RTI_inherent,
+        0x3c: op_3c_CWAI_immediate,
+        0x3d: op_3d_MUL_inherent,
+        0x3f: op_3f_SWI_inherent,
+        0x40: op_40_NEGA_inherent,
+        0x43: op_43_COMA_inherent,
+        0x44: op_44_LSRA_inherent,
+        0x46: op_46_RORA_inherent,
+        0x47: op_47_ASRA_inherent,
+        0x48: op_48_LSLA_inherent,
+        0x49: op_49_ROLA_inherent,
+        0x4a: op_4a_DECA_inherent,
+        0x4c: op_4c_INCA_inherent,
+        0x4d: op_4d_TSTA_inherent,
+        0x4f: op_4f_CLRA_inherent,
+        0x50: op_50_NEGB_inherent,
+        0x53: op_53_COMB_inherent,
+        0x54: op_54_LSRB_inherent,
+        0x56: op_56_RORB_inherent,
+        0x57: op_57_ASRB_inherent,
+        0x58: op_58_LSLB_inherent,
+        0x59: op_59_ROLB_inherent,
+        0x5a: op_5a_DECB_inherent,
+        0x5c: op_5c_INCB_inherent,
+        0x5d: op_5d_TSTB_inherent,
+        0x5f: op_5f_CLRB_inherent,
+        0x60: op_60_NEG_indexed,
+        0x63: op_63_COM_indexed,
+        0x64: op_64_LSR_indexed,
+        0x66: op_66_ROR_indexed,
+        0x67: op_67_ASR_indexed,
+        0x68: op_68_LSL_indexed,
+        0x69: op_69_ROL_indexed,
+        0x6a: op_6a_DEC_indexed,
+        0x6c: op_6c_INC_indexed,
+        0x6d: op_6d_TST_indexed,
+        0x6e: op_6e_JMP_indexed,
+        0x6f: op_6f_CLR_indexed,
+        0x70: op_70_NEG_extended,
+        0x73: op_73_COM_extended,
+        0x74: op_74_LSR_extended,
+        0x76: op_76_ROR_extended,
+        0x77: op_77_ASR_extended,
+        0x78: op_78_LSL_extended,
+        0x79: op_79_ROL_extended,
+        0x7a: op_7a_DEC_extended,
+        0x7c: op_7c_INC_extended,
+        0x7d: op_7d_TST_extended,
+        0x7e: op_7e_JMP_extended,
+        0x7f: op_7f_CLR_extended,
+        0x80: op_80_SUBA_immediate,
+        0x81: op_81_CMPA_immediate,
+        0x82: op_82_SBCA_immediate,
+        0x83: op_83_SUBD_immediate_word,
+        0x84: op_84_ANDA_immediate,
+        0x85: op_85_BITA_immediate,
+        0x86: op_86_LDA_immediate,
+        0x88: op_88_EORA_immediate,
+        0x89: op_89_ADCA_immediate,
+        0x8a: op_8a_ORA_immediate,
+        0x8b: op_8b_ADDA_immediate,
+        0x8c: op_8c_CMPX_immediate_word,
+        0x8d: op_8d_BSR_relative,
+        0x8e: op_8e_LDX_immediate_word,
+        0x90: op_90_SUBA_direct,
+        0x91: op_91_CMPA_direct,
+        0x92: op_92_SBCA_direct,
+        0x93: op_93_SUBD_direct_word,
+        0x94: op_94_ANDA_direct,
+        0x95: op_95_BITA_direct,
+        0x96: op_96_LDA_direct,
+        0x97: op_97_STA_direct,
+        0x98: op_98_EORA_direct,
+        0x99: op_99_ADCA_direct,
+        0x9a: op_9a_ORA_direct,
+        0x9b: op_9b_ADDA_direct,
+        0x9c: op_9c_CMPX_direct_word,
+        0x9d: op_9d_JSR_direct,
+        0x9e: op_9e_LDX_direct_word,
+        0x9f: op_9f_STX_direct,
+        0xa0: op_a0_SUBA_indexed,
+        0xa1: op_a1_CMPA_indexed,
+        0xa2: op_a2_SBCA_indexed,
+        0xa3: op_a3_SUBD_indexed_word,
+        0xa4: op_a4_ANDA_indexed,
+        0xa5: op_a5_BITA_indexed,
+        0xa6: op_a6_LDA_indexed,
+        0xa7: op_a7_STA_indexed,
+        0xa8: op_a8_EORA_indexed,
+        0xa9: op_a9_ADCA_indexed,
+        0xaa: op_aa_ORA_indexed,
+        0xab: op_ab_ADDA_indexed,
+        0xac: op_ac_CMPX_indexed_word,
+        0xad: op_ad_JSR_indexed,
+        0xae: op_ae_LDX_indexed_word,
+        0xaf: op_af_STX_indexed,
+        0xb0: op_b0_SUBA_extended,
+        0xb1: op_b1_CMPA_extended,
+        0xb2: op_b2_SBCA_extended,
+        0xb3: op_b3_SUBD_extended_word,
+        0xb4: op_b4_ANDA_extended,
+        0xb5: op_b5_BITA_extended,
+        0xb6: op_b6_LDA_extended,
+        0xb7: op_b7_STA_extended,
+        0xb8: op_b8_EORA_extended,
+        0xb9: op_b9_ADCA_extended,
+        0xba: op_ba_ORA_extended,
+        0xbb: op_bb_ADDA_extended,
+        0xbc: op_bc_CMPX_extended_word,
+        0xbd: op_bd_JSR_extended,
+        0xbe: op_be_LDX_extended_word,
+        0xbf: op_bf_STX_extended,
+        0xc0: op_c0_SUBB_immediate,
+        0xc1: op_c1_CMPB_immediate,
+        0xc2: op_c2_SBCB_immediate,
+        0xc3: op_c3_ADDD_immediate_word,
+        0xc4: op_c4_ANDB_immediate,
+        0xc5: op_c5_BITB_immediate,
+        0xc6: op_c6_LDB_immediate,
+        0xc8: op_c8_EORB_immediate,
+        0xc9: op_c9_ADCB_immediate,
+        0xca: op_ca_ORB_immediate,
+        0xcb: op_cb_ADDB_immediate,
+        0xcc: op_cc_LDD_immediate_word,
+        0xce: op_ce_LDU_immediate_word,
+        0xd0: op_d0_SUBB_direct,
+        0xd1: op_d1_CMPB_direct,
+        0xd2: op_d2_SBCB_direct,
+        0xd3: op_d3_ADDD_direct_word,
+        0xd4: op_d4_ANDB_direct,
+        0xd5: op_d5_BITB_direct,
+        0xd6: op_d6_LDB_direct,
+        0xd7: op_d7_STB_direct,
+        0xd8: op_d8_EORB_direct,
+        0xd9: op_d9_ADCB_direct,
+        0xda: op_da_ORB_direct,
+        0xdb: op_db_ADDB_direct,
+        0xdc: op_dc_LDD_direct_word,
+        0xdd: op_dd_STD_direct,
+        0xde: op_de_LDU_direct_word,
+        0xdf: op_df_STU_direct,
+        0xe0: op_e0_SUBB_indexed,
+        0xe1: op_e1_CMPB_indexed,
+        0xe2: op_e2_SBCB_indexed,
+        0xe3: op_e3_ADDD_indexed_word,
+        0xe4: op_e4_ANDB_indexed,
+        0xe5: op_e5_BITB_indexed,
+        0xe6: op_e6_LDB_indexed,
+        0xe7: op_e7_STB_indexed,
+        0xe8: op_e8_EORB_indexed,
+        0xe9: op_e9_ADCB_indexed,
+        0xea: op_ea_ORB_indexed,
+        0xeb: op_eb_ADDB_indexed,
+        0xec: op_ec_LDD_indexed_word,
+        0xed: op_ed_STD_indexed,
+        0xee: op_ee_LDU_indexed_word,
+        0xef: op_ef_STU_indexed,
+        0xf0: op_f0_SUBB_extended,
+        0xf1: op_f1_CMPB_extended,
+        0xf2: op_f2_SBCB_extended,
+        0xf3: op_f3_ADDD_extended_word,
+        0xf4: op_f4_ANDB_extended,
+        0xf5: op_f5_BITB_extended,
+        0xf6: op_f6_LDB_extended,
+        0xf7: op_f7_STB_extended,
+        0xf8: op_f8_EORB_extended,
+        0xf9: op_f9_ADCB_extended,
+        0xfa: op_fa_ORB_extended,
+        0xfb: op_fb_ADDB_extended,
+        0xfc: op_fc_LDD_extended_word,
+        0xfd: op_fd_STD_extended,
+        0xfe: op_fe_LDU_extended_word,
+        0xff: op_ff_STU_extended,
+        0x1021: op_1021_LBRN_relative_word,
+        0x1022: op_1022_LBHI_relative_word,
+        0x1023: op_1023_LBLS_relative_word,
+        0x1024: op_1024_LBCC_relative_word,
+        0x1025: op_1025_LBCS_relative_word,
+        0x1026: op_1026_LBNE_relative_word,
+        0x1027: op_1027_LBEQ_relative_word,
+        0x1028: op_1028_LBVC_relative_word,
+        0x1029: op_1029_LBVS_relative_word,
+        0x102a: op_102a_LBPL_relative_word,
+        0x102b: op_102b_LBMI_relative_word,
+        0x102c: op_102c_LBGE_relative_word,
+        0x102d: op_102d_LBLT_relative_word,
+        0x102e: op_102e_LBGT_relative_word,
+        0x102f: op_102f_LBLE_relative_word,
+        0x103f: op_103f_SWI2_inherent,
+        0x1083: op_1083_CMPD_immediate_word,
+        0x108c: op_108c_CMPY_immediate_word,
+        0x108e: op_108e_LDY_immediate_word,
+        0x1093: op_1093_CMPD_direct_word,
+        0x109c: op_109c_CMPY_direct_word,
+        0x109e: op_109e_LDY_direct_word,
+        0x109f: op_109f_STY_direct,
+        0x10a3: op_10a3_CMPD_indexed_word,
+        0x10ac: op_10ac_CMPY_indexed_word,
+        0x10ae: op_10ae_LDY_indexed_word,
+        0x10af: op_10af_STY_indexed,
+        0x10b3: op_10b3_CMPD_extended_word,
+        0x10bc: op_10bc_CMPY_extended_word,
+        0x10be: op_10be_LDY_extended_word,
+        0x10bf: op_10bf_STY_extended,
+        0x10ce: op_10ce_LDS_immediate_word,
+        0x10de: op_10de_LDS_direct_word,
+        0x10df: op_10df_STS_direct,
+        0x10ee: op_10ee_LDS_indexed_word,
+        0x10ef: op_10ef_STS_indexed,
+        0x10fe: op_10fe_LDS_extended_word,
+        0x10ff: op_10ff_STS_extended,
+        0x113f: op_113f_SWI3_inherent,
+        0x1183: op_1183_CMPU_immediate_word,
+        0x118c: op_118c_CMPS_immediate_word,
+        0x1193: op_1193_CMPU_direct_word,
+        0x119c: op_119c_CMPS_direct_word,
+        0x11a3: op_11a3_CMPU_indexed_word,
+        0x11ac: op_11ac_CMPS_indexed_word,
+        0x11b3: op_11b3_CMPU_extended_word,
+        0x11bc: op_11bc_CMPS_extended_word,
+    }
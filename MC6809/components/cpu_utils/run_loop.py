@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Generated run loops for CPUBase.run_until(): Only the requested stop
+    conditions are compiled into the per instruction loop condition.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import functools
+
+
+_RUN_LOOP_TEMPLATE = """
+def run_loop(cpu, get_and_call_next_op, scheduler, program_counter, mem, end_pc, end_cycles, address, value):
+    while True:
+        limit = scheduler.next_deadline
+        if limit > end_cycles:
+            limit = end_cycles
+
+        while cpu.cycles < limit{conditions}:
+            get_and_call_next_op()
+
+        if cpu.cycles >= scheduler.next_deadline:
+            scheduler.run_due(cpu.cycles)
+        elif cpu.cycles >= end_cycles{stops}:
+            return
+"""
+
+
+@functools.cache
+def get_run_loop(check_pc, check_memory):
+    """
+    Returns a loop function, that runs ops until the CPU cycles reached 'end_cycles',
+    the program counter is 'end_pc' (if check_pc) or the memory at 'address'
+    is 'value' (if check_memory). Due cycle events are called in between.
+    """
+    conditions = stops = ""
+    if check_pc:
+        conditions += " and program_counter.value != end_pc"
+        stops += " or program_counter.value == end_pc"
+    if check_memory:
+        conditions += " and mem[address] != value"
+        stops += " or mem[address] == value"
+
+    namespace = {}
+    exec(_RUN_LOOP_TEMPLATE.format(conditions=conditions, stops=stops), namespace)
+    return namespace["run_loop"]
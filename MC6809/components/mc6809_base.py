@@ -33,7 +33,12 @@ from MC6809.components.cpu_utils.MC6809_registers import (
     ValueStorage16Bit,
     convert_differend_width,
 )
+from MC6809.components.cpu_utils.run_loop import get_run_loop
+from MC6809.components.mc6809_breakpoints import DebugStop
+from MC6809.components.mc6809_save_state import read_state, write_state
+from MC6809.components.mc6809_scheduler import NO_DEADLINE, CycleScheduler
 from MC6809.components.mc6809_tools import calc_new_count
+from MC6809.components.mc6809_trace_file import TraceWriter
 from MC6809.components.MC6809data.MC6809_op_data import (
     REG_A,
     REG_B,
@@ -46,6 +51,7 @@ from MC6809.components.MC6809data.MC6809_op_data import (
     REG_X,
     REG_Y,
 )
+from MC6809.components.memory import Memory
 
 
 log = logging.getLogger("MC6809")
@@ -68,10 +74,15 @@ class CPUBase:
     RESET_VECTOR = 0xfffe
 
     STARTUP_BURST_COUNT = 100
+    fast_engine = False  # Use the generated ops from instruction_fast.py ?
+
     min_burst_count = 10  # minimum outer op count per burst
     max_burst_count = 10000  # maximum outer op count per burst
 
-    def __init__(self, memory, cfg):
+    # More than the cycles of the longest op incl. the cycles of the memory accesses (e.g.: SWI)
+    max_op_cycles = 64
+
+    def __init__(self, memory, cfg, trace=True, trace_writer=None):
         self.memory = memory
         self.memory.cpu = self  # FIXME
         self.cfg = cfg
@@ -80,9 +91,37 @@ class CPUBase:
         self.cycles = 0
         self.last_op_address = 0  # Store the current run opcode memory address
         self.outer_burst_op_count = self.STARTUP_BURST_COUNT
+        self.scheduler = CycleScheduler()  # CPU cycle triggered events
 
         # start_http_control_server(self, cfg) # TODO: Move into seperate Class
 
+        self.create_registers()
+
+        super().__init__()
+
+        self.register_str2object = self.get_register_str2object()
+
+        # Write the binary trace into cfg.trace_file, only if trace=True: e.g.: load_state() creates
+        # a new CPU from the same cfg and must not truncate the trace file.
+        # A given 'trace_writer' continues the trace of a other CPU, see: change_cpu()
+        self.trace_writer = trace_writer
+        if trace_writer is None and trace and cfg.trace_file:
+            # The CPU owns the file: It's closed in close_trace()
+            self.trace_writer = TraceWriter(open(cfg.trace_file, "wb"))
+
+#         log.debug("Add opcode functions:")
+        self.op_collection = OpCollection(self)
+        self.opcode_dict = self.op_collection.get_opcode_dict()
+
+#         log.debug("illegal ops: %s" % ",".join(["$%x" % c for c in ILLEGAL_OPS]))
+        # add illegal instruction
+#         for opcode in ILLEGAL_OPS:
+#             self.opcode_dict[opcode] = IllegalInstruction(self, opcode)
+
+    def create_registers(self):
+        """
+        Create the register objects. Can be overwritten to use an other register storage.
+        """
         self.index_x = ValueStorage16Bit(REG_X, 0)  # X - 16 bit index register
         self.index_y = ValueStorage16Bit(REG_Y, 0)  # Y - 16 bit index register
 
@@ -105,9 +144,8 @@ class CPUBase:
         # DP - 8 bit direct page register
         self.direct_page = ValueStorage8Bit(REG_DP, 0)
 
-        super().__init__()
-
-        self.register_str2object = {
+    def get_register_str2object(self):
+        return {
             REG_X: self.index_x,
             REG_Y: self.index_y,
 
@@ -126,17 +164,9 @@ class CPUBase:
             undefined_reg.name: undefined_reg,  # for TFR, EXG
         }
 
-#         log.debug("Add opcode functions:")
-        self.opcode_dict = OpCollection(self).get_opcode_dict()
-
-#         log.debug("illegal ops: %s" % ",".join(["$%x" % c for c in ILLEGAL_OPS]))
-        # add illegal instruction
-#         for opcode in ILLEGAL_OPS:
-#             self.opcode_dict[opcode] = IllegalInstruction(self, opcode)
-
-    def get_state(self):
+    def get_register_state(self):
         """
-        used in unittests
+        The CPU state without the memory
         """
         return {
             REG_X: self.index_x.value,
@@ -154,13 +184,10 @@ class CPUBase:
             REG_CC: self.get_cc_value(),
 
             "cycles": self.cycles,
-            "RAM": tuple(self.memory._mem)  # copy of array.array() values,
+            "wait_state": self.wait_state,
         }
 
-    def set_state(self, state):
-        """
-        used in unittests
-        """
+    def set_register_state(self, state):
         self.index_x.set(state[REG_X])
         self.index_y.set(state[REG_Y])
 
@@ -176,7 +203,99 @@ class CPUBase:
         self.set_cc(state[REG_CC])
 
         self.cycles = state["cycles"]
-        self.memory.load(address=0x0000, data=state["RAM"])
+        self.wait_state = state.get("wait_state")
+
+    def get_state(self):
+        """
+        used in unittests
+        """
+        state = self.get_register_state()
+        state["RAM"] = self.memory.snapshot()
+        return state
+
+    def set_state(self, state):
+        """
+        used in unittests
+        """
+        self.set_register_state(state)
+        self.memory.restore(state["RAM"])
+
+    def save_state(self, fp, compress=True):
+        """
+        Write the CPU and memory state into the binary file object 'fp'.
+        See: mc6809_save_state.py
+        """
+        write_state(self, fp, compress=compress)
+
+    def restore_state(self, fp):
+        """
+        Restore the state from save_state(): The ROMs must be the same.
+        """
+        read_state(self, fp)
+
+    @classmethod
+    def load_state(cls, fp, cfg, trace=False):
+        """
+        Returns a new CPU with the state from save_state().
+        The CPU writes no binary trace into cfg.trace_file, unless trace=True.
+        """
+        cpu = cls(Memory(cfg), cfg, trace=trace)
+        cpu.restore_state(fp)
+        return cpu
+
+    def clone_memory(self):
+        """
+        Returns a copy of the memory for clone(). Mixins that add memory
+        handlers must remove them from the copy.
+        """
+        return self.memory.clone()
+
+    def release_memory_handlers(self):
+        """
+        Remove the memory handlers, that the CPU adds on demand, e.g.: before
+        the memory handlers of the periphery are replaced.
+        """
+
+    def clone(self):
+        """
+        Returns a independent CPU of the same class with a copy of the
+        registers, the cycles, the interrupt lines and the memory,
+        e.g.: for a tree search or a speculative execution.
+
+        The clone is created without __init__(): The ROMs are not loaded again
+        and the collected opcode functions are only bound to the new CPU,
+        see: init_clone(). Cycle events, breakpoints and watchpoints are not
+        copied and the clone writes no binary trace.
+        """
+        cpu = object.__new__(type(self))
+        # The functions of the instance (e.g.: a dispatcher closure) are bound to self:
+        cpu.__dict__.update((name, value) for name, value in self.__dict__.items() if not callable(value))
+        cpu.memory = self.clone_memory()
+        cpu.memory.cpu = cpu  # FIXME
+        cpu.init_clone(self)
+        return cpu
+
+    def init_clone(self, origin):
+        """
+        Called by clone() instead of __init__(): The plain attributes are
+        copied from 'origin' and the memory is a copy. Mixins with objects,
+        that belong to one CPU, must create them here, like in __init__().
+        """
+        self.running = True
+        self.scheduler = CycleScheduler()
+        self.trace_writer = None
+
+        self.create_registers()
+
+        super().init_clone(origin)
+
+        self.register_str2object = self.get_register_str2object()
+        self.set_register_state(origin.get_register_state())
+
+        self.op_collection = origin.op_collection.clone(self)
+        self.opcode_dict = self.op_collection.get_opcode_dict()
+
+        self.update_interrupts()
 
     ####
 
@@ -215,6 +334,9 @@ class CPUBase:
     ####
 
     def get_and_call_next_op(self):
+        if self.interrupt_pending:
+            self.service_interrupts()  # Runs like a instruction
+            return
         op_address, opcode = self.read_pc_byte()
         # try:
         self.call_instruction_func(op_address, opcode)
@@ -229,6 +351,15 @@ class CPUBase:
     def quit(self):
         log.critical("CPU quit() called.")
         self.running = False
+        self.close_trace()
+
+    def close_trace(self):
+        """
+        Write the rest of the binary trace and close the trace file
+        """
+        if self.trace_writer is not None and not self.trace_writer.closed:
+            self.trace_writer.close()
+            self.trace_writer.fp.close()
 
     def call_instruction_func(self, op_address, opcode):
         self.last_op_address = op_address
@@ -244,48 +375,59 @@ class CPUBase:
 
     ####
 
-    # TODO: Move to __init__
-    quickest_sync_callback_cycles = None
-    sync_callbacks_cyles = {}
-    sync_callbacks = []
+    def add_cycle_event(self, cycles, callback, period=None):
+        """
+        Call 'callback(cpu_cycles)' in 'cycles' CPU cycles and then every 'period' cycles (if given).
+        Returns the CycleEvent, that can be canceled or rescheduled via self.scheduler
+        """
+        return self.scheduler.add_event(self.cycles + cycles, callback, period)
 
     def add_sync_callback(self, callback_cycles, callback):
-        """ Add a CPU cycle triggered callback """
-        self.sync_callbacks_cyles[callback] = 0
-        self.sync_callbacks.append([callback_cycles, callback])
-        if self.quickest_sync_callback_cycles is None or \
-                self.quickest_sync_callback_cycles > callback_cycles:
-            self.quickest_sync_callback_cycles = callback_cycles
-
-    def call_sync_callbacks(self):
-        """ Call every sync callback with CPU cycles trigger """
-        current_cycles = self.cycles
-        for callback_cycles, callback in self.sync_callbacks:
-            # get the CPU cycles count of the last call
-            last_call_cycles = self.sync_callbacks_cyles[callback]
+        """ Add a CPU cycle triggered callback, called with the cycles since the last call """
+        last_call_cycles = self.cycles
 
-            if current_cycles - last_call_cycles > callback_cycles:
-                # this callback should be called
+        def sync_callback(cycles):
+            nonlocal last_call_cycles
+            callback(cycles - last_call_cycles)
+            last_call_cycles = cycles
 
-                # Save the current cycles, to trigger the next call
-                self.sync_callbacks_cyles[callback] = self.cycles
+        return self.add_cycle_event(callback_cycles, sync_callback, period=callback_cycles)
 
-                # Call the callback function
-                callback(current_cycles - last_call_cycles)
+    def call_sync_callbacks(self):
+        """ Call all due cycle events """
+        if self.cycles >= self.scheduler.next_deadline:
+            self.scheduler.run_due(self.cycles)
 
     # TODO: Move to __init__
-    inner_burst_op_count = 100  # How many ops calls, before next sync call
+    inner_burst_op_count = 100  # How many ops calls, if no cycle event is due
 
     def burst_run(self):
         """ Run CPU as fast as Python can... """
         # https://wiki.python.org/moin/PythonSpeed/PerformanceTips#Avoiding_dots...
         get_and_call_next_op = self.get_and_call_next_op
+        scheduler = self.scheduler
+        inner_burst_op_count = self.inner_burst_op_count
+        max_burst_cycles = inner_burst_op_count * self.max_op_cycles
 
-        for __ in range(self.outer_burst_op_count):
-            for __ in range(self.inner_burst_op_count):
-                get_and_call_next_op()
-
-            self.call_sync_callbacks()
+        self.reset_debug_hit()
+        try:
+            for __ in range(self.outer_burst_op_count):
+                if scheduler.next_deadline - self.cycles > max_burst_cycles:
+                    # No event can be due in this burst: No checks needed
+                    for __ in range(inner_burst_op_count):
+                        get_and_call_next_op()
+                else:
+                    # Run exactly up to the next deadline, but max. one inner burst:
+                    # An op may cancel the event, e.g.: a write callback stops a timer.
+                    deadline = scheduler.next_deadline
+                    for __ in range(inner_burst_op_count):
+                        if self.cycles >= deadline:
+                            break
+                        get_and_call_next_op()
+                    if self.cycles >= scheduler.next_deadline:
+                        scheduler.run_due(self.cycles)
+        except DebugStop:
+            pass  # breakpoint/watchpoint hit: see self.debug_hit
 
     def run(self, max_run_time=0.1, target_cycles_per_sec=None):
         now = time.time
@@ -309,6 +451,72 @@ class CPUBase:
             target=max_run_time
         )
 
+    def run_cycles(self, cycles):
+        """
+        Run until the first instruction boundary at or past 'cycles' CPU cycles from now.
+        Returns the number of really executed cycles.
+        """
+        start_cycles = self.cycles
+        self.run_until(cycles=start_cycles + cycles)
+        return self.cycles - start_cycles
+
+    def run_until(self, pc=None, cycles=None, memory_equals=None):
+        """
+        Run until one of the given conditions is true before the next instruction:
+            pc - the program counter has this value
+            cycles - the CPU cycles count reached this value
+            memory_equals - (address, value) tuple: the byte at address has this value
+        Returns the name of the condition that stops the run: "pc", "cycles" or "memory"
+        or "breakpoint"/"watchpoint" on a hit (see self.debug_hit)
+        """
+        if pc is None and cycles is None and memory_equals is None:
+            raise ValueError("run_until() needs at least one stop condition")
+
+        self.reset_debug_hit()
+        if cycles is not None:
+            # Use the end as deadline, so that fast-forwards and wait states don't pass it:
+            end_event = self.scheduler.add_event(cycles, lambda cycles: None)
+        try:
+            self.call_run_loop(
+                end_pc=pc,
+                end_cycles=NO_DEADLINE if cycles is None else cycles,
+                memory_equals=memory_equals,
+            )
+        except DebugStop as err:
+            return err.hit.kind
+        finally:
+            if cycles is not None:
+                self.scheduler.cancel(end_event)
+
+        if pc is not None and self.program_counter.value == pc:
+            return "pc"
+        if memory_equals is not None and self.memory.peek(memory_equals[0]) == memory_equals[1]:
+            return "memory"
+        return "cycles"
+
+    def call_run_loop(self, end_pc, end_cycles, memory_equals):
+        """
+        Run the ops until one of the run_until() conditions is true.
+        'end_pc' and 'memory_equals' may be None, 'end_cycles' is NO_DEADLINE if not given.
+        """
+        if memory_equals is None:
+            address = value = None
+        else:
+            address, value = memory_equals
+
+        run_loop = get_run_loop(check_pc=end_pc is not None, check_memory=memory_equals is not None)
+        run_loop(
+            cpu=self,
+            get_and_call_next_op=self.get_and_call_next_op,
+            scheduler=self.scheduler,
+            program_counter=self.program_counter,
+            mem=self.memory._mem,
+            end_pc=end_pc,
+            end_cycles=end_cycles,
+            address=address,
+            value=value,
+        )
+
     def test_run(self, start, end, max_ops=1000000):
         #        log.warning("CPU test_run(): from $%x to $%x" % (start, end))
         self.program_counter.set(start)
@@ -330,28 +538,15 @@ class CPUBase:
         self.program_counter.set(start)
 #        log.debug("-"*79)
 
-        _old_burst_count = self.outer_burst_op_count
-        self.outer_burst_op_count = count
-
-        _old_sync_count = self.inner_burst_op_count
-        self.inner_burst_op_count = 1
-
-        self.burst_run()
-
-        self.outer_burst_op_count = _old_burst_count
-        self.inner_burst_op_count = _old_sync_count
+        for __ in range(count):
+            self.get_and_call_next_op()
+            self.call_sync_callbacks()
 
     ####
 
     @property
     def get_info(self):
-        return "cc={:02x} a={:02x} b={:02x} dp={:02x} x={:04x} y={:04x} u={:04x} s={:04x}".format(
-            self.get_cc_value(),
-            self.accu_a.value, self.accu_b.value,
-            self.direct_page.value,
-            self.index_x.value, self.index_y.value,
-            self.user_stack_pointer.value, self.system_stack_pointer.value
-        )
+        return f"cc={self.get_cc_value():02x} a={self.accu_a.value:02x} b={self.accu_b.value:02x} dp={self.direct_page.value:02x} x={self.index_x.value:04x} y={self.index_y.value:04x} u={self.user_stack_pointer.value:04x} s={self.system_stack_pointer.value:04x}"
 
     ####
 
@@ -0,0 +1,501 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Basic block translation cache
+
+    A basic block is a sequence of instructions that starts at the current
+    program counter and ends with the next instruction that may change the
+    program counter (Branches, JMP, JSR, RTS, RTI, PULS PC etc.)
+
+    The block will be decoded only one time and translated into one Python
+    function: All operands of immediate, direct and extended instructions
+    are resolved at translation time and the CPU instruction methods are
+    called directly. Indexed addressing and the program flow instructions
+    are called via the normal opcode functions.
+
+    The cycle count is the same as by the normal op-by-op execution: The
+    skipped opcode/operand memory reads are added as fixed cycles.
+
+    Translated blocks are cached by start address. They will be removed from
+    the cache if the memory of the block is changed via write_byte(),
+    write_word() or load(). A write into the block that is currently
+    executed stops it after the writing instruction, so the following
+    instructions are dispatched with the changed code.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import logging
+
+from MC6809.components.cpu_utils.Instruction_generator import REGISTER_DICT
+from MC6809.components.mc6809_breakpoints import DebugStop
+from MC6809.components.MC6809data.MC6809_data_utils import MC6809OP_DATA_DICT, get_op_length
+from MC6809.components.MC6809data.MC6809_op_data import (
+    BYTE,
+    DIRECT,
+    DIRECT_WORD,
+    EXTENDED,
+    EXTENDED_WORD,
+    IMMEDIATE,
+    IMMEDIATE_WORD,
+    INHERENT,
+    WORD,
+)
+
+
+log = logging.getLogger("MC6809")
+
+
+# Instructions that always ends a basic block:
+BLOCK_END_MNEMONICS = frozenset({
+    "JMP", "JSR", "RTS", "RTI", "SWI", "SWI2", "SWI3", "CWAI", "SYNC", "RESET",
+})
+
+# Address modes that can be resolved at translation time:
+DECODE_ADDR_MODES = frozenset({
+    DIRECT, DIRECT_WORD, EXTENDED, EXTENDED_WORD, IMMEDIATE, IMMEDIATE_WORD, INHERENT,
+})
+
+
+def is_block_end(op_data, post_byte):
+    """
+    Returns True if the instruction may change the program counter.
+
+    >>> is_block_end(MC6809OP_DATA_DICT[0x26], post_byte=0xfa)  # BNE
+    True
+    >>> is_block_end(MC6809OP_DATA_DICT[0x35], post_byte=0x10)  # PULS X
+    False
+    >>> is_block_end(MC6809OP_DATA_DICT[0x35], post_byte=0x90)  # PULS X,PC
+    True
+    >>> is_block_end(MC6809OP_DATA_DICT[0x1f], post_byte=0x15)  # TFR X,PC
+    True
+    >>> is_block_end(MC6809OP_DATA_DICT[0x1e], post_byte=0x01)  # EXG D,X
+    False
+    """
+    addr_mode = op_data["addr_mode"]
+    if addr_mode is None or addr_mode.startswith("RELATIVE"):
+        return True
+
+    mnemonic = op_data["mnemonic"]
+    if mnemonic in BLOCK_END_MNEMONICS:
+        return True
+    if mnemonic in ("PULS", "PULU"):
+        return bool(post_byte & 0x80)  # PC will be pulled
+    if mnemonic == "TFR":
+        return post_byte & 0x0f == 0x5  # destination is PC
+    if mnemonic == "EXG":
+        return post_byte & 0x0f == 0x5 or post_byte >> 4 == 0x5
+    return False
+
+
+class BlockTranslator:
+    """
+    Build the Python source code of one basic block
+    """
+    MAX_OPS = 32  # Max. instructions in one block
+
+    def __init__(self, cpu, start):
+        self.cpu = cpu
+        self.start = start
+        self.end = start  # address after the last instruction
+
+        self.lines = []
+        self.names = {}  # objects used in the generated code
+        self.pending_cycles = 0
+        self.ops_count = 0
+
+    def add_name(self, name, obj):
+        self.names[name] = obj
+        return name
+
+    def add_cycles(self, cycles):
+        self.pending_cycles += cycles
+
+    def flush_cycles(self):
+        if self.pending_cycles:
+            self.lines.append(f"cpu.cycles += {self.pending_cycles:d}")
+            self.pending_cycles = 0
+
+    def translate(self):
+        mem = self.cpu.memory._mem
+        opcode_dict = self.cpu.opcode_dict
+
+        address = self.start
+        while self.ops_count < self.MAX_OPS:
+            if address + 5 > 0xffff:
+                # A op is max. 5 bytes long: Don't translate ops at the end of the address range
+                break
+
+            if address in self.cpu.breakpoints and address != self.start:
+                break  # The breakpoint address must be dispatched as single op
+
+            opcode = mem[address]
+            opcode_bytes = 1
+            page_cycles = 0
+            if opcode in (0x10, 0x11):
+                page_cycles = opcode_dict[opcode][0]
+                opcode = opcode << 8 | mem[address + 1]
+                opcode_bytes = 2
+
+            if opcode not in opcode_dict:
+                break  # illegal op: leave it to the normal dispatcher
+
+            op_data = MC6809OP_DATA_DICT[opcode]
+            post_byte = mem[address + opcode_bytes]
+            cycles = page_cycles + opcode_dict[opcode][0]
+            block_end = is_block_end(op_data, post_byte=post_byte)
+
+            self.lines.append(f"cpu.last_op_address = 0x{address:04x}")
+            if block_end or op_data["addr_mode"] not in DECODE_ADDR_MODES:
+                self.add_generic_call(address, opcode, opcode_bytes, cycles)
+                may_write = not block_end
+            else:
+                self.add_decoded_call(address, opcode, op_data, opcode_bytes, cycles)
+                may_write = op_data["write_to_memory"] is not None
+
+            self.ops_count += 1
+            address += get_op_length(op_data, post_byte)
+            self.end = address
+            if block_end:
+                break
+            if may_write:
+                self.add_modified_check()
+
+        self.flush_cycles()
+
+    def add_modified_check(self):
+        """
+        Leave the block after a instruction, that changed the code of this block:
+        The following instructions will be dispatched (and translated) again.
+        """
+        self.flush_cycles()
+        self.lines.append(f"if cpu.modified_block == 0x{self.start:04x}:")
+        self.lines.append("    cpu.modified_block = None")
+        self.lines.append("    return")
+
+    def add_generic_call(self, address, opcode, opcode_bytes, cycles):
+        """
+        Call the normal opcode function: It will read the operands via the program counter.
+        """
+        func_name = self.add_name(f"op_{address:04x}", self.cpu.opcode_dict[opcode][1])
+        self.lines.append(f"program_counter.value = 0x{address + opcode_bytes:04x}")
+        self.add_cycles(opcode_bytes)  # opcode fetch
+        self.flush_cycles()
+        self.lines.append(f"{func_name}(0x{opcode:x})")
+        self.add_cycles(cycles)
+
+    def add_decoded_call(self, address, opcode, op_data, opcode_bytes, cycles):
+        """
+        Call the CPU instruction method with operands decoded at translation time.
+        """
+        mem = self.cpu.memory._mem
+        addr_mode = op_data["addr_mode"]
+        read = op_data["read_from_memory"]
+        write = op_data["write_to_memory"]
+        register = op_data["register"]
+        operand_address = address + opcode_bytes
+
+        func_name = self.add_name(f"instr_{address:04x}", self.cpu.op_collection.instr_func_dict[opcode])
+        self.lines.append(f"program_counter.value = 0x{address + op_data['bytes']:04x}")
+        self.add_cycles(op_data["bytes"])  # opcode and operand fetch
+        self.flush_cycles()
+
+        args = [f"0x{opcode:x}"]
+        if addr_mode in (DIRECT, DIRECT_WORD):
+            ea = f"direct_page.value << 8 | 0x{mem[operand_address]:02x}"
+        elif addr_mode in (EXTENDED, EXTENDED_WORD):
+            ea = f"0x{mem[operand_address] << 8 | mem[operand_address + 1]:04x}"
+        else:
+            ea = None
+
+        if addr_mode == IMMEDIATE:
+            args.append(f"0x{mem[operand_address]:02x}")
+        elif addr_mode == IMMEDIATE_WORD:
+            args.append(f"0x{mem[operand_address] << 8 | mem[operand_address + 1]:04x}")
+        elif op_data["needs_ea"]:
+            self.lines.append(f"ea = {ea}")
+            args.append("ea")
+            if read:
+                args.append("read_byte(ea)")
+        elif read == BYTE:
+            args.append(f"read_byte({ea})")
+        elif read == WORD:
+            args.append(f"read_word({ea})")
+
+        if register is not None:
+            args.append(self.add_name(REGISTER_DICT[register], getattr(self.cpu, REGISTER_DICT[register])))
+
+        call = f"{func_name}({', '.join(args)})"
+        if write == BYTE:
+            self.lines.append(f"ea, value = {call}")
+            self.lines.append("write_byte(ea, value)")
+        elif write == WORD:
+            self.lines.append(f"ea, value = {call}")
+            self.lines.append("write_word(ea, value)")
+        else:
+            self.lines.append(call)
+
+        self.add_cycles(cycles)
+
+    def get_source(self):
+        names = ", ".join(sorted(self.names))
+        body = "\n".join(f"        {line}" for line in self.lines)
+        return (
+            f"def make_block({names}):\n"
+            f"    def block_{self.start:04x}():\n"
+            f"{body}\n"
+            f"    return block_{self.start:04x}\n"
+        )
+
+    def get_block_func(self):
+        if not self.ops_count:
+            return None
+
+        cpu = self.cpu
+        self.names.update({
+            "cpu": cpu,
+            "program_counter": cpu.program_counter,
+            "direct_page": cpu.direct_page,
+            "read_byte": cpu.memory.read_byte,
+            "read_word": cpu.memory.read_word,
+            "write_byte": cpu.memory.write_byte,
+            "write_word": cpu.memory.write_word,
+        })
+        source = self.get_source()
+        namespace = {}
+        exec(compile(source, f"<block ${self.start:04x}>", "exec"), namespace)
+        return namespace["make_block"](**self.names)
+
+
+class BlockCacheMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_block_cache()
+
+    def init_clone(self, origin):
+        super().init_clone(origin)
+        self._init_block_cache()  # The clone starts with a empty block cache, see: clone_memory()
+
+    def _init_block_cache(self):
+        self.block_cache = {}  # start address -> block function (or None if not translatable)
+        self._block_ranges = {}  # start address -> (start, end) address of the block code
+        self._block_max_cycles = {}  # start address -> max. cycles of the block: ops * max_op_cycles
+        self._code_map = {}  # address -> set of start addresses of blocks, that contains this address
+        self._chained_write_middleware = {}  # existing write middleware on code addresses
+        self.modified_block = None  # start address of the last removed block, see: add_modified_check()
+
+        self.memory.add_load_callback(self.invalidate_blocks)
+
+    def translate_block(self, start):
+        if self.cfg.trace or self.watchpoints or start in self.breakpoints:
+            # Don't bypass the trace output or the breakpoint/watchpoint traps of the opcode functions
+            block_func = None
+            end = start
+            ops_count = 1
+        else:
+            translator = BlockTranslator(self, start)
+            translator.translate()
+            block_func = translator.get_block_func()
+            end = max(start, translator.end - 1)
+            ops_count = max(translator.ops_count, 1)  # Not translatable: One op is called
+
+        self.block_cache[start] = block_func
+        self._block_ranges[start] = (start, end)
+        self._block_max_cycles[start] = ops_count * self.max_op_cycles
+        for address in range(start, end + 1):
+            try:
+                self._code_map[address].add(start)
+            except KeyError:
+                self._code_map[address] = {start}
+                self._watch_code_address(address)
+        return block_func
+
+    def breakpoints_changed(self, start, end):
+        super().breakpoints_changed(start, end)
+        self.invalidate_blocks(start, end)
+
+    def watchpoints_changed(self):
+        super().watchpoints_changed()
+        # Watchpoints disables the translation (and enables it after the last one is removed)
+        self.invalidate_blocks(0x0000, 0xffff)
+
+    def _watch_code_address(self, address):
+        write_byte_middleware = self.memory._write_byte_middleware
+        if address in write_byte_middleware:
+            self._chained_write_middleware[address] = write_byte_middleware[address]
+        self.memory.add_write_byte_middleware(self._code_write_middleware, address)
+
+    def _unwatch_code_address(self, address):
+        try:
+            chained_middleware = self._chained_write_middleware.pop(address)
+        except KeyError:
+            self.memory.remove_write_byte_middleware(address)
+        else:
+            self.memory.add_write_byte_middleware(chained_middleware, address)
+
+    def clone_memory(self):
+        memory = super().clone_memory()
+        # The clone starts with a empty block cache: Remove the watches of the translated code
+        for address in self._code_map:
+            try:
+                chained_middleware = self._chained_write_middleware[address]
+            except KeyError:
+                memory.remove_write_byte_middleware(address)
+            else:
+                memory.add_write_byte_middleware(chained_middleware, address)
+        return memory
+
+    def release_memory_handlers(self):
+        super().release_memory_handlers()
+        self.invalidate_blocks(0x0000, 0xffff)  # removes all code watches
+
+    def _code_write_middleware(self, cycles, last_op_address, address, value):
+        if address in self._chained_write_middleware:
+            value = self._chained_write_middleware[address](cycles, last_op_address, address, value)
+        self.invalidate_blocks(address, address)
+        return value
+
+    def invalidate_blocks(self, start, end):
+        """
+        Remove all translated blocks that contains code between start and end address (inclusive)
+        """
+        if end - start > len(self._code_map):
+            addresses = [address for address in self._code_map if start <= address <= end]
+        else:
+            addresses = [address for address in range(start, end + 1) if address in self._code_map]
+
+        for address in addresses:
+            if address not in self._code_map:
+                continue  # removed by a previous block in this loop
+            for block_start in tuple(self._code_map[address]):
+                self._remove_block(block_start)
+
+    def _remove_block(self, block_start):
+        self.modified_block = block_start  # A running block will stop after the current instruction
+        del self.block_cache[block_start]
+        del self._block_max_cycles[block_start]
+        start, end = self._block_ranges.pop(block_start)
+        for address in range(start, end + 1):
+            block_starts = self._code_map[address]
+            block_starts.discard(block_start)
+            if not block_starts:
+                del self._code_map[address]
+                self._unwatch_code_address(address)
+
+    def get_and_call_next_block(self):
+        if self.interrupt_pending:
+            self.service_interrupts()  # Runs like a instruction
+            return
+        try:
+            block_func = self.block_cache[self.program_counter.value]
+        except KeyError:
+            block_func = self.translate_block(self.program_counter.value)
+
+        if block_func is None:
+            self.get_and_call_next_op()
+        else:
+            block_func()
+
+    def burst_run(self):
+        """ Run CPU as fast as Python can via translated blocks """
+        # https://wiki.python.org/moin/PythonSpeed/PerformanceTips#Avoiding_dots...
+        get_and_call_next_block = self.get_and_call_next_block
+        get_and_call_next_op = self.get_and_call_next_op
+        scheduler = self.scheduler
+        max_block_cycles = BlockTranslator.MAX_OPS * self.max_op_cycles
+
+        self.reset_debug_hit()
+        try:
+            for __ in range(self.outer_burst_op_count):
+                for __ in range(self.inner_burst_op_count):
+                    if scheduler.next_deadline - self.cycles > max_block_cycles:
+                        get_and_call_next_block()
+                    else:
+                        # Run single ops near a deadline, so events are called on time
+                        get_and_call_next_op()
+                        if self.cycles >= scheduler.next_deadline:
+                            scheduler.run_due(self.cycles)
+        except DebugStop:
+            pass  # breakpoint/watchpoint hit: see self.debug_hit
+
+    def call_run_loop(self, end_pc, end_cycles, memory_equals):
+        """
+        Run translated blocks in run_until() and run_cycles(): The stop conditions
+        are checked at the block exits. Single ops are used, if the max. cycles
+        of the block may pass the next deadline (run_until() adds the end cycles
+        as deadline) or if the block contains 'end_pc' after its first op.
+        """
+        if memory_equals is not None:
+            # Every op may write the memory value: Check it after every op
+            return super().call_run_loop(end_pc, end_cycles, memory_equals)
+
+        # https://wiki.python.org/moin/PythonSpeed/PerformanceTips#Avoiding_dots...
+        get_and_call_next_op = self.get_and_call_next_op
+        get_and_call_next_block = self.get_and_call_next_block
+        translate_block = self.translate_block
+        scheduler = self.scheduler
+        program_counter = self.program_counter
+        block_ranges = self._block_ranges
+        block_max_cycles = self._block_max_cycles
+        end_address = -1 if end_pc is None else end_pc  # for the compare with the block ranges
+
+        while True:
+            limit = scheduler.next_deadline
+            if limit > end_cycles:
+                limit = end_cycles
+
+            while self.cycles < limit and program_counter.value != end_pc:
+                pc = program_counter.value
+                try:
+                    block_start, block_end = block_ranges[pc]
+                except KeyError:
+                    translate_block(pc)
+                    block_start, block_end = block_ranges[pc]
+                if limit - self.cycles > block_max_cycles[pc] and not block_start < end_address <= block_end:
+                    get_and_call_next_block()
+                else:
+                    get_and_call_next_op()
+
+            if self.cycles >= scheduler.next_deadline:
+                scheduler.run_due(self.cycles)
+            elif self.cycles >= end_cycles or program_counter.value == end_pc:
+                return
+
+    def test_run(self, start, end, max_ops=1000000):
+        self.program_counter.set(start)
+
+        # https://wiki.python.org/moin/PythonSpeed/PerformanceTips#Avoiding_dots...
+        get_and_call_next_op = self.get_and_call_next_op
+        get_and_call_next_block = self.get_and_call_next_block
+        program_counter = self.program_counter
+        block_ranges = self._block_ranges
+
+        for __ in range(max_ops):
+            pc = program_counter.value
+            if pc == end:
+                return
+
+            if pc not in block_ranges:
+                self.translate_block(pc)
+
+            block_start, block_end = block_ranges[pc]
+            if block_start < end <= block_end:
+                # The end address is inside of this block
+                get_and_call_next_op()
+            else:
+                get_and_call_next_block()
+
+        log.critical("Max ops %i arrived!", max_ops)
+        raise RuntimeError(f"Max ops {max_ops:d} arrived!")
+
+    def test_run2(self, start, count):
+        """ Run exactly 'count' ops, like CPUBase.test_run2() """
+        self.program_counter.set(start)
+        for __ in range(count):
+            self.get_and_call_next_op()
+            self.call_sync_callbacks()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Boot snapshot cache.
+
+    Booting a machine (reset, RAM test, BASIC init etc.) needs millions
+    of CPU cycles, but the result is always the same for the same ROMs.
+    The cache stores a save state after the boot (see: mc6809_save_state.py)
+    and a later boot just loads it.
+
+    The cache key is the hash of the loaded ROM files, the config values
+    of the memory layout, the save state version and the boot target.
+    So changed ROMs or a changed config never use a stale entry.
+    Old entries are deleted, if the cache needs more than 'max_size' Bytes.
+
+    usage e.g.:
+        cache = BootSnapshotCache(cache_path)
+        cpu = cache.boot(CPU, cfg, pc=0xDB46)  # run from reset to the BASIC prompt
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+from MC6809.components.mc6809_save_state import VERSION
+from MC6809.components.memory import Memory
+
+
+log = logging.getLogger("MC6809")
+
+
+# Config values that change the boot result:
+CONFIG_KEY_NAMES = ("RAM_START", "RAM_END", "ROM_START", "ROM_END")
+
+SNAPSHOT_SUFFIX = ".mc6809state"
+
+
+class BootSnapshotCache:
+    def __init__(self, path, max_size=64 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_size = max_size  # Max. size of all snapshot files in Bytes
+
+    def get_key(self, cfg, memory, cycles=None, pc=None):
+        """
+        Returns the cache key (a hex string) of the boot of this config and ROMs
+        """
+        config_values = [f"{cfg.__class__.__module__}.{cfg.__class__.__qualname__}", f"version={VERSION}"]
+        config_values.extend(f"{name}={getattr(cfg, name)!r}" for name in CONFIG_KEY_NAMES)
+        config_values.extend((f"cycles={cycles!r}", f"pc={pc!r}"))
+
+        key = hashlib.sha256(memory.rom_hash)
+        key.update("\n".join(config_values).encode("utf-8"))
+        return key.hexdigest()
+
+    def get_filepath(self, key):
+        return self.path / f"{key}{SNAPSHOT_SUFFIX}"
+
+    def boot(self, cpu_class, cfg, cycles=None, pc=None, max_cycles=100000000):
+        """
+        Returns a new CPU after a reset and a run of 'cycles' CPU cycles or
+        until 'pc' is reached. The CPU is restored from the cache, if possible.
+        """
+        if cycles is None and pc is None:
+            raise ValueError("No boot target: 'cycles' and/or 'pc' is needed")
+
+        cpu = cpu_class(Memory(cfg), cfg)
+        filepath = self.get_filepath(self.get_key(cfg, cpu.memory, cycles=cycles, pc=pc))
+        if self.restore(cpu, filepath):
+            return cpu
+
+        cpu.reset()
+        if pc is None:
+            cpu.run_cycles(cycles)
+        else:
+            if cycles is None:
+                cycles = max_cycles
+            if cpu.run_until(pc=pc, cycles=cpu.cycles + cycles) != "pc":
+                raise RuntimeError(f"Boot target ${pc:04x} not reached after {cpu.cycles:d} cycles")
+
+        self.store(cpu, filepath)
+        return cpu
+
+    def restore(self, cpu, filepath):
+        try:
+            with filepath.open("rb") as f:
+                cpu.restore_state(f)
+        except FileNotFoundError:
+            return False
+        except ValueError as err:
+            log.warning("Delete invalid boot snapshot %s: %s", filepath, err)
+            filepath.unlink(missing_ok=True)
+            return False
+
+        os.utime(filepath)  # Mark as recently used for the eviction
+        log.info("Boot snapshot %s loaded", filepath)
+        return True
+
+    def store(self, cpu, filepath):
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        # Write a temp file first, so a parallel process never loads a half written file:
+        temp_filepath = filepath.with_name(f"{filepath.name}.{os.getpid()}.tmp")
+        with temp_filepath.open("wb") as f:
+            cpu.save_state(f)
+        os.replace(temp_filepath, filepath)
+        log.info("Boot snapshot %s stored", filepath)
+
+        self.evict()
+
+    def evict(self):
+        """
+        Delete the least recently used snapshots, until all together fit into 'max_size'
+        """
+        snapshots = []
+        for filepath in self.path.glob(f"*{SNAPSHOT_SUFFIX}"):
+            try:
+                stat = filepath.stat()
+            except FileNotFoundError:
+                continue  # deleted by a parallel process
+            snapshots.append((stat.st_mtime, stat.st_size, filepath))
+
+        total_size = sum(size for __, size, __ in snapshots)
+        for __, size, filepath in sorted(snapshots, key=lambda snapshot: snapshot[0]):
+            if total_size <= self.max_size:
+                break
+            log.info("Evict boot snapshot %s", filepath)
+            filepath.unlink(missing_ok=True)
+            total_size -= size
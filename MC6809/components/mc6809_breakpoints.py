@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Breakpoints and watchpoints without costs, if none are set.
+
+    Both use the debug traps of the memory: The pages of the marked
+    addresses use the slow memory path, all other pages stay fast.
+    A breakpoint hits, if the opcode of a marked address is fetched.
+    A watchpoint hits on read/write of a marked address.
+
+    A hit patches the opcode dispatch, so that the next dispatched
+    instruction raises DebugStop before it's executed. The run loops
+    catch it, so they stop at an instruction boundary.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import dataclasses
+import logging
+
+
+log = logging.getLogger("MC6809")
+
+
+BREAKPOINT = "breakpoint"
+WATCHPOINT = "watchpoint"
+
+
+class DebugStop(Exception):
+    """
+    Stop the run loops at an instruction boundary
+    """
+
+    def __init__(self, hit):
+        super().__init__(hit)
+        self.hit = hit
+
+
+def compile_condition(condition):
+    """
+    Compile a condition expression. Usable names are the registers
+    (a, b, d, x, y, u, s, pc, dp, cc), 'cycles' and 'mem' (a read-only
+    memoryview of the memory). Watchpoints have also 'address' and 'value'.
+
+    >>> code = compile_condition("a == 0x12 and mem[0x400] > 3")
+    >>> eval(code, {"__builtins__": {}}, {"a": 0x12, "mem": {0x400: 4}})
+    True
+    """
+    if condition is None:
+        return None
+    return compile(condition, f"<condition {condition!r}>", "eval")
+
+
+@dataclasses.dataclass(eq=False)
+class Breakpoint:
+    address: int
+    condition: str | None = None
+    hits: int = 0
+
+    def __post_init__(self):
+        self.code = compile_condition(self.condition)
+
+
+@dataclasses.dataclass(eq=False)
+class Watchpoint:
+    start: int
+    end: int
+    read: bool = False
+    write: bool = True
+    condition: str | None = None
+    hits: int = 0
+
+    def __post_init__(self):
+        self.code = compile_condition(self.condition)
+
+
+@dataclasses.dataclass
+class DebugHit:
+    kind: str  # BREAKPOINT or WATCHPOINT
+    point: Breakpoint | Watchpoint
+    address: int
+    value: int  # The opcode (breakpoint) or the read/written byte (watchpoint)
+    op_address: int  # Address of the instruction that hits
+    cycles: int
+
+
+class BreakpointMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_breakpoints()
+
+    def init_clone(self, origin):
+        super().init_clone(origin)
+        self._init_breakpoints()  # The breakpoints and watchpoints are not copied
+
+    def _init_breakpoints(self):
+        self.breakpoints = {}  # address -> Breakpoint
+        self.watchpoints = []
+        self.debug_hit = None  # The DebugHit of the last stop
+        self._resume_skip = None  # (address, cycles) of the opcode fetch to resume from
+        self._dispatch_trap_backup = None
+
+    # ---- breakpoints ----
+
+    def add_breakpoint(self, address, condition=None):
+        """ Stop before the instruction at 'address' is executed, if 'condition' is true (or None) """
+        breakpoint = Breakpoint(address, condition)
+        self.breakpoints[address] = breakpoint
+        self._update_traps(address, address)
+        self.breakpoints_changed(address, address)
+        return breakpoint
+
+    def remove_breakpoint(self, address):
+        del self.breakpoints[address]
+        self._update_traps(address, address)
+        self.breakpoints_changed(address, address)
+
+    # ---- watchpoints ----
+
+    def add_watchpoint(self, start, end=None, read=False, write=True, condition=None):
+        """ Stop after the instruction that read/write between start and end (inclusive) """
+        if end is None:
+            end = start
+        watchpoint = Watchpoint(start, end, read, write, condition)
+        self.watchpoints.append(watchpoint)
+        self._update_traps(start, end)
+        self.watchpoints_changed()
+        return watchpoint
+
+    def remove_watchpoint(self, watchpoint):
+        self.watchpoints.remove(watchpoint)
+        self._update_traps(watchpoint.start, watchpoint.end)
+        self.watchpoints_changed()
+
+    def clear_breakpoints(self):
+        for address in tuple(self.breakpoints):
+            self.remove_breakpoint(address)
+        for watchpoint in tuple(self.watchpoints):
+            self.remove_watchpoint(watchpoint)
+
+    def breakpoints_changed(self, start, end):
+        """ Called after breakpoints between start and end are added or removed """
+
+    def watchpoints_changed(self):
+        """ Called after a watchpoint is added or removed """
+
+    # ---- memory traps ----
+
+    def _update_traps(self, start, end):
+        memory = self.memory
+        for address in range(start, end + 1):
+            read_watched = any(w.read and w.start <= address <= w.end for w in self.watchpoints)
+            if address in self.breakpoints or read_watched:
+                memory.add_read_trap(self._read_trap, address)
+            else:
+                memory.remove_read_trap(address)
+
+            if any(w.write and w.start <= address <= w.end for w in self.watchpoints):
+                memory.add_write_trap(self._write_trap, address)
+            else:
+                memory.remove_write_trap(address)
+
+    def _read_trap(self, cycles, last_op_address, address, value):
+        if self._resume_skip == (address, cycles):
+            self._resume_skip = None  # resume after the stop at this opcode fetch
+            return
+
+        if address in self.breakpoints and address == self.program_counter.value:
+            # The opcode fetch of a breakpoint address
+            breakpoint = self.breakpoints[address]
+            if self._check_condition(breakpoint.code):
+                breakpoint.hits += 1
+                self._resume_skip = (address, cycles)
+                self.request_stop(DebugHit(BREAKPOINT, breakpoint, address, value, address, cycles - 1))
+            return
+
+        if self._check_watchpoints(address, value, cycles, last_op_address, read=True):
+            if address == self.program_counter.value:
+                # Maybe the opcode fetch: The stop is before this instruction, like a breakpoint
+                self._resume_skip = (address, cycles)
+
+    def _write_trap(self, cycles, last_op_address, address, value):
+        self._check_watchpoints(address, value, cycles, last_op_address, read=False)
+
+    def _check_watchpoints(self, address, value, cycles, last_op_address, read):
+        for watchpoint in self.watchpoints:
+            if (
+                (watchpoint.read if read else watchpoint.write)
+                and watchpoint.start <= address <= watchpoint.end
+                and self._check_condition(watchpoint.code, address=address, value=value)
+            ):
+                watchpoint.hits += 1
+                self.request_stop(DebugHit(WATCHPOINT, watchpoint, address, value, last_op_address, cycles))
+                return True
+        return False
+
+    def _check_condition(self, code, **extra):
+        if code is None:
+            return True
+        namespace = {
+            "a": self.accu_a.value,
+            "b": self.accu_b.value,
+            "d": self.accu_d.value,
+            "x": self.index_x.value,
+            "y": self.index_y.value,
+            "u": self.user_stack_pointer.value,
+            "s": self.system_stack_pointer.value,
+            "pc": self.program_counter.value,
+            "dp": self.direct_page.value,
+            "cc": self.get_cc_value(),
+            "cycles": self.cycles,
+            "mem": self.memory.buffer,
+            **extra,
+        }
+        return eval(code, {"__builtins__": {}}, namespace)
+
+    # ---- stop via the opcode dispatch ----
+
+    def reset_debug_hit(self):
+        """
+        Called at the start of the run loops: Forget the hit of the last stop,
+        if no stop is pending.
+        """
+        if self._dispatch_trap_backup is None:
+            self.debug_hit = None
+
+    def request_stop(self, hit):
+        """
+        Stop the run loops before the next instruction is executed.
+        """
+        if self._dispatch_trap_backup is None:
+            log.info("Stop CPU: %s", hit)
+            self.debug_hit = hit
+            self._dispatch_trap_backup = self.set_dispatch_trap(self._dispatch_trap)
+
+    def set_dispatch_trap(self, trap_func):
+        """
+        Let 'trap_func' handle all opcodes. Returns the data for restore_dispatch().
+        """
+        opcode_dict = self.opcode_dict
+        backup = dict(opcode_dict)
+        for opcode in backup:
+            opcode_dict[opcode] = (0, trap_func)
+        return backup
+
+    def restore_dispatch(self, backup):
+        self.opcode_dict.update(backup)
+
+    def replace_opcode_funcs(self, funcs):
+        """
+        Replace the functions of the opcodes in the dict 'funcs' {opcode: func},
+        e.g.: to switch the trace on/off. A pending dispatch trap stays active.
+        """
+        opcode_dict = self.opcode_dict if self._dispatch_trap_backup is None else self._dispatch_trap_backup
+        for opcode, func in funcs.items():
+            cycles, __ = opcode_dict[opcode]
+            opcode_dict[opcode] = (cycles, func)
+
+    def _dispatch_trap(self, opcode):
+        self.restore_dispatch(self._dispatch_trap_backup)
+        self._dispatch_trap_backup = None
+
+        # Undo the opcode fetch:
+        self.program_counter.set(self.last_op_address)
+        self.cycles -= 1
+
+        raise DebugStop(self.debug_hit)
@@ -0,0 +1,687 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Lazy evaluation of the H, N, Z and V condition code flags.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import functools
+import logging
+
+from MC6809.components.cpu_utils.instruction_caller import opcode
+from MC6809.components.mc6809_base import CPUBase
+from MC6809.components.mc6809_cc_register import CPUConditionCodeRegisterMixin
+from MC6809.components.mc6809_ops_branches import OpsBranchesMixin
+from MC6809.components.mc6809_ops_load_store import OpsLoadStoreMixin
+from MC6809.components.mc6809_ops_logic import OpsLogicalMixin
+from MC6809.components.mc6809_ops_test import OpsTestMixin
+
+
+log = logging.getLogger("MC6809")
+
+
+# The pending flag functions: Every function sets all flags of its mask.
+# The Z flag is always set from cpu._lazy_z, so BEQ/BNE/LEA need no materialize_flags()
+
+def _clear_NZ(cpu):  # mask: 0x0c
+    cpu.N = 0
+    cpu.Z = 0 if cpu._lazy_z else 1
+
+
+def _clear_NZV(cpu):  # mask: 0x0e
+    cpu.N = 0
+    cpu.Z = 0 if cpu._lazy_z else 1
+    cpu.V = 0
+
+
+def _clear_HNZV(cpu):  # mask: 0x2e
+    cpu.H = 0
+    cpu.N = 0
+    cpu.Z = 0 if cpu._lazy_z else 1
+    cpu.V = 0
+
+
+def _update_NZ_8(cpu):  # mask: 0x0c
+    cpu.N = (cpu._lazy_r >> 7) & 1
+    cpu.Z = 0 if cpu._lazy_z else 1
+
+
+def _update_NZ0_8(cpu):  # mask: 0x0e
+    cpu.N = (cpu._lazy_r >> 7) & 1
+    cpu.Z = 0 if cpu._lazy_z else 1
+    cpu.V = 0
+
+
+def _update_NZ_16(cpu):  # mask: 0x0c
+    cpu.N = (cpu._lazy_r >> 15) & 1
+    cpu.Z = 0 if cpu._lazy_z else 1
+
+
+def _update_NZ0_16(cpu):  # mask: 0x0e
+    cpu.N = (cpu._lazy_r >> 15) & 1
+    cpu.Z = 0 if cpu._lazy_z else 1
+    cpu.V = 0
+
+
+def _update_NZV_8(cpu):  # mask: 0x0e
+    r = cpu._lazy_r
+    cpu.N = (r >> 7) & 1
+    cpu.Z = 0 if cpu._lazy_z else 1
+    cpu.V = ((cpu._lazy_a ^ cpu._lazy_b ^ r ^ (r >> 1)) >> 7) & 1
+
+
+def _update_NZV_16(cpu):  # mask: 0x0e
+    r = cpu._lazy_r
+    cpu.N = (r >> 15) & 1
+    cpu.Z = 0 if cpu._lazy_z else 1
+    cpu.V = ((cpu._lazy_a ^ cpu._lazy_b ^ r ^ (r >> 1)) >> 15) & 1
+
+
+def _update_HNZV_8(cpu):  # mask: 0x2e
+    a = cpu._lazy_a
+    b = cpu._lazy_b
+    r = cpu._lazy_r
+    cpu.H = ((a ^ b ^ r) >> 4) & 1
+    cpu.N = (r >> 7) & 1
+    cpu.Z = 0 if cpu._lazy_z else 1
+    cpu.V = ((a ^ b ^ r ^ (r >> 1)) >> 7) & 1
+
+
+def _with_flags(func):
+    """
+    Calculate the pending flags, before the op 'func' reads or sets them directly
+    """
+    @functools.wraps(func)  # incl. the opcodes
+    def op(self, *args, **kwargs):
+        if self._lazy_mask:
+            self.materialize_flags()
+        return func(self, *args, **kwargs)
+
+    return op
+
+
+class LazyConditionCodeRegisterMixin(CPUConditionCodeRegisterMixin):
+    """
+    Lazy evaluation of the H, N, Z and V flags.
+
+    The clear_*() and update_*() calls doesn't change these flags directly.
+    They only store a pending flag function, the mask of its flags and the
+    operands in plain attributes. The flags are calculated only in
+    get_cc_value() (used for PSHS CC, TFR CC, interrupts and the trace),
+    in the ops that read them (branches, DAA) or set them directly
+    (DEC, INC, MUL) or if a following operation doesn't overwrite all
+    pending flags. BEQ, BNE, BHI, BLS and LEA use the pending Z value.
+
+    The hot ops (loads, stores, ADD, SUB, CMP, logic ops, shifts) store
+    the pending flags directly, without the clear_*() and update_*() calls.
+
+    The carry is set directly: It's cheap and used by most of the ops,
+    that read a flag (ADC, SBC, ROL, ROR, BCC, BCS).
+
+    So the H, N, Z and V attributes are only valid after materialize_flags(),
+    e.g.: after test_run() or via get_cc_value().
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._lazy_mask = 0  # CC bits of the pending flags
+        self._lazy_update = None  # The pending flag function, e.g.: _update_NZ_8()
+        self._lazy_a = self._lazy_b = self._lazy_r = 0  # operands of the pending flag function
+        self._lazy_z = 0  # The pending Z flag is 1, if this is 0
+        super().__init__(*args, **kwargs)
+
+    def materialize_flags(self):
+        """ Calculate all pending flags """
+        if self._lazy_mask:
+            update = self._lazy_update
+            self._lazy_mask = 0
+            self._lazy_update = None
+            update(self)
+
+    def get_cc_value(self):
+        if self._lazy_mask:
+            self.materialize_flags()
+        return super().get_cc_value()
+
+    def set_cc(self, status):
+        self._lazy_mask = 0
+        self._lazy_update = None
+        super().set_cc(status)
+
+    def test_run(self, start, end, max_ops=1000000):
+        super().test_run(start, end, max_ops)
+        self.materialize_flags()
+
+    def test_run2(self, start, count):
+        super().test_run2(start, count)
+        self.materialize_flags()
+
+    ####
+
+    def clear_NZ(self):
+        if self._lazy_mask & ~0x0c:
+            self.materialize_flags()  # The pending flags will not be overwritten
+        self._lazy_mask = 0x0c
+        self._lazy_update = _clear_NZ
+        self._lazy_z = 1
+
+    def clear_NZC(self):
+        if self._lazy_mask & ~0x0c:
+            self.materialize_flags()  # The pending flags will not be overwritten
+        self._lazy_mask = 0x0c
+        self._lazy_update = _clear_NZ
+        self._lazy_z = 1
+        self.C = 0
+
+    def clear_NZV(self):
+        if self._lazy_mask & ~0x0e:
+            self.materialize_flags()  # The pending flags will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _clear_NZV
+        self._lazy_z = 1
+
+    def clear_NZVC(self):
+        if self._lazy_mask & ~0x0e:
+            self.materialize_flags()  # The pending flags will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _clear_NZV
+        self._lazy_z = 1
+        self.C = 0
+
+    def clear_HNZVC(self):
+        self._lazy_mask = 0x2e
+        self._lazy_update = _clear_HNZV
+        self._lazy_z = 1
+        self.C = 0
+
+    ####
+
+    # The update replaces the pending flag function only after a clear of its flags,
+    # otherwise the origin (eager) method is used.
+
+    def update_NZ_8(self, r):
+        update = self._lazy_update
+        if update is _clear_NZV:
+            self._lazy_update = _update_NZ0_8
+        elif update is _clear_NZ:
+            self._lazy_update = _update_NZ_8
+        else:
+            self.materialize_flags()
+            return super().update_NZ_8(r)
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+
+    def update_0100(self):
+        """ CC bits "HNZVC": -0100 """
+        self.clear_NZVC()
+        self._lazy_z = 0
+
+    def update_NZ01_8(self, r):
+        update = self._lazy_update
+        if update is _clear_NZV or update is _clear_NZ:
+            self._lazy_mask = 0x0e
+            self._lazy_update = _update_NZ0_8
+            self._lazy_r = r
+            self._lazy_z = r & 0xff
+            self.C = 1
+        else:
+            self.materialize_flags()
+            super().update_NZ01_8(r)
+
+    def update_NZ_16(self, r):
+        update = self._lazy_update
+        if update is _clear_NZV:
+            self._lazy_update = _update_NZ0_16
+        elif update is _clear_NZ:
+            self._lazy_update = _update_NZ_16
+        else:
+            self.materialize_flags()
+            return super().update_NZ_16(r)
+        self._lazy_r = r
+        self._lazy_z = r & 0xffff
+
+    def update_NZ0_8(self, r):
+        update = self._lazy_update
+        if update is _clear_NZV or update is _clear_NZ:
+            self._lazy_mask = 0x0e
+            self._lazy_update = _update_NZ0_8
+            self._lazy_r = r
+            self._lazy_z = r & 0xff
+        else:
+            self.materialize_flags()
+            super().update_NZ0_8(r)
+
+    def update_NZ0_16(self, r):
+        update = self._lazy_update
+        if update is _clear_NZV or update is _clear_NZ:
+            self._lazy_mask = 0x0e
+            self._lazy_update = _update_NZ0_16
+            self._lazy_r = r
+            self._lazy_z = r & 0xffff
+        else:
+            self.materialize_flags()
+            super().update_NZ0_16(r)
+
+    def update_NZC_8(self, r):
+        update = self._lazy_update
+        if update is _clear_NZ:
+            self._lazy_update = _update_NZ_8
+        elif update is _clear_NZV:
+            self._lazy_update = _update_NZ0_8
+        else:
+            self.materialize_flags()
+            return super().update_NZC_8(r)
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+        if r & 0x100:
+            self.C = 1
+
+    def update_NZVC_8(self, a, b, r):
+        if self._lazy_update is _clear_NZV:
+            self._lazy_update = _update_NZV_8
+            self._lazy_a = a
+            self._lazy_b = b
+            self._lazy_r = r
+            self._lazy_z = r & 0xff
+            if r & 0x100:
+                self.C = 1
+        else:
+            self.materialize_flags()
+            super().update_NZVC_8(a, b, r)
+
+    def update_NZVC_16(self, a, b, r):
+        if self._lazy_update is _clear_NZV:
+            self._lazy_update = _update_NZV_16
+            self._lazy_a = a
+            self._lazy_b = b
+            self._lazy_r = r
+            self._lazy_z = r & 0xffff
+            if r & 0x10000:
+                self.C = 1
+        else:
+            self.materialize_flags()
+            super().update_NZVC_16(a, b, r)
+
+    def update_HNZVC_8(self, a, b, r):
+        if self._lazy_update is _clear_HNZV:
+            self._lazy_update = _update_HNZV_8
+            self._lazy_a = a
+            self._lazy_b = b
+            self._lazy_r = r
+            self._lazy_z = r & 0xff
+            if r & 0x100:
+                self.C = 1
+        else:
+            self.materialize_flags()
+            super().update_HNZVC_8(a, b, r)
+
+    def set_H(self, a, b, r):
+        if self._lazy_mask:
+            self.materialize_flags()
+        super().set_H(a, b, r)
+
+    def set_Z8(self, r):
+        if self._lazy_mask:
+            self.materialize_flags()
+        super().set_Z8(r)
+
+    def set_Z16(self, r):
+        if self._lazy_mask:
+            self.materialize_flags()
+        super().set_Z16(r)
+
+    def set_N8(self, r):
+        if self._lazy_mask:
+            self.materialize_flags()
+        super().set_N8(r)
+
+    def set_N16(self, r):
+        if self._lazy_mask:
+            self.materialize_flags()
+        super().set_N16(r)
+
+    def set_V8(self, a, b, r):
+        if self._lazy_mask:
+            self.materialize_flags()
+        super().set_V8(a, b, r)
+
+    def set_V16(self, a, b, r):
+        if self._lazy_mask:
+            self.materialize_flags()
+        super().set_V16(a, b, r)
+
+    # ---- hot ops: store the pending flags without the clear_*/update_* calls ----
+
+    @opcode(*OpsLoadStoreMixin.instruction_LD8._opcodes)
+    def instruction_LD8(self, opcode, m, register):
+        """ CC bits "HNZVC": -aa0- """
+        register.set(m)
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZ0_8
+        self._lazy_r = m
+        self._lazy_z = m & 0xff
+
+    @opcode(*OpsLoadStoreMixin.instruction_LD16._opcodes)
+    def instruction_LD16(self, opcode, m, register):
+        """ CC bits "HNZVC": -aa0- """
+        register.set(m)
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZ0_16
+        self._lazy_r = m
+        self._lazy_z = m & 0xffff
+
+    @opcode(*OpsLoadStoreMixin.instruction_ST8._opcodes)
+    def instruction_ST8(self, opcode, ea, register):
+        """ CC bits "HNZVC": -aa0- """
+        value = register.value
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZ0_8
+        self._lazy_r = value
+        self._lazy_z = value & 0xff
+        return ea, value  # write byte to Memory
+
+    @opcode(*OpsLoadStoreMixin.instruction_ST16._opcodes)
+    def instruction_ST16(self, opcode, ea, register):
+        """ CC bits "HNZVC": -aa0- """
+        value = register.value
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZ0_16
+        self._lazy_r = value
+        self._lazy_z = value & 0xffff
+        return ea, value  # write word to Memory
+
+    @opcode(*OpsLogicalMixin.instruction_AND._opcodes)
+    def instruction_AND(self, opcode, m, register):
+        """ CC bits "HNZVC": -aa0- """
+        r = register.value & m
+        register.set(r)
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZ0_8
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+
+    @opcode(*OpsLogicalMixin.instruction_EOR._opcodes)
+    def instruction_EOR(self, opcode, m, register):
+        """ CC bits "HNZVC": -aa0- """
+        r = register.value ^ m
+        register.set(r)
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZ0_8
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+
+    @opcode(*OpsLogicalMixin.instruction_OR._opcodes)
+    def instruction_OR(self, opcode, m, register):
+        """ CC bits "HNZVC": -aa0- """
+        r = register.value | m
+        register.set(r)
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZ0_8
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+
+    @opcode(*CPUBase.instruction_ADD8._opcodes)
+    def instruction_ADD8(self, opcode, m, register):
+        """ CC bits "HNZVC": aaaaa """
+        a = register.value
+        r = a + m
+        register.set(r)
+        self._lazy_mask = 0x2e
+        self._lazy_update = _update_HNZV_8
+        self._lazy_a = a
+        self._lazy_b = m
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+        self.C = (r >> 8) & 1
+
+    @opcode(*CPUBase.instruction_SUB._opcodes)
+    def instruction_SUB(self, opcode, m, register):
+        """ CC bits "HNZVC": uaaaa """
+        a = register.value
+        r = a - m
+        register.set(r)
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_a = a
+        self._lazy_b = m
+        self._lazy_r = r
+        if register.WIDTH == 8:
+            self._lazy_update = _update_NZV_8
+            self._lazy_z = r & 0xff
+            self.C = (r >> 8) & 1
+        else:
+            self._lazy_update = _update_NZV_16
+            self._lazy_z = r & 0xffff
+            self.C = (r >> 16) & 1
+
+    @opcode(*OpsTestMixin.instruction_CMP8._opcodes)
+    def instruction_CMP8(self, opcode, m, register):
+        """ CC bits "HNZVC": uaaaa """
+        a = register.value
+        r = a - m
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZV_8
+        self._lazy_a = a
+        self._lazy_b = m
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+        self.C = (r >> 8) & 1
+
+    @opcode(*OpsTestMixin.instruction_CMP16._opcodes)
+    def instruction_CMP16(self, opcode, m, register):
+        """ CC bits "HNZVC": -aaaa """
+        a = register.value
+        r = a - m
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZV_16
+        self._lazy_a = a
+        self._lazy_b = m
+        self._lazy_r = r
+        self._lazy_z = r & 0xffff
+        self.C = (r >> 16) & 1
+
+    def LSL(self, a):
+        """ CC bits "HNZVC": naaas """
+        r = a << 1
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZV_8
+        self._lazy_a = self._lazy_b = a
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+        self.C = (r >> 8) & 1
+        return r
+
+    def ROL(self, a):
+        """ CC bits "HNZVC": -aaas """
+        r = (a << 1) | self.C
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZV_8
+        self._lazy_a = self._lazy_b = a
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+        self.C = (r >> 8) & 1
+        return r
+
+    def LSR(self, a):
+        """ CC bits "HNZVC": -0a-s """
+        r = a >> 1
+        if self._lazy_mask & 0x22:
+            self.materialize_flags()  # The pending H and V flags will not be overwritten
+        self._lazy_mask = 0x0c
+        self._lazy_update = _update_NZ_8
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+        self.C = a & 1  # bit 0 is shifted into the carry
+        return r
+
+    def ASR(self, a):
+        """ CC bits "HNZVC": uaa-s """
+        r = (a >> 1) | (a & 0x80)
+        if self._lazy_mask & 0x22:
+            self.materialize_flags()  # The pending H and V flags will not be overwritten
+        self._lazy_mask = 0x0c
+        self._lazy_update = _update_NZ_8
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+        self.C = a & 1  # bit 0 is shifted into the carry
+        return r
+
+    def ROR(self, a):
+        """ CC bits "HNZVC": -aa-s """
+        r = (a >> 1) | (self.C << 7)
+        if self._lazy_mask & 0x22:
+            self.materialize_flags()  # The pending H and V flags will not be overwritten
+        self._lazy_mask = 0x0c
+        self._lazy_update = _update_NZ_8
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+        self.C = a & 1  # bit 0 is shifted into the carry
+        return r
+
+    # ---- ops that use the flags ----
+
+    @opcode(*OpsBranchesMixin.instruction_BEQ._opcodes)
+    def instruction_BEQ(self, opcode, ea):
+        if (not self._lazy_z) if self._lazy_mask else self.Z:
+            self.program_counter.set(ea)
+
+    @opcode(*OpsBranchesMixin.instruction_BGE._opcodes)
+    def instruction_BGE(self, opcode, ea):
+        if self._lazy_mask:
+            self.materialize_flags()
+        if self.N == self.V:
+            self.program_counter.set(ea)
+
+    @opcode(*OpsBranchesMixin.instruction_BGT._opcodes)
+    def instruction_BGT(self, opcode, ea):
+        if self._lazy_mask:
+            self.materialize_flags()
+        if not self.Z and self.N == self.V:
+            self.program_counter.set(ea)
+
+    @opcode(*OpsBranchesMixin.instruction_BHI._opcodes)
+    def instruction_BHI(self, opcode, ea):
+        if self.C == 0 and (self._lazy_z if self._lazy_mask else not self.Z):
+            self.program_counter.set(ea)
+
+    @opcode(*OpsBranchesMixin.instruction_BLE._opcodes)
+    def instruction_BLE(self, opcode, ea):
+        if self._lazy_mask:
+            self.materialize_flags()
+        if (self.N ^ self.V) == 1 or self.Z == 1:
+            self.program_counter.set(ea)
+
+    @opcode(*OpsBranchesMixin.instruction_BLS._opcodes)
+    def instruction_BLS(self, opcode, ea):
+        if self.C == 1 or ((not self._lazy_z) if self._lazy_mask else self.Z):
+            self.program_counter.set(ea)
+
+    @opcode(*OpsBranchesMixin.instruction_BLT._opcodes)
+    def instruction_BLT(self, opcode, ea):
+        if self._lazy_mask:
+            self.materialize_flags()
+        if (self.N ^ self.V) == 1:
+            self.program_counter.set(ea)
+
+    @opcode(*OpsBranchesMixin.instruction_BMI._opcodes)
+    def instruction_BMI(self, opcode, ea):
+        if self._lazy_mask:
+            self.materialize_flags()
+        if self.N == 1:
+            self.program_counter.set(ea)
+
+    @opcode(*OpsBranchesMixin.instruction_BNE._opcodes)
+    def instruction_BNE(self, opcode, ea):
+        if self._lazy_z if self._lazy_mask else not self.Z:
+            self.program_counter.set(ea)
+
+    @opcode(*OpsBranchesMixin.instruction_BPL._opcodes)
+    def instruction_BPL(self, opcode, ea):
+        if self._lazy_mask:
+            self.materialize_flags()
+        if self.N == 0:
+            self.program_counter.set(ea)
+
+    @opcode(*OpsBranchesMixin.instruction_BVC._opcodes)
+    def instruction_BVC(self, opcode, ea):
+        if self._lazy_mask:
+            self.materialize_flags()
+        if self.V == 0:
+            self.program_counter.set(ea)
+
+    @opcode(*OpsBranchesMixin.instruction_BVS._opcodes)
+    def instruction_BVS(self, opcode, ea):
+        if self._lazy_mask:
+            self.materialize_flags()
+        if self.V == 1:
+            self.program_counter.set(ea)
+
+    instruction_DAA = _with_flags(CPUBase.instruction_DAA)
+    instruction_MUL = _with_flags(CPUBase.instruction_MUL)
+
+    # ---- ops that set the flags directly ----
+
+    @opcode(*CPUBase.instruction_LEA_register._opcodes)
+    def instruction_LEA_register(self, opcode, ea, register):
+        """ CC bits "HNZVC": --a-- """
+        register.set(ea)
+        if self._lazy_mask:
+            self._lazy_z = ea & 0xffff  # The pending flag functions set Z from it
+        else:
+            self.Z = 0 if ea & 0xffff else 1
+
+    def DEC(self, a):
+        """ CC bits "HNZVC": -aaa- """
+        r = a - 1
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZ0_8
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+        if r == 0x7f:
+            self.materialize_flags()
+            self.V = 1
+        return r
+
+    def INC(self, a):
+        """ CC bits "HNZVC": -aaa- """
+        r = a + 1
+        if self._lazy_mask & 0x20:
+            self.materialize_flags()  # The pending H flag will not be overwritten
+        self._lazy_mask = 0x0e
+        self._lazy_update = _update_NZ0_8
+        self._lazy_r = r
+        self._lazy_z = r & 0xff
+        if r == 0x80:
+            self.materialize_flags()
+            self.V = 1
+        return r
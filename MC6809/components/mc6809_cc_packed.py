@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Condition code register stored in one integer and precomputed flag
+    tables for the 8-bit ALU operations.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import functools
+import logging
+
+from MC6809.components.cpu_utils.instruction_caller import opcode
+from MC6809.components.mc6809_cc_register import CPUConditionCodeRegisterMixin
+
+
+log = logging.getLogger("MC6809")
+
+
+def _flags_NZ_8(r):
+    return (r & 0x80) >> 4 | (0 if r & 0xff else 0x04)
+
+
+def _flags_NZVC_8(a, b, r):
+    return _flags_NZ_8(r) | ((a ^ b ^ r ^ (r >> 1)) & 0x80) >> 6 | (r & 0x100) >> 8
+
+
+def build_add_flags():
+    """
+    HNZVC flags of 8-bit additions: a + b + carry
+    index: carry << 16 | a << 8 | b
+
+    >>> table = build_add_flags()
+    >>> len(table)
+    131072
+    >>> hex(table[0x7f << 8 | 0x01])  # $7f + $01 = $80 -> H, N and V
+    '0x2a'
+    >>> hex(table[1 << 16 | 0xff << 8 | 0x00])  # $ff + $00 + 1 = $100 -> H, Z and C
+    '0x25'
+    """
+    return bytes(
+        ((a ^ b ^ (a + b + carry)) & 0x10) << 1 | _flags_NZVC_8(a, b, a + b + carry)
+        for carry in (0, 1)
+        for a in range(0x100)
+        for b in range(0x100)
+    )
+
+
+def build_sub_flags():
+    """
+    NZVC flags of 8-bit subtractions: a - b - carry
+    index: carry << 16 | a << 8 | b
+
+    >>> table = build_sub_flags()
+    >>> hex(table[0x00 << 8 | 0x01])  # $00 - $01 = $ff -> N and C
+    '0x9'
+    >>> hex(table[0x80 << 8 | 0x01])  # $80 - $01 = $7f -> V
+    '0x2'
+    """
+    return bytes(
+        _flags_NZVC_8(a, b, a - b - carry)
+        for carry in (0, 1)
+        for a in range(0x100)
+        for b in range(0x100)
+    )
+
+
+def build_inc_flags():
+    """
+    NZV flags of INC, index: the old value
+
+    >>> table = build_inc_flags()
+    >>> hex(table[0x7f]), hex(table[0xff])
+    ('0xa', '0x4')
+    """
+    return bytes(
+        _flags_NZ_8(a + 1) | (0x02 if a + 1 == 0x80 else 0)
+        for a in range(0x100)
+    )
+
+
+def build_dec_flags():
+    """
+    NZV flags of DEC, index: the old value
+
+    >>> table = build_dec_flags()
+    >>> hex(table[0x80]), hex(table[0x01])
+    ('0x2', '0x4')
+    """
+    return bytes(
+        _flags_NZ_8(a - 1) | (0x02 if a - 1 == 0x7f else 0)
+        for a in range(0x100)
+    )
+
+
+def build_daa_tables():
+    """
+    New value and NZC flags of DAA
+    index: C << 9 | H << 8 | a
+
+    >>> results, flags = build_daa_tables()
+    >>> hex(results[0x0a]), hex(flags[0x0a])
+    ('0x10', '0x0')
+    >>> hex(results[0x9a]), hex(flags[0x9a])  # $9a -> $00 with carry
+    ('0x100', '0x5')
+    """
+    results = []
+    flags = []
+    for c in (0, 1):
+        for h in (0, 1):
+            for a in range(0x100):
+                correction_factor = 0
+                a_hi = a & 0xf0
+                a_lo = a & 0x0f
+                if a_lo > 0x09 or h:
+                    correction_factor |= 0x06
+                if a_hi > 0x80 and a_lo > 0x09:
+                    correction_factor |= 0x60
+                if a_hi > 0x90 or c:
+                    correction_factor |= 0x60
+                r = correction_factor + a
+                results.append(r)
+                flags.append(_flags_NZ_8(r) | (r & 0x100) >> 8)
+    return tuple(results), bytes(flags)
+
+
+@functools.cache
+def get_alu_flag_tables():
+    """
+    Build all flag tables once (takes a moment) and share them between all CPU instances.
+    """
+    log.debug("Build 8-bit ALU flag tables")
+    return {
+        "add": build_add_flags(),
+        "sub": build_sub_flags(),
+        "inc": build_inc_flags(),
+        "dec": build_dec_flags(),
+        "daa": build_daa_tables(),
+    }
+
+
+def _packed_flag(bit):
+    """
+    Build a property for one flag bit of the packed condition code register
+    """
+    mask = 1 << bit
+
+    def get_flag(self):
+        return (self.cc >> bit) & 1
+
+    def set_flag(self, value):
+        if value:
+            self.cc |= mask
+        else:
+            self.cc &= ~mask
+
+    return property(get_flag, set_flag)
+
+
+class PackedConditionCodeRegisterMixin(CPUConditionCodeRegisterMixin):
+    """
+    Store the condition code register in one integer 'self.cc'
+
+    The flags E F H I N Z V C are still available as attributes.
+    The 8-bit ALU ops ADD, ADC, SUB, SBC, CMP, NEG, INC, DEC and DAA
+    take the result flags from precomputed tables.
+    """
+    E = _packed_flag(7)
+    F = _packed_flag(6)
+    H = _packed_flag(5)
+    I = _packed_flag(4)  # noqa:E741
+    N = _packed_flag(3)
+    Z = _packed_flag(2)
+    V = _packed_flag(1)
+    C = _packed_flag(0)
+
+    def __init__(self, *args, **kwargs):
+        self.cc = 0x00
+        tables = get_alu_flag_tables()
+        self.add_flags = tables["add"]
+        self.sub_flags = tables["sub"]
+        self.inc_flags = tables["inc"]
+        self.dec_flags = tables["dec"]
+        self.daa_results, self.daa_flags = tables["daa"]
+        super().__init__(*args, **kwargs)
+
+    ####
+
+    def get_cc_value(self):
+        return self.cc
+
+    def set_cc(self, status):
+        self.cc = status & 0xff
+        self.update_interrupts()  # The I/F mask bits may have changed
+
+    ####
+
+    def set_H(self, a, b, r):
+        self.cc |= ((a ^ b ^ r) & 0x10) << 1
+
+    def set_Z8(self, r):
+        if not r & 0xff:
+            self.cc |= 0x04
+
+    def set_Z16(self, r):
+        if not r & 0xffff:
+            self.cc |= 0x04
+
+    def set_N8(self, r):
+        self.cc |= (r & 0x80) >> 4
+
+    def set_N16(self, r):
+        self.cc |= (r & 0x8000) >> 12
+
+    def set_C8(self, r):
+        self.cc |= (r & 0x100) >> 8
+
+    def set_C16(self, r):
+        self.cc |= (r & 0x10000) >> 16
+
+    def set_V8(self, a, b, r):
+        self.cc |= ((a ^ b ^ r ^ (r >> 1)) & 0x80) >> 6
+
+    def set_V16(self, a, b, r):
+        self.cc |= ((a ^ b ^ r ^ (r >> 1)) & 0x8000) >> 14
+
+    ####
+
+    def clear_NZ(self):
+        self.cc &= 0xf3
+
+    def clear_NZC(self):
+        self.cc &= 0xf2
+
+    def clear_NZV(self):
+        self.cc &= 0xf1
+
+    def clear_NZVC(self):
+        self.cc &= 0xf0
+
+    def clear_HNZVC(self):
+        self.cc &= 0xd0
+
+    ####
+
+    def update_NZ_8(self, r):
+        self.cc |= _flags_NZ_8(r)
+
+    def update_0100(self):
+        """ CC bits "HNZVC": -0100 """
+        self.cc = self.cc & 0xf0 | 0x04
+
+    def update_NZ01_8(self, r):
+        self.cc = (self.cc | _flags_NZ_8(r)) & 0xfc | 0x01
+
+    def update_NZ_16(self, r):
+        self.cc |= (r & 0x8000) >> 12 | (0 if r & 0xffff else 0x04)
+
+    def update_NZ0_8(self, r):
+        self.cc = (self.cc | _flags_NZ_8(r)) & 0xfd
+
+    def update_NZ0_16(self, r):
+        self.cc = (self.cc | (r & 0x8000) >> 12 | (0 if r & 0xffff else 0x04)) & 0xfd
+
+    def update_NZC_8(self, r):
+        self.cc |= _flags_NZ_8(r) | (r & 0x100) >> 8
+
+    def update_NZVC_8(self, a, b, r):
+        self.cc |= _flags_NZVC_8(a, b, r)
+
+    def update_NZVC_16(self, a, b, r):
+        self.cc |= (
+            (r & 0x8000) >> 12
+            | (0 if r & 0xffff else 0x04)
+            | ((a ^ b ^ r ^ (r >> 1)) & 0x8000) >> 14
+            | (r & 0x10000) >> 16
+        )
+
+    def update_HNZVC_8(self, a, b, r):
+        self.cc |= ((a ^ b ^ r) & 0x10) << 1 | _flags_NZVC_8(a, b, r)
+
+    # ---- 8-bit ALU ops via the flag tables ----
+
+    @opcode(  # Add memory to accumulator with carry
+        0x89, 0x99, 0xa9, 0xb9,  # ADCA (immediate, direct, indexed, extended)
+        0xc9, 0xd9, 0xe9, 0xf9,  # ADCB (immediate, direct, indexed, extended)
+    )
+    def instruction_ADC(self, opcode, m, register):
+        """ CC bits "HNZVC": aaaaa """
+        cc = self.cc
+        a = register.value
+        register.set(a + m + (cc & 0x01))
+        self.cc = cc & 0xd0 | self.add_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    @opcode(  # Add memory to accumulator
+        0x8b, 0x9b, 0xab, 0xbb,  # ADDA (immediate, direct, indexed, extended)
+        0xcb, 0xdb, 0xeb, 0xfb,  # ADDB (immediate, direct, indexed, extended)
+    )
+    def instruction_ADD8(self, opcode, m, register):
+        """ CC bits "HNZVC": aaaaa """
+        a = register.value
+        register.set(a + m)
+        self.cc = self.cc & 0xd0 | self.add_flags[a << 8 | m]
+
+    @opcode(  # Subtract memory from accumulator with borrow
+        0x82, 0x92, 0xa2, 0xb2,  # SBCA (immediate, direct, indexed, extended)
+        0xc2, 0xd2, 0xe2, 0xf2,  # SBCB (immediate, direct, indexed, extended)
+    )
+    def instruction_SBC(self, opcode, m, register):
+        """ CC bits "HNZVC": uaaaa """
+        cc = self.cc
+        a = register.value
+        register.set(a - m - (cc & 0x01))
+        self.cc = cc & 0xf0 | self.sub_flags[(cc & 0x01) << 16 | a << 8 | m]
+
+    @opcode(  # Subtract memory from accumulator
+        0x80, 0x90, 0xa0, 0xb0,  # SUBA (immediate, direct, indexed, extended)
+        0xc0, 0xd0, 0xe0, 0xf0,  # SUBB (immediate, direct, indexed, extended)
+        0x83, 0x93, 0xa3, 0xb3,  # SUBD (immediate, direct, indexed, extended)
+    )
+    def instruction_SUB(self, opcode, m, register):
+        """ CC bits "HNZVC": uaaaa """
+        if register.WIDTH != 8:
+            return super().instruction_SUB(opcode, m, register)
+        a = register.value
+        register.set(a - m)
+        self.cc = self.cc & 0xf0 | self.sub_flags[a << 8 | m]
+
+    @opcode(  # Compare memory from accumulator
+        0x81, 0x91, 0xa1, 0xb1,  # CMPA (immediate, direct, indexed, extended)
+        0xc1, 0xd1, 0xe1, 0xf1,  # CMPB (immediate, direct, indexed, extended)
+    )
+    def instruction_CMP8(self, opcode, m, register):
+        """ CC bits "HNZVC": uaaaa """
+        self.cc = self.cc & 0xf0 | self.sub_flags[register.value << 8 | m]
+
+    @opcode(  # Negate accumulator
+        0x40,  # NEGA (inherent)
+        0x50,  # NEGB (inherent)
+    )
+    def instruction_NEG_register(self, opcode, register):
+        """ CC bits "HNZVC": uaaaa """
+        x = register.value
+        register.set(-x)
+        self.cc = self.cc & 0xf0 | self.sub_flags[x]  # same as: 0 - x
+
+    def DEC(self, a):
+        """ CC bits "HNZVC": -aaa- """
+        self.cc = self.cc & 0xf1 | self.dec_flags[a]
+        return a - 1
+
+    def INC(self, a):
+        """ CC bits "HNZVC": -aaa- """
+        self.cc = self.cc & 0xf1 | self.inc_flags[a]
+        return a + 1
+
+    @opcode(  # Decimal adjust A accumulator
+        0x19,  # DAA (inherent)
+    )
+    def instruction_DAA(self, opcode):
+        """ CC bits "HNZVC": -aa0a """
+        cc = self.cc
+        index = (cc & 0x01) << 9 | (cc & 0x20) << 3 | self.accu_a.value
+        self.accu_a.set(self.daa_results[index])
+        self.cc = cc & 0xf3 | self.daa_flags[index]
@@ -64,6 +64,10 @@ class CPUConditionCodeRegisterMixin:
 
         self.cc_register = ConditionCodeRegister(self)
 
+    def init_clone(self, origin):
+        super().init_clone(origin)
+        self.cc_register = ConditionCodeRegister(self)
+
     ####
 
     def get_cc_value(self):
@@ -80,6 +84,7 @@ class CPUConditionCodeRegisterMixin:
         self.E, self.F, self.H, self.I, self.N, self.Z, self.V, self.C = (
             0 if status & x == 0 else 1 for x in (128, 64, 32, 16, 8, 4, 2, 1)
         )
+        self.update_interrupts()  # The I/F mask bits may have changed
 
     def get_cc_info(self):
         """
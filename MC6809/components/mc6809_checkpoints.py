@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Seek to a CPU cycle via periodic checkpoints and re-execution.
+
+    A periodic cycle event stores a checkpoint every 'interval' cycles:
+    The registers, the scheduled cycle events and only the memory pages
+    that are changed since the previous checkpoint. So the memory usage
+    is proportional to the write activity.
+
+    seek() restores the nearest checkpoint before the wanted cycle and
+    runs the CPU forward at full speed. The result is the same as in the
+    first run, if the run is deterministic: The periphery should be
+    replayed, see: mc6809_record_replay.py
+
+    The number of checkpoints is bounded: The least recently used one
+    is removed and its pages are merged into the following checkpoint.
+    The first and the newest checkpoint are never removed.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import bisect
+import collections
+import logging
+
+from MC6809.components.memory import PAGE_COUNT, PAGE_SHIFT
+
+
+log = logging.getLogger("MC6809")
+
+
+class Checkpoint:
+    __slots__ = ("cycles", "events", "interrupt_lines", "last_op_address", "pages", "registers")
+
+    def __init__(self, cpu, pages):
+        self.cycles = cpu.cycles
+        self.registers = cpu.get_register_state()
+        self.last_op_address = cpu.last_op_address
+        self.interrupt_lines = cpu.interrupt_lines
+        self.events = cpu.scheduler.get_events()
+        self.pages = pages  # page number -> page data, changed since the previous checkpoint
+
+    def restore(self, cpu):
+        cpu.set_register_state(self.registers)
+        cpu.last_op_address = self.last_op_address
+        cpu.interrupt_lines = self.interrupt_lines
+        cpu.update_interrupts()
+        cpu.scheduler.set_events(self.events)
+
+
+class CheckpointTimeline:
+    def __init__(self, cpu, interval, max_checkpoints=100):
+        if max_checkpoints < 2:
+            raise ValueError(f"max_checkpoints must be >= 2, not: {max_checkpoints!r}")
+        self.cpu = cpu
+        self.max_checkpoints = max_checkpoints
+
+        self._checkpoint_cycles = []  # sorted cycles of all checkpoints
+        self._checkpoints = collections.OrderedDict()  # cycles -> Checkpoint, least recently used first
+        self._last_image = None  # memory at the newest checkpoint
+
+        self.event = cpu.add_cycle_event(interval, self._checkpoint_event, period=interval)
+        self.add_checkpoint()
+
+    def __len__(self):
+        return len(self._checkpoints)
+
+    @property
+    def first_cycles(self):
+        return self._checkpoint_cycles[0]
+
+    def _checkpoint_event(self, cycles):
+        if cycles > self._checkpoint_cycles[-1]:
+            self.add_checkpoint()
+        # else: re-execution after a seek(): The checkpoint exists or was merged into the following one
+
+    def add_checkpoint(self):
+        image = self.cpu.memory.snapshot()
+        last_image = self._last_image
+        pages = {}
+        for page in range(PAGE_COUNT):
+            start = page << PAGE_SHIFT
+            end = start + (1 << PAGE_SHIFT)
+            data = image[start:end]
+            if last_image is None or data != last_image[start:end]:
+                pages[page] = data
+        self._last_image = image
+
+        checkpoint = Checkpoint(self.cpu, pages)
+        self._checkpoint_cycles.append(checkpoint.cycles)
+        self._checkpoints[checkpoint.cycles] = checkpoint
+        while len(self._checkpoints) > self.max_checkpoints:
+            self._evict()
+        return checkpoint
+
+    def _evict(self):
+        first, newest = self._checkpoint_cycles[0], self._checkpoint_cycles[-1]
+        for cycles in self._checkpoints:
+            if cycles not in (first, newest):
+                break
+
+        checkpoint = self._checkpoints.pop(cycles)
+        index = bisect.bisect_left(self._checkpoint_cycles, cycles)
+        del self._checkpoint_cycles[index]
+
+        # The following checkpoint contains now all changes since the previous one:
+        following = self._checkpoints[self._checkpoint_cycles[index]]
+        for page, data in checkpoint.pages.items():
+            following.pages.setdefault(page, data)
+
+    def _get_image(self, index):
+        """
+        Returns the memory at the checkpoint with the given index
+        """
+        image = bytearray(PAGE_COUNT << PAGE_SHIFT)
+        missing_pages = set(range(PAGE_COUNT))
+        while missing_pages:
+            checkpoint = self._checkpoints[self._checkpoint_cycles[index]]
+            for page in missing_pages & checkpoint.pages.keys():
+                image[page << PAGE_SHIFT:(page + 1) << PAGE_SHIFT] = checkpoint.pages[page]
+                missing_pages.remove(page)
+            index -= 1  # The first checkpoint contains all pages
+        return image
+
+    def seek(self, cycles):
+        """
+        Run the CPU to the first instruction boundary at or after 'cycles'.
+        Returns the reached CPU cycles.
+        """
+        cpu = self.cpu
+        if cycles < self.first_cycles:
+            raise ValueError(f"Cycle {cycles:d} is before the first checkpoint at cycle {self.first_cycles:d}")
+
+        index = bisect.bisect_right(self._checkpoint_cycles, cycles) - 1
+        checkpoint_cycles = self._checkpoint_cycles[index]
+        if not checkpoint_cycles <= cpu.cycles <= cycles:
+            # The nearest checkpoint is nearer than the current CPU state
+            checkpoint = self._checkpoints[checkpoint_cycles]
+            self._checkpoints.move_to_end(checkpoint_cycles)  # recently used
+            cpu.memory.restore(self._get_image(index))
+            checkpoint.restore(cpu)
+
+        if cpu.cycles < cycles:
+            cpu.run_until(cycles=cycles)
+        return cpu.cycles
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Closed-form fast-forward of counted delay loops.
+
+    ROMs use software delay loops like "LDX #$FFFF / L LEAX -1,X / BNE L"
+    or "DECB / BNE L". Everything such a loop does is determined by the
+    counter register, so the wrapped BNE op calculates all iterations
+    in one step: The final counter value, the flags of the last decrement
+    and the cycles from the opcode cycle table.
+
+    Iterations that would pass the next scheduler deadline (a cycle event)
+    are executed normally.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import logging
+
+from MC6809.components.mc6809_idle_loop import FastForwardMixin
+
+
+log = logging.getLogger("MC6809")
+
+
+# The loop body before the BNE -> (register name, the body opcodes)
+DELAY_LOOPS = {
+    bytes([0x30, 0x1F]): ("index_x", (0x30,)),  # LEAX -1,X
+    bytes([0x31, 0x3F]): ("index_y", (0x31,)),  # LEAY -1,Y
+    bytes([0x4A]): ("accu_a", (0x4A,)),  # DECA
+    bytes([0x5A]): ("accu_b", (0x5A,)),  # DECB
+}
+BNE = 0x26
+
+
+class DelayLoopMixin(FastForwardMixin):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_delay_loops()
+
+    def init_clone(self, origin):
+        super().init_clone(origin)
+        self._init_delay_loops()
+
+    def _init_delay_loops(self):
+        # The cycles of one iteration: The cycles of the ops + one for every fetched byte
+        self._delay_loops = {}  # loop body -> (register, cycles of one iteration)
+        for body, (register_name, opcodes) in DELAY_LOOPS.items():
+            cycles = sum(self.opcode_dict[opcode][0] for opcode in opcodes + (BNE,))
+            cycles += len(body) + 2
+            self._delay_loops[body] = (getattr(self, register_name), cycles)
+
+        self.wrap_branch_ops((BNE,), self._build_delay_branch)  # Not LBNE: The cycles are from BNE
+
+    def _build_delay_branch(self, get_ea, instr_func):
+        cpu = self
+        program_counter = self.program_counter
+        buffer = self.memory.buffer
+
+        def delay_branch(opcode):
+            start = get_ea()
+            instr_func(opcode, start)
+            if 0 < cpu.last_op_address - start < 3 and program_counter.value == start:
+                # Backward branch to a loop body of one or two bytes taken
+                body_size = cpu.last_op_address - start
+                try:
+                    loop = cpu._delay_loops[bytes(buffer[start:start + body_size])]
+                except KeyError:
+                    return
+                cpu.fast_forward_delay_loop(start, *loop)
+
+        return delay_branch
+
+    def fast_forward_delay_loop(self, start, register, period):
+        if self.breakpoints and not self.breakpoints.keys().isdisjoint(range(start, self.last_op_address + 1)):
+            return  # Every iteration must be checked
+
+        # All iterations, except the last one, that ends the loop, but not past the next deadline:
+        counter = register.value
+        skip_count = min(counter - 1, (self.scheduler.next_deadline - self.cycles - 1) // period)
+        if skip_count <= 0:
+            return
+
+        counter -= skip_count
+        if register.WIDTH == 8:
+            self.DEC(counter + 1)  # Set the flags of the last decrement
+        register.set(counter)
+
+        skipped_cycles = skip_count * period
+        self.cycles += skipped_cycles
+        self.skipped_cycles += skipped_cycles
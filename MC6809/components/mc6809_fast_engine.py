@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.mc6809_cc_packed import PackedConditionCodeRegisterMixin
+from MC6809.components.mc6809_register_file import RegisterFileMixin
+
+
+class FastEngineMixin(RegisterFileMixin, PackedConditionCodeRegisterMixin):
+    """
+    Execute the ops via the generated concrete functions from
+    cpu_utils/instruction_fast.py (see Instruction_generator.py)
+
+    They work directly on the integers of the register file and
+    the packed condition code register.
+    """
+    fast_engine = True
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Fast-forward idle loops to the next cycle event.
+
+    Many ROMs wait for a device or an interrupt in short polling loops
+    like "LDA $FF03 / BPL loop" or "BRA *". If a backward branch is taken
+    two times in a row with the same registers, no cycle event was called
+    in between and the loop body can't write to memory, every further
+    iteration is the same until a cycle event changes the machine state. So the CPU cycles of the iterations
+    until the next event are added in one step.
+
+    Only the relative branch ops are wrapped, so the check costs nothing
+    for all other ops. The loop body is inspected only one time per loop:
+    A backward branch of a loop, that is no idle loop, costs only a set lookup.
+    See also: mc6809_delay_loop.py
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import logging
+
+from MC6809.components.cpu_utils.instruction_call import PrepagedInstructions
+from MC6809.components.mc6809_block_cache import is_block_end
+from MC6809.components.mc6809_breakpoints import DebugStop
+from MC6809.components.mc6809_scheduler import NO_DEADLINE
+from MC6809.components.MC6809data.MC6809_data_utils import MC6809OP_DATA_DICT, get_op_length
+from MC6809.components.MC6809data.MC6809_op_data import RELATIVE
+
+
+log = logging.getLogger("MC6809")
+
+
+# Instructions that write to memory, without 'write_to_memory' in the op data:
+STACK_WRITE_MNEMONICS = frozenset({"PSHS", "PSHU"})
+
+# All relative branches, except the subroutine calls:
+IDLE_LOOP_BRANCH_OPCODES = frozenset(
+    op_code
+    for op_code, data in MC6809OP_DATA_DICT.items()
+    if (data["addr_mode"] or "").startswith("RELATIVE") and data["mnemonic"] not in ("BSR", "LBSR")
+)
+
+
+def is_idle_loop_body(mem, start, branch_address):
+    """
+    Returns True if the ops from 'start' up to the branch at 'branch_address'
+    don't write to memory and don't leave the loop.
+
+    >>> is_idle_loop_body(bytes([0xB6, 0xFF, 0x03, 0x2A, 0xFB]), 0, 3)  # LDA $FF03 / BPL
+    True
+    >>> is_idle_loop_body(bytes([0xA6, 0x88, 0x20, 0x2A, 0xFB]), 0, 3)  # LDA $20,X / BPL
+    True
+    >>> is_idle_loop_body(bytes([0x20, 0xFE]), 0, 0)  # BRA *
+    True
+    >>> is_idle_loop_body(bytes([0x0C, 0x20, 0x26, 0xFC]), 0, 2)  # INC <$20 / BNE
+    False
+    >>> is_idle_loop_body(bytes([0xBD, 0x40, 0x00, 0x20, 0xFB]), 0, 3)  # JSR $4000 / BRA
+    False
+    """
+    address = start
+    while address < branch_address:
+        opcode = mem[address]
+        opcode_bytes = 1
+        if opcode in (0x10, 0x11):
+            opcode = opcode << 8 | mem[address + 1]
+            opcode_bytes = 2
+        try:
+            op_data = MC6809OP_DATA_DICT[opcode]
+        except KeyError:
+            return False  # illegal op
+
+        post_byte = mem[address + opcode_bytes]
+        if (
+            op_data["write_to_memory"]
+            or op_data["mnemonic"] in STACK_WRITE_MNEMONICS
+            or is_block_end(op_data, post_byte=post_byte)
+        ):
+            return False
+        address += get_op_length(op_data, post_byte)
+    return address == branch_address
+
+
+class FastForwardMixin:
+    """
+    Base for the mixins that fast-forward loops in the branch ops:
+    Skipped cycles never pass the next scheduler deadline.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.skipped_cycles = 0  # Statistics: All fast-forwarded cycles
+
+    def wrap_branch_ops(self, op_codes, build_func):
+        """
+        Replace the branch ops in the opcode dict with build_func(get_ea, instr_func):
+        The returned op function calls the addressing and the branch instruction
+        method directly, so the check doesn't add a call to the branch ops.
+
+        The ops are not replaced, if the instructions are traced: The trace
+        must see every op, so the loops are not fast-forwarded.
+        """
+        if self.op_collection.instruction_class is not PrepagedInstructions:
+            return
+
+        for op_code in op_codes:
+            if MC6809OP_DATA_DICT[op_code]["addr_mode"] == RELATIVE:
+                get_ea = self.get_ea_relative
+            else:
+                get_ea = self.get_ea_relative_word
+            instr_func = self.op_collection.instr_func_dict[op_code]
+            cycles = self.opcode_dict[op_code][0]
+            self.opcode_dict[op_code] = (cycles, build_func(get_ea, instr_func))
+
+    def burst_run(self):
+        """
+        Run CPU and call the cycle events after the op that reached the deadline,
+        because a loop fast-forward may happen at every op.
+        """
+        # https://wiki.python.org/moin/PythonSpeed/PerformanceTips#Avoiding_dots...
+        get_and_call_next_op = self.get_and_call_next_op
+        scheduler = self.scheduler
+        inner_burst_op_count = self.inner_burst_op_count
+
+        self.reset_debug_hit()
+        try:
+            for __ in range(self.outer_burst_op_count):
+                for __ in range(inner_burst_op_count):
+                    get_and_call_next_op()
+                    if self.cycles >= scheduler.next_deadline:
+                        scheduler.run_due(self.cycles)
+        except DebugStop:
+            pass  # breakpoint/watchpoint hit: see self.debug_hit
+
+
+class IdleLoopMixin(FastForwardMixin):
+    max_idle_loop_bytes = 16  # Max. size of a idle loop incl. the branch op
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_idle_loops()
+
+    def init_clone(self, origin):
+        super().init_clone(origin)
+        self._init_idle_loops()
+
+    def _init_idle_loops(self):
+        self._idle_loop_state = None  # ((branch address, deadline, registers), cycles) of the last backward branch
+        self._idle_loop_bodies = {}  # (start, branch address) -> loop bytes of a idle loop body
+        self._no_idle_loops = set()  # branch addresses of the loops, that are no idle loops
+        self.memory.add_load_callback(self.invalidate_idle_loops)
+        self.wrap_branch_ops(IDLE_LOOP_BRANCH_OPCODES, self._build_idle_branch)
+
+    def _build_idle_branch(self, get_ea, instr_func):
+        cpu = self
+        program_counter = self.program_counter
+        max_idle_loop_bytes = self.max_idle_loop_bytes
+        no_idle_loops = self._no_idle_loops
+
+        def idle_branch(opcode):
+            instr_func(opcode, get_ea())
+            branch_address = cpu.last_op_address
+            if 0 <= branch_address - program_counter.value < max_idle_loop_bytes:
+                # Backward branch taken
+                if branch_address in no_idle_loops:
+                    cpu._idle_loop_state = None  # Another loop was executed
+                else:
+                    cpu.check_idle_loop(program_counter.value, branch_address)
+
+        return idle_branch
+
+    def invalidate_idle_loops(self, start, end):
+        """
+        Inspect the loops with code between start and end address (inclusive) again.
+
+        Called on load(), not on the write ops of the CPU: A watched code page
+        would slow down all op fetches. A loop, that the CPU changed into a idle
+        loop, is just not fast-forwarded. The bytes of a idle loop body are
+        compared before every fast-forward.
+        """
+        self._no_idle_loops.difference_update([
+            branch_address for branch_address in self._no_idle_loops
+            if start - 3 <= branch_address < end + self.max_idle_loop_bytes  # incl. a long branch
+        ])
+
+    def _get_idle_loop_body(self, start, branch_address):
+        key = (start, branch_address)
+        end = min(branch_address + 4, 0x10000)  # incl. a long branch
+        body = self._idle_loop_bodies.get(key)
+        if body is not None and body == self.memory.peek_range(start, end):
+            return body
+
+        try:
+            is_idle = is_idle_loop_body(self.memory.buffer, start, branch_address)
+        except IndexError:
+            is_idle = False  # loop at the end of the address range
+        if not is_idle:
+            # Skipped by the branch ops from now on, see: invalidate_idle_loops()
+            self._no_idle_loops.add(branch_address)
+            self._idle_loop_bodies.pop(key, None)
+            return None
+
+        body = bytes(self.memory.peek_range(start, end))
+        self._idle_loop_bodies[key] = body
+        return body
+
+    def check_idle_loop(self, start, branch_address):
+        if (start, branch_address) not in self._idle_loop_bodies:
+            if self._get_idle_loop_body(start, branch_address) is None:
+                self._idle_loop_state = None
+                return  # No idle loop: Inspected only one time
+
+        deadline = self.scheduler.next_deadline
+        state = (
+            branch_address, deadline,  # A changed deadline means: events were called
+            self.accu_a.value, self.accu_b.value, self.direct_page.value, self.get_cc_value(),
+            self.index_x.value, self.index_y.value, self.user_stack_pointer.value, self.system_stack_pointer.value,
+        )
+        cycles = self.cycles
+        last_state = self._idle_loop_state
+        self._idle_loop_state = (state, cycles)
+        if last_state is None or last_state[0] != state:
+            return
+
+        if deadline == NO_DEADLINE or self._get_idle_loop_body(start, branch_address) is None:
+            return
+
+        # Same state after one loop iteration: Fast-forward all iterations before the deadline
+        period = cycles - last_state[1]
+        skip_count = (deadline - cycles - 1) // period
+        if skip_count > 0:
+            skipped_cycles = skip_count * period
+            self.cycles += skipped_cycles
+            self.skipped_cycles += skipped_cycles
+            self._idle_loop_state = (state, self.cycles)
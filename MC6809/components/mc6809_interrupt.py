@@ -22,11 +22,155 @@
 
 
 from MC6809.components.cpu_utils.instruction_caller import opcode
+from MC6809.components.mc6809_scheduler import NO_DEADLINE
+
+
+# The CPU waits for an interrupt, after a:
+WAIT_SYNC = "SYNC"
+WAIT_CWAI = "CWAI"
+
+# Bits of the interrupt lines:
+IRQ_LINE = 0x01
+FIRQ_LINE = 0x02
+NMI_LINE = 0x04
+
+# CC bits that mask the interrupts:
+MASK_IRQ = 0x10  # I
+MASK_IRQ_FIRQ = 0x50  # I and F
 
 
 class InterruptMixin:
+    """
+    Interrupt lines: IRQ and FIRQ are level triggered, NMI is edge triggered.
+
+    'interrupt_pending' is the combination of the asserted lines and the
+    I/F mask bits. It's updated only if a line or the mask bits (set_cc())
+    changes, so the dispatch needs one check per instruction.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.interrupt_lines = 0  # Asserted IRQ_LINE/FIRQ_LINE and the latched NMI_LINE
+        self.interrupt_pending = 0  # Lines that will be serviced before the next instruction
+        self.wait_state = None  # None, WAIT_SYNC or WAIT_CWAI
+        self._nmi_line = False
+        super().__init__(*args, **kwargs)
+
+    # ---- Interrupt lines ----
+
+    # Called with the name of the line function on every call from the periphery,
+    # e.g.: line_recorder("assert_irq"), see: InputRecorder
+    line_recorder = None
+
+    def assert_irq(self):
+        if self.line_recorder is not None:
+            self.line_recorder("assert_irq")
+        self.interrupt_lines |= IRQ_LINE
+        self.update_interrupts()
+
+    def release_irq(self):
+        if self.line_recorder is not None:
+            self.line_recorder("release_irq")
+        self.interrupt_lines &= ~IRQ_LINE
+        self.update_interrupts()
+
+    def assert_firq(self):
+        if self.line_recorder is not None:
+            self.line_recorder("assert_firq")
+        self.interrupt_lines |= FIRQ_LINE
+        self.update_interrupts()
+
+    def release_firq(self):
+        if self.line_recorder is not None:
+            self.line_recorder("release_firq")
+        self.interrupt_lines &= ~FIRQ_LINE
+        self.update_interrupts()
+
+    def assert_nmi(self):
+        if self.line_recorder is not None:
+            self.line_recorder("assert_nmi")
+        if not self._nmi_line:
+            self._nmi_line = True
+            self.interrupt_lines |= NMI_LINE  # Latch the edge, until the NMI is serviced
+            self.update_interrupts()
+
+    def release_nmi(self):
+        if self.line_recorder is not None:
+            self.line_recorder("release_nmi")
+        self._nmi_line = False
+
+    def update_interrupts(self):
+        """
+        Must be called after the lines or the I/F mask bits are changed
+        """
+        lines = self.interrupt_lines
+        if self.wait_state == WAIT_SYNC:
+            self.interrupt_pending = lines  # Also a masked interrupt ends SYNC
+            return
 
-    # ---- Not Implemented, yet. ----
+        if self.I:
+            lines &= ~IRQ_LINE
+        if self.F:
+            lines &= ~FIRQ_LINE
+        self.interrupt_pending = lines
+
+    def service_interrupts(self):
+        """
+        Called before the next instruction, if a interrupt is pending
+        """
+        if self.wait_state == WAIT_SYNC:
+            # A masked interrupt continues with the next instruction
+            self.wait_state = None
+            self.program_counter.set(self.program_counter.value + 1)
+            self.update_interrupts()
+
+        pending = self.interrupt_pending
+        if pending & NMI_LINE:
+            self.interrupt_lines &= ~NMI_LINE
+            self.enter_interrupt(self.NMI_VECTOR, entire=True, mask=MASK_IRQ_FIRQ)
+        elif pending & FIRQ_LINE:
+            self.enter_interrupt(self.FIRQ_VECTOR, entire=False, mask=MASK_IRQ_FIRQ)
+        elif pending & IRQ_LINE:
+            self.enter_interrupt(self.IRQ_VECTOR, entire=True, mask=MASK_IRQ)
+
+    def enter_interrupt(self, vector, entire, mask):
+        """
+        Push the registers, set the 'mask' bits in CC and jump to the address in 'vector'.
+        Used for the hardware and the software interrupts.
+        """
+        if self.wait_state == WAIT_CWAI:
+            self.wait_state = None  # CWAI has pushed the entire state
+        elif entire:
+            self.E = 1
+            self.push_irq_registers()
+        else:
+            self.E = 0
+            self.push_firq_registers()
+
+        self.set_cc(self.get_cc_value() | mask)
+
+        ea = self.memory.read_word(vector)
+        # log.critical("$%04x *** interrupt, set PC to $%04x\t%s" % (
+        #     self.program_counter.value, ea, self.get_cc_info()
+        # ))
+        self.program_counter.set(ea)
+
+    # ---- Wait for interrupt ----
+
+    def wait_for_interrupt(self):
+        """
+        Called from the SYNC/CWAI op: Execute the op again until an interrupt
+        ends the wait state. No other instructions are executed in between:
+        The CPU cycles jump to the next deadline of the cycle scheduler and
+        the due events are called, which may assert a interrupt line.
+        """
+        self.program_counter.set(self.last_op_address)
+        if self.interrupt_pending:
+            return  # Will be serviced before the next instruction
+
+        deadline = self.scheduler.next_deadline
+        if deadline < NO_DEADLINE:
+            self.cycles = max(self.cycles, deadline)
+            self.scheduler.run_due(self.cycles)
 
     @opcode(  # AND condition code register, then wait for interrupt
         0x3c,  # CWAI (immediate)
@@ -52,8 +196,15 @@ class InterruptMixin:
 
         CC bits "HNZVC": ddddd
         """
-#        log.error("$%x CWAI not implemented, yet!", opcode)
-        # Update CC bits: ddddd
+        if self.wait_state is None:
+            self.set_cc(self.get_cc_value() & m)
+            self.E = 1
+            self.push_irq_registers()  # The interrupt needs no push
+            self.wait_state = WAIT_CWAI
+            self.update_interrupts()
+        self.wait_for_interrupt()
+
+    # ---- Not Implemented, yet. ----
 
     @opcode(  # Undocumented opcode!
         0x3e,  # RESET (inherent)
@@ -75,7 +226,29 @@ class InterruptMixin:
     irq_enabled = False
 
     def irq(self):
-        if not self.irq_enabled or self.I == 1:
+        """
+        Enter the IRQ handler now, if irq_enabled and the interrupt is not masked:
+        The registers are pushed depending on the E flag and CC is not changed.
+
+        In a SYNC/CWAI wait state it's a short pulse on the IRQ line, that ends
+        the wait state. New periphery should use assert_irq() and release_irq().
+        """
+        if not self.irq_enabled:
+            return
+
+        if self.line_recorder is not None:
+            self.line_recorder("irq")
+
+        if self.wait_state is not None:
+            self.interrupt_lines |= IRQ_LINE
+            self.update_interrupts()
+            if self.interrupt_pending:
+                self.service_interrupts()
+            self.interrupt_lines &= ~IRQ_LINE
+            self.update_interrupts()
+            return
+
+        if self.I == 1:
             # log.critical("$%04x *** IRQ, ignore!\t%s" % (
             #     self.program_counter.value, self.get_cc_info()
             # ))
@@ -170,12 +343,12 @@ class InterruptMixin:
 
         CC bits "HNZVC": -----
         """
-        raise NotImplementedError(f"${opcode:x} SWI")
+        self.enter_interrupt(self.SWI_VECTOR, entire=True, mask=MASK_IRQ_FIRQ)
 
     @opcode(  # Software interrupt (absolute indirect)
         0x103f,  # SWI2 (inherent)
     )
-    def instruction_SWI2(self, opcode, ea, m):
+    def instruction_SWI2(self, opcode):
         """
         All of the processor registers are pushed onto the hardware stack (with
         the exception of the hardware stack pointer itself), and control is
@@ -187,12 +360,12 @@ class InterruptMixin:
 
         CC bits "HNZVC": -----
         """
-        raise NotImplementedError(f"${opcode:x} SWI2")
+        self.enter_interrupt(self.SWI2_VECTOR, entire=True, mask=0)
 
     @opcode(  # Software interrupt (absolute indirect)
         0x113f,  # SWI3 (inherent)
     )
-    def instruction_SWI3(self, opcode, ea, m):
+    def instruction_SWI3(self, opcode):
         """
         All of the processor registers are pushed onto the hardware stack (with
         the exception of the hardware stack pointer itself), and control is
@@ -203,7 +376,7 @@ class InterruptMixin:
 
         CC bits "HNZVC": -----
         """
-        raise NotImplementedError(f"${opcode:x} SWI3")
+        self.enter_interrupt(self.SWI3_VECTOR, entire=True, mask=0)
 
     @opcode(  # Synchronize with interrupt line
         0x13,  # SYNC (inherent)
@@ -218,4 +391,7 @@ class InterruptMixin:
 
         CC bits "HNZVC": -----
         """
-        raise NotImplementedError(f"${opcode:x} SYNC")
+        if self.wait_state is None:
+            self.wait_state = WAIT_SYNC
+            self.update_interrupts()
+        self.wait_for_interrupt()
@@ -400,7 +400,6 @@ class OpsBranchesMixin:
 
         CC bits "HNZVC": -----
         """
-        pass
 
     @opcode(  # Branch if valid twos complement result
         0x28,  # BVC (relative)
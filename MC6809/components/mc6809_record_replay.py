@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Deterministic record and replay of the external inputs.
+
+    The CPU is deterministic: All timing is counted in CPU cycles and the
+    cycle events are called at fixed instruction boundaries, independent
+    of a speed limit. So a run depends only on the start state and the
+    values that come from the periphery:
+
+        * the results of the read callbacks and read/write middlewares
+        * the interrupt line changes (assert_irq(), irq(), ...)
+
+    The InputRecorder writes a start save state and these values with
+    their CPU cycles into a compact binary log. The InputReplayer runs
+    it again at full speed, without the periphery: The callbacks and
+    middlewares are replaced by functions that return the recorded
+    values, the interrupt line changes are cycle events.
+
+    Interrupt lines changed in a callback are replayed at the next
+    instruction boundary, that's the same point at which the CPU would
+    see the change. Line changes from other threads are not deterministic,
+    use a cycle event for them.
+
+    The interrupt line functions report their calls via cpu.line_recorder,
+    so also a bound method like 'cpu.assert_irq', that the periphery stored
+    before the recording started, is recorded.
+
+    usage e.g.:
+        recorder = InputRecorder(cpu, fp)
+        cpu.run_cycles(...)
+        recorder.stop()
+
+        replayer = InputReplayer(fp, cfg)
+        cpu = replayer.run()
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import io
+import logging
+import struct
+
+from MC6809.components.cpu6809 import CPU
+
+
+log = logging.getLogger("MC6809")
+
+
+MAGIC = b"MC6809RR"
+VERSION = 1
+
+HEADER = struct.Struct(">8sHI")  # magic, version, size of the start save state
+COUNT = struct.Struct(">I")
+RECORD = struct.Struct(">BQHH")  # kind, CPU cycles, address, value
+
+# Record kinds of the memory handlers:
+READ_BYTE_CALLBACK = 1
+READ_WORD_CALLBACK = 2
+READ_BYTE_MIDDLEWARE = 3
+WRITE_BYTE_MIDDLEWARE = 4
+WRITE_WORD_MIDDLEWARE = 5
+
+# memory handler dict name -> record kind (None: not recorded, the periphery gets the value)
+MEMORY_HANDLERS = {
+    "_read_byte_callbacks": READ_BYTE_CALLBACK,
+    "_read_word_callbacks": READ_WORD_CALLBACK,
+    "_read_byte_middleware": READ_BYTE_MIDDLEWARE,
+    "_write_byte_middleware": WRITE_BYTE_MIDDLEWARE,
+    "_write_word_middleware": WRITE_WORD_MIDDLEWARE,
+    "_write_byte_callbacks": None,
+    "_write_word_callbacks": None,
+}
+
+# Record kinds of the interrupt line functions, see: InterruptMixin.line_recorder
+INTERRUPT_LINE_FUNCS = {
+    16: "assert_irq",
+    17: "release_irq",
+    18: "assert_firq",
+    19: "release_firq",
+    20: "assert_nmi",
+    21: "release_nmi",
+    22: "irq",
+}
+
+INTERRUPT_LINE_KINDS = {name: kind for kind, name in INTERRUPT_LINE_FUNCS.items()}
+
+END = 255  # The end of the recording
+
+FLUSH_SIZE = 64 * 1024  # Write the records in chunks of this size
+
+
+class ReplayError(Exception):
+    """
+    The replayed run is not the same as the recorded one
+    """
+
+
+class InputRecorder:
+    """
+    Record all external inputs of the CPU, until stop() is called.
+    Memory handlers that are added after the start are not recorded.
+    """
+
+    def __init__(self, cpu, fp):
+        self.cpu = cpu
+        self.fp = fp
+        self._buffer = bytearray()
+
+        state = io.BytesIO()
+        cpu.save_state(state)
+        state = state.getvalue()
+        fp.write(HEADER.pack(MAGIC, VERSION, len(state)))
+        fp.write(state)
+
+        cpu.release_memory_handlers()
+        memory = cpu.memory
+        self._origin_handlers = {}
+        for name, kind in MEMORY_HANDLERS.items():
+            handlers = getattr(memory, name)
+            self._origin_handlers[name] = handlers.copy()
+            fp.write(COUNT.pack(len(handlers)))
+            fp.write(struct.pack(f">{len(handlers):d}H", *handlers))
+            if kind is not None:
+                self._wrap_handlers(handlers, kind)
+
+        cpu.line_recorder = self._record_line_func
+
+    def _add_record(self, kind, address, value):
+        self._buffer += RECORD.pack(kind, self.cpu.cycles, address, value)
+        if len(self._buffer) >= FLUSH_SIZE:
+            self.flush()
+
+    def flush(self):
+        self.fp.write(self._buffer)
+        self._buffer.clear()
+
+    def _wrap_handlers(self, handlers, kind):
+        wrappers = {}  # origin func -> wrapper: Most handlers are used for many addresses
+        for address, func in handlers.items():
+            try:
+                handlers[address] = wrappers[func]
+            except KeyError:
+                handlers[address] = wrappers[func] = self._build_handler(func, kind)
+
+    def _build_handler(self, func, kind):
+        add_record = self._add_record
+
+        if kind in (READ_BYTE_CALLBACK, READ_WORD_CALLBACK):
+            def recorded_handler(cycles, last_op_address, address):
+                value = func(cycles, last_op_address, address)
+                add_record(kind, address, value)
+                return value
+        else:
+            def recorded_handler(cycles, last_op_address, address, value):
+                value = func(cycles, last_op_address, address, value)
+                add_record(kind, address, value)
+                return value
+
+        return recorded_handler
+
+    def _record_line_func(self, name):
+        self._add_record(INTERRUPT_LINE_KINDS[name], 0, 0)
+
+    def stop(self):
+        """
+        Write the end of the recording and restore the memory handlers
+        """
+        cpu = self.cpu
+        self._add_record(END, 0, 0)
+        self.flush()
+
+        cpu.release_memory_handlers()
+        for name, handlers in self._origin_handlers.items():
+            getattr(cpu.memory, name).update(handlers)
+        del cpu.line_recorder
+
+
+class InputReplayer:
+    """
+    Replay a recording from InputRecorder without the periphery.
+    The cfg must have the same ROMs as the recorded machine.
+    """
+
+    def __init__(self, fp, cfg, cpu_class=CPU):
+        magic, version, state_size = HEADER.unpack(self._read(fp, HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"No MC6809 input recording: {magic!r}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported input recording version {version:d} (supported: {VERSION:d})")
+
+        self.cpu = cpu = cpu_class.load_state(io.BytesIO(self._read(fp, state_size)), cfg)
+
+        memory = cpu.memory
+        memory.remove_handlers()
+        for name, kind in MEMORY_HANDLERS.items():
+            count, = COUNT.unpack(self._read(fp, COUNT.size))
+            addresses = struct.unpack(f">{count:d}H", self._read(fp, count * 2))
+            handler = self._build_handler(kind)
+            handlers = getattr(memory, name)
+            for address in addresses:
+                memory._map_address_range(handlers, handler, address)
+
+        self._records = []  # value records of the memory handlers
+        self._line_records = []  # (cycles, kind) of the interrupt line changes
+        self.end_cycles = None
+        for kind, cycles, address, value in RECORD.iter_unpack(self._read(fp, None)):
+            if kind in INTERRUPT_LINE_FUNCS:
+                self._line_records.append((cycles, kind))
+            elif kind == END:
+                self.end_cycles = cycles
+            else:
+                self._records.append((kind, cycles, address, value))
+        if self.end_cycles is None:
+            raise ValueError("Input recording is truncated")
+
+        self._records.reverse()  # pop() the next record
+        self._line_records.reverse()
+        self._line_event = None
+        self._schedule_next_line_record()
+
+    def _read(self, fp, size):
+        if size is None:
+            data = fp.read()
+            if len(data) % RECORD.size:
+                raise ValueError("Input recording is truncated")
+        else:
+            data = fp.read(size)
+            if len(data) != size:
+                raise ValueError("Input recording is truncated")
+        return data
+
+    def _next_value(self, kind, cycles, address):
+        try:
+            record = self._records.pop()
+        except IndexError:
+            raise ReplayError(f"${address:04x} accessed at cycle {cycles:d} after the end of the recording")
+        if record[:3] != (kind, cycles, address):
+            raise ReplayError(
+                f"Replay diverged at cycle {cycles:d}: ${address:04x} accessed (kind {kind:d}),"
+                f" recorded: ${record[2]:04x} at cycle {record[1]:d} (kind {record[0]:d})"
+            )
+        return record[3]
+
+    def _build_handler(self, kind):
+        next_value = self._next_value
+
+        if kind is None:
+            def replay_handler(cycles, last_op_address, address, value):
+                pass  # The write went to the periphery
+        elif kind in (READ_BYTE_CALLBACK, READ_WORD_CALLBACK):
+            def replay_handler(cycles, last_op_address, address):
+                return next_value(kind, cycles, address)
+        else:
+            def replay_handler(cycles, last_op_address, address, value):
+                return next_value(kind, cycles, address)
+
+        return replay_handler
+
+    def _schedule_next_line_record(self):
+        if self._line_records:
+            deadline = self._line_records[-1][0]
+            self._line_event = self.cpu.scheduler.add_event(deadline, self._replay_line_records)
+
+    def _replay_line_records(self, cycles):
+        line_records = self._line_records
+        while line_records and line_records[-1][0] <= cycles:
+            __, kind = line_records.pop()
+            getattr(self.cpu, INTERRUPT_LINE_FUNCS[kind])()
+        self._schedule_next_line_record()
+
+    def run(self):
+        """
+        Run the CPU up to the end of the recording and returns it.
+        Raise ReplayError if the run is not the same as the recorded one.
+        """
+        cpu = self.cpu
+        cpu.run_until(cycles=self.end_cycles)
+        if cpu.cycles != self.end_cycles:
+            raise ReplayError(f"Replay ends at cycle {cpu.cycles:d}, recorded: {self.end_cycles:d}")
+        if self._records:
+            _, cycles, address, __ = self._records[-1]
+            raise ReplayError(f"Replay ended before the access of ${address:04x} at cycle {cycles:d}")
+        return cpu
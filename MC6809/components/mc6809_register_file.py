@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Store all registers as plain integers in one RegisterFile.
+
+    This is the register storage of the fast engine (see: mc6809_fast_engine.py):
+    The generated per-opcode functions work on the integers. With the normal
+    op methods, that get the register objects as argument, it's not faster,
+    so there is no CPU class with only the register file: Use CPUFast.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import logging
+
+from MC6809.components.cpu_utils.MC6809_registers import (
+    ConcatenatedAccumulatorView,
+    RegisterFile,
+    register_view,
+)
+from MC6809.components.MC6809data.MC6809_op_data import (
+    REG_A,
+    REG_B,
+    REG_D,
+    REG_DP,
+    REG_PC,
+    REG_S,
+    REG_U,
+    REG_X,
+    REG_Y,
+)
+from MC6809.utils.byte_word_values import signed8
+
+
+log = logging.getLogger("MC6809")
+
+
+class RegisterFileMixin:
+    """
+    Hold the registers in 'self.registers' as plain integers.
+
+    The register attributes (self.accu_a, self.program_counter etc.) are
+    thin views to the register file, so register_str2object, TFR, EXG,
+    get_state() and set_state() work as before. The PC fetch and the simple
+    addressing modes use the integers, the ops use the views.
+    """
+
+    def create_registers(self):
+        self.registers = registers = RegisterFile()
+
+        self.index_x = register_view(REG_X, registers, "x", width=16)
+        self.index_y = register_view(REG_Y, registers, "y", width=16)
+        self.user_stack_pointer = register_view(REG_U, registers, "u", width=16)
+        self.system_stack_pointer = register_view(REG_S, registers, "s", width=16)
+        self.program_counter = register_view(REG_PC, registers, "pc", width=16)
+        self.accu_a = register_view(REG_A, registers, "a", width=8)
+        self.accu_b = register_view(REG_B, registers, "b", width=8)
+        self.accu_d = ConcatenatedAccumulatorView(REG_D, registers)
+        self.direct_page = register_view(REG_DP, registers, "dp", width=8)
+
+    ####
+
+    def read_pc_byte(self):
+        registers = self.registers
+        op_addr = registers.pc
+        m = self.memory.read_byte(op_addr)
+        registers.pc = (op_addr + 1) & 0xffff
+        return op_addr, m
+
+    def read_pc_word(self):
+        registers = self.registers
+        op_addr = registers.pc
+        m = self.memory.read_word(op_addr)
+        registers.pc = (op_addr + 2) & 0xffff
+        return op_addr, m
+
+    def get_m_immediate(self):
+        registers = self.registers
+        op_addr = registers.pc
+        m = self.memory.read_byte(op_addr)
+        registers.pc = (op_addr + 1) & 0xffff
+        return m
+
+    def get_m_immediate_word(self):
+        registers = self.registers
+        op_addr = registers.pc
+        m = self.memory.read_word(op_addr)
+        registers.pc = (op_addr + 2) & 0xffff
+        return m
+
+    def get_ea_direct(self):
+        registers = self.registers
+        op_addr = registers.pc
+        m = self.memory.read_byte(op_addr)
+        registers.pc = (op_addr + 1) & 0xffff
+        return registers.dp << 8 | m
+
+    def get_ea_extended(self):
+        registers = self.registers
+        op_addr = registers.pc
+        ea = self.memory.read_word(op_addr)
+        registers.pc = (op_addr + 2) & 0xffff
+        return ea
+
+    def get_ea_relative(self):
+        registers = self.registers
+        op_addr = registers.pc
+        x = signed8(self.memory.read_byte(op_addr))
+        registers.pc = pc = (op_addr + 1) & 0xffff
+        return pc + x
+
+    def get_ea_relative_word(self):
+        registers = self.registers
+        op_addr = registers.pc
+        x = self.memory.read_word(op_addr)
+        registers.pc = pc = (op_addr + 2) & 0xffff
+        return pc + x
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Reverse execution via a bounded undo log.
+
+    Before every instruction, the registers are stored into a ring buffer
+    and every memory write stores the overwritten byte into a second ring
+    buffer. All buffers are preallocated arrays, so the log creates no
+    Python objects per instruction.
+
+    step_back() restores the registers and the overwritten bytes of the
+    last instructions, run_back_to_last_write() steps back until the
+    instruction that wrote to a address is undone.
+
+    The state of the periphery (incl. the IRQ/FIRQ lines) and the cycle
+    events are not undone.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import array
+import logging
+import types
+
+from MC6809.components.mc6809_interrupt import NMI_LINE, WAIT_CWAI, WAIT_SYNC
+
+
+log = logging.getLogger("MC6809")
+
+
+WAIT_STATES = (None, WAIT_SYNC, WAIT_CWAI)  # index is the stored value
+
+
+class ReverseMixin:
+    undo_depth = 100000  # Max. number of instructions that can be undone
+    undo_writes_per_step = 4  # Average memory writes per instruction in the write log
+
+    def __init__(self, memory, *args, **kwargs):
+        self._init_undo_log(memory)
+        super().__init__(memory, *args, **kwargs)
+
+    def init_clone(self, origin):
+        self._init_undo_log(self.memory)  # The clone can't step back before its creation
+        super().init_clone(origin)
+
+    def _init_undo_log(self, memory):
+        # Log all writes, also from the opcode functions, that bind the memory methods:
+        self._origin_write_byte = types.MethodType(type(memory).write_byte, memory)
+        self._origin_write_word = types.MethodType(type(memory).write_word, memory)
+        memory.write_byte = self._logged_write_byte
+        memory.write_word = self._logged_write_word
+
+        self.set_undo_depth(self.undo_depth)
+
+    def set_undo_depth(self, depth, writes_per_step=None):
+        """
+        Allocate the undo log for 'depth' instructions. The log will be cleared.
+        """
+        if writes_per_step is None:
+            writes_per_step = self.undo_writes_per_step
+        self.undo_depth = depth
+        self.undo_writes_per_step = writes_per_step
+
+        # Registers before the instruction: X, Y, U, S, PC / A, B, DP, CC, wait state, latched NMI
+        self._undo_words = array.array("H", bytes(depth * 5 * 2))
+        self._undo_bytes = bytearray(depth * 6)
+        self._undo_cycles = array.array("Q", bytes(depth * 8))
+        self._undo_write_pos = array.array("Q", bytes(depth * 8))  # write count before the instruction
+        self._step_count = 0  # all logged instructions
+
+        self._write_size = depth * writes_per_step
+        self._write_addresses = array.array("q", bytes(self._write_size * 8))
+        self._write_values = bytearray(self._write_size)
+        self._write_count = 0  # all logged writes
+
+    # ---- log ----
+
+    def _log_write(self, address):
+        index = self._write_count % self._write_size
+        try:
+            self._write_values[index] = self.memory._mem[address]
+        except IndexError:
+            return  # outside of the memory: nothing will be changed
+        self._write_addresses[index] = address
+        self._write_count += 1
+
+    def _logged_write_byte(self, address, value):
+        self._log_write(address)
+        self._origin_write_byte(address, value)
+
+    def _logged_write_word(self, address, word):
+        self._log_write(address)
+        self._log_write(address + 1)
+        self._origin_write_word(address, word)
+
+    def get_and_call_next_op(self):
+        step = self._step_count % self.undo_depth
+        words = self._undo_words
+        index = step * 5
+        words[index] = self.index_x.value
+        words[index + 1] = self.index_y.value
+        words[index + 2] = self.user_stack_pointer.value
+        words[index + 3] = self.system_stack_pointer.value
+        words[index + 4] = self.program_counter.value
+        undo_bytes = self._undo_bytes
+        index = step * 6
+        undo_bytes[index] = self.accu_a.value
+        undo_bytes[index + 1] = self.accu_b.value
+        undo_bytes[index + 2] = self.direct_page.value
+        undo_bytes[index + 3] = self.get_cc_value()
+        undo_bytes[index + 4] = WAIT_STATES.index(self.wait_state)
+        undo_bytes[index + 5] = self.interrupt_lines & NMI_LINE
+        self._undo_cycles[step] = self.cycles
+        self._undo_write_pos[step] = self._write_count
+        self._step_count += 1
+
+        super().get_and_call_next_op()
+
+    # ---- undo ----
+
+    @property
+    def undo_steps(self):
+        """
+        Number of instructions that can be undone
+        """
+        # The overwritten bytes of the oldest instructions may be no longer in the write log.
+        # The write positions are ascending, so search the oldest complete instruction:
+        oldest_write = self._write_count - self._write_size
+        low, high = 0, min(self._step_count, self.undo_depth)  # min. and max. steps
+        while low < high:
+            steps = (low + high + 1) // 2
+            if self._undo_write_pos[(self._step_count - steps) % self.undo_depth] >= oldest_write:
+                low = steps
+            else:
+                high = steps - 1
+        return low
+
+    def _undo_last_step(self):
+        self._step_count -= 1
+        step = self._step_count % self.undo_depth
+
+        mem = self.memory._mem
+        write_pos = self._undo_write_pos[step]
+        while self._write_count > write_pos:
+            self._write_count -= 1
+            index = self._write_count % self._write_size
+            mem[self._write_addresses[index]] = self._write_values[index]
+
+        index = step * 5
+        x, y, u, s, pc = self._undo_words[index:index + 5]
+        self.index_x.set(x)
+        self.index_y.set(y)
+        self.user_stack_pointer.set(u)
+        self.system_stack_pointer.set(s)
+        self.program_counter.set(pc)
+
+        index = step * 6
+        a, b, dp, cc, wait_state, nmi_latch = self._undo_bytes[index:index + 6]
+        self.accu_a.set(a)
+        self.accu_b.set(b)
+        self.direct_page.set(dp)
+        self.wait_state = WAIT_STATES[wait_state]
+        self.interrupt_lines = self.interrupt_lines & ~NMI_LINE | nmi_latch  # The lines belong to the periphery
+        self.set_cc(cc)  # updates the pending interrupts
+        self.cycles = self._undo_cycles[step]
+
+    def _last_step_writes(self, address):
+        write_pos = self._undo_write_pos[(self._step_count - 1) % self.undo_depth]
+        for count in range(write_pos, self._write_count):
+            if self._write_addresses[count % self._write_size] == address:
+                return True
+        return False
+
+    def step_back(self, count=1):
+        """
+        Undo the last 'count' instructions. Returns the number of undone instructions,
+        that's less than 'count' if the undo log is exhausted.
+        """
+        count = min(count, self.undo_steps)
+        for __ in range(count):
+            self._undo_last_step()
+        return count
+
+    def run_back_to_last_write(self, address):
+        """
+        Step back until the last instruction that wrote to 'address' is undone,
+        so the program counter is the address of this instruction.
+        Returns False (and changes nothing) if no write is in the undo log.
+        """
+        steps = self.undo_steps
+        if not steps:
+            return False
+
+        first_write_pos = self._undo_write_pos[(self._step_count - steps) % self.undo_depth]
+        for count in range(self._write_count - 1, first_write_pos - 1, -1):
+            if self._write_addresses[count % self._write_size] == address:
+                break
+        else:
+            return False
+
+        while not self._last_step_writes(address):
+            self._undo_last_step()
+        self._undo_last_step()
+        return True
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Statistical sampling of the CPU state into the binary trace format.
+
+    A full trace slows down the emulation, the sampler writes only one
+    record in a given period:
+
+        cycles      every N CPU cycles, via a periodic cycle event.
+                    Deterministic and time weighted, like a profiler.
+        interval    every T host seconds: A signal.setitimer() timer sets
+                    only a flag. The flag is checked by a periodic cycle
+                    event every 'check_cycles' CPU cycles.
+
+    So the sampler adds no costs per instruction in both modes. A sample
+    is the CPU state before the instruction at the record op address.
+    The samples can be read via "./cli.py trace-dump", e.g. with --profile
+
+    The timer mode uses SIGALRM and works only in the main thread on Unix.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import logging
+import signal
+
+
+log = logging.getLogger("MC6809")
+
+
+class InstructionSampler:
+    """
+    Write a sample record into the TraceWriter 'writer' every 'cycles' CPU cycles
+    or every 'interval' seconds (exactly one of both), until stop() is called.
+    """
+
+    check_cycles = 10000  # Check the timer flag every N CPU cycles
+
+    def __init__(self, cpu, writer, cycles=None, interval=None, check_cycles=None):
+        if (cycles is None) == (interval is None):
+            raise ValueError("InstructionSampler needs 'cycles' or 'interval'")
+        self.cpu = cpu
+        self.writer = writer
+        self.sample_count = 0
+        if check_cycles is not None:
+            self.check_cycles = check_cycles
+
+        self._timer_flag = False
+        self._timer_active = interval is not None
+        if cycles is not None:
+            self.event = cpu.add_cycle_event(cycles, self._sample, period=cycles)
+        else:
+            self._origin_signal_handler = signal.signal(signal.SIGALRM, self._timer_handler)
+            signal.setitimer(signal.ITIMER_REAL, interval, interval)
+            self.event = cpu.add_cycle_event(self.check_cycles, self._check_timer, period=self.check_cycles)
+
+    def _timer_handler(self, signum, frame):
+        self._timer_flag = True
+
+    def _check_timer(self, cycles):
+        if self._timer_flag:
+            self._timer_flag = False
+            self._sample(cycles)
+
+    def _sample(self, cycles):
+        cpu = self.cpu
+        mem = cpu.memory.buffer
+        op_address = cpu.program_counter.value
+        opcode = mem[op_address]
+        if opcode in (0x10, 0x11):  # PAGE 2 and PAGE 3 instructions
+            opcode = opcode << 8 | mem[(op_address + 1) & 0xffff]
+        self.writer.add_cpu_record(cpu, op_address, opcode)
+        self.sample_count += 1
+
+    def stop(self):
+        """
+        Stop the sampling. The writer must be closed by the caller.
+        """
+        self.cpu.scheduler.cancel(self.event)
+        if self._timer_active:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._origin_signal_handler)
+            self._timer_active = False
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Versioned binary save state format.
+
+    All values are Big-Endian:
+
+        header:
+            magic        8 Bytes  b"MC6809SS"
+            version      2 Bytes
+            flags        2 Bytes  FLAG_ZLIB: the body is zlib compressed
+            ROM hash    32 Bytes  Memory.rom_hash of the saved memory
+
+        body:
+            registers    X, Y, U, S, PC, A, B, DP, CC, last op address,
+                         cycles, wait state, interrupt lines, NMI line, IRQ enabled
+            page count   2 Bytes
+            pages        page number (1 Byte) + 256 Bytes data, for every
+                         page with a non-zero byte.
+
+    A state can only be loaded with the same ROM files. Cycle events are
+    callbacks of the machine, so they are not a part of the state.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import logging
+import struct
+import zlib
+
+from MC6809.components.mc6809_interrupt import WAIT_CWAI, WAIT_SYNC
+from MC6809.components.memory import PAGE_COUNT, PAGE_SHIFT
+
+
+log = logging.getLogger("MC6809")
+
+
+MAGIC = b"MC6809SS"
+VERSION = 1
+FLAG_ZLIB = 0x0001
+
+HEADER = struct.Struct(">8sHH32s")
+REGISTERS = struct.Struct(">HHHHHBBBBHQBBBB")
+PAGE_HEADER = struct.Struct(">H")
+
+PAGE_SIZE = 1 << PAGE_SHIFT
+ZERO_PAGE = bytes(PAGE_SIZE)
+
+WAIT_STATES = (None, WAIT_SYNC, WAIT_CWAI)  # index is the stored value
+
+
+def write_state(cpu, fp, compress=True):
+    """
+    Write the state of the CPU and the memory to the binary file object 'fp'
+    """
+    memory = cpu.memory
+    flags = FLAG_ZLIB if compress else 0
+    fp.write(HEADER.pack(MAGIC, VERSION, flags, memory.rom_hash))
+
+    if compress:
+        compressor = zlib.compressobj()
+
+        def write(data):
+            fp.write(compressor.compress(data))
+    else:
+        write = fp.write
+
+    write(REGISTERS.pack(
+        cpu.index_x.value, cpu.index_y.value,
+        cpu.user_stack_pointer.value, cpu.system_stack_pointer.value,
+        cpu.program_counter.value,
+        cpu.accu_a.value, cpu.accu_b.value,
+        cpu.direct_page.value, cpu.get_cc_value(),
+        cpu.last_op_address,
+        cpu.cycles,
+        WAIT_STATES.index(cpu.wait_state),
+        cpu.interrupt_lines, cpu._nmi_line, cpu.irq_enabled,
+    ))
+
+    data = memory.snapshot()
+    pages = [page for page in range(PAGE_COUNT) if data[page << PAGE_SHIFT:(page + 1) << PAGE_SHIFT] != ZERO_PAGE]
+    write(PAGE_HEADER.pack(len(pages)))
+    for page in pages:
+        write(bytes((page,)))
+        write(data[page << PAGE_SHIFT:(page + 1) << PAGE_SHIFT])
+
+    if compress:
+        fp.write(compressor.flush())
+
+
+def read_state(cpu, fp):
+    """
+    Set the CPU and the memory to the state from write_state()
+    Raise ValueError if the data is not a save state of the ROMs in the memory.
+    """
+    header = fp.read(HEADER.size)
+    if len(header) != HEADER.size:
+        raise ValueError("Save state is truncated")
+    magic, version, flags, rom_hash = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"No MC6809 save state: {magic!r}")
+    if version != VERSION:
+        raise ValueError(f"Unsupported save state version {version:d} (supported: {VERSION:d})")
+    if rom_hash != cpu.memory.rom_hash:
+        raise ValueError("Save state doesn't fit to the loaded ROMs")
+
+    body = fp.read()
+    if flags & FLAG_ZLIB:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as err:
+            raise ValueError(f"Save state is corrupt: {err}")
+
+    try:
+        (
+            x, y, u, s, pc, a, b, dp, cc, last_op_address, cycles,
+            wait_state, interrupt_lines, nmi_line, irq_enabled,
+        ) = REGISTERS.unpack_from(body, 0)
+        offset = REGISTERS.size
+        page_count, = PAGE_HEADER.unpack_from(body, offset)
+        offset += PAGE_HEADER.size
+        if len(body) != offset + page_count * (1 + PAGE_SIZE):
+            raise ValueError(f"Save state size {len(body):d} Bytes doesn't fit to {page_count:d} pages")
+
+        data = bytearray(cpu.memory.INTERNAL_SIZE)
+        for __ in range(page_count):
+            page = body[offset]
+            offset += 1
+            data[page << PAGE_SHIFT:(page + 1) << PAGE_SHIFT] = body[offset:offset + PAGE_SIZE]
+            offset += PAGE_SIZE
+    except struct.error:
+        raise ValueError("Save state is truncated")
+
+    cpu.index_x.set(x)
+    cpu.index_y.set(y)
+    cpu.user_stack_pointer.set(u)
+    cpu.system_stack_pointer.set(s)
+    cpu.program_counter.set(pc)
+    cpu.accu_a.set(a)
+    cpu.accu_b.set(b)
+    cpu.direct_page.set(dp)
+    cpu.last_op_address = last_op_address
+    cpu.cycles = cycles
+    cpu.wait_state = WAIT_STATES[wait_state]
+    cpu.interrupt_lines = interrupt_lines
+    cpu._nmi_line = bool(nmi_line)
+    cpu.irq_enabled = bool(irq_enabled)
+    cpu.set_cc(cc)  # updates the pending interrupts
+
+    cpu.memory.restore(data)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Cycle event scheduler: A heap of absolute CPU cycle deadlines.
+
+    The run loops only have to compare the CPU cycles with
+    'next_deadline' and call run_due() if it's reached.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import heapq
+import itertools
+import logging
+
+
+log = logging.getLogger("MC6809")
+
+
+NO_DEADLINE = float("inf")
+
+
+class CycleEvent:
+    """
+    A scheduled callback. Created by CycleScheduler.add_event()
+    """
+
+    __slots__ = ("_entry", "callback", "deadline", "period")
+
+    def __init__(self, callback, period=None):
+        self.callback = callback
+        self.period = period  # None -> one-shot event
+        self.deadline = None
+        self._entry = None  # heap entry, if the event is pending
+
+    @property
+    def pending(self):
+        return self._entry is not None
+
+    def __repr__(self):
+        return f"<CycleEvent {self.callback!r} deadline={self.deadline} period={self.period}>"
+
+
+class CycleScheduler:
+    """
+    Events are called with the current CPU cycles, at the first instruction
+    boundary at or after the deadline. Periodic events are pushed again
+    before the callback is called, so a callback can cancel or reschedule
+    its own event.
+
+    >>> scheduler = CycleScheduler()
+    >>> event = scheduler.add_event(100, lambda cycles: print("called at", cycles))
+    >>> scheduler.next_deadline
+    100
+    >>> scheduler.run_due(99)
+    >>> scheduler.run_due(102)
+    called at 102
+    >>> scheduler.next_deadline
+    inf
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()  # keep the insertion order for equal deadlines
+        self.next_deadline = NO_DEADLINE
+
+    def _push(self, event, deadline):
+        event.deadline = deadline
+        event._entry = entry = [deadline, next(self._counter), event]
+        heapq.heappush(self._heap, entry)
+
+    def _update_next_deadline(self):
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)  # remove canceled events
+        self.next_deadline = heap[0][0] if heap else NO_DEADLINE
+
+    def add_event(self, deadline, callback, period=None):
+        """
+        Call 'callback(cycles)' at the absolute CPU cycles 'deadline'
+        and then every 'period' cycles (if given)
+        """
+        if period is not None and period < 1:
+            raise ValueError(f"Event period must be >= 1 cycle, not: {period!r}")
+        event = CycleEvent(callback, period)
+        self._push(event, deadline)
+        self.next_deadline = min(self.next_deadline, deadline)
+        return event
+
+    def cancel(self, event):
+        entry = event._entry
+        if entry is not None:
+            entry[2] = None  # The heap entry will be removed lazy
+            event._entry = None
+            self._update_next_deadline()
+
+    def reschedule(self, event, deadline):
+        """
+        Move a pending or already fired event to a new absolute deadline
+        """
+        self.cancel(event)
+        self._push(event, deadline)
+        self.next_deadline = min(self.next_deadline, deadline)
+
+    def run_due(self, cycles):
+        """ Call all events with a deadline <= cycles """
+        heap = self._heap
+        while heap and heap[0][0] <= cycles:
+            deadline, __, event = heapq.heappop(heap)
+            if event is None:
+                continue  # canceled
+
+            event._entry = None
+            if event.period is not None:
+                self._push(event, deadline + event.period)
+
+            event.callback(cycles)
+
+        self._update_next_deadline()
+
+    def get_events(self):
+        """
+        Returns the pending events as (deadline, event) tuples in call order.
+        e.g.: to restore the schedule later via set_events()
+        """
+        return [(deadline, event) for deadline, __, event in sorted(self._heap) if event is not None]
+
+    def set_events(self, events):
+        """
+        Replace all pending events with the (deadline, event) tuples from get_events()
+        """
+        self.clear()
+        for deadline, event in events:
+            self._push(event, deadline)
+        self._update_next_deadline()
+
+    def clear(self):
+        for entry in self._heap:
+            if entry[2] is not None:
+                entry[2]._entry = None
+        self._heap.clear()
+        self.next_deadline = NO_DEADLINE
+
+    def __len__(self):
+        return sum(1 for entry in self._heap if entry[2] is not None)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Opcode dispatch via dense lookup tables.
+
+    The default CPUBase.call_instruction_func() looks up every opcode in
+    the opcode dict (with a KeyError fallback) and page 2/3 ops needs a
+    second lookup via instruction_PAGE(). This mixin use a 256 entry
+    function list and a parallel cycles array per opcode page instead.
+    The tables are build from the OpCollection, so it's still the only
+    place that decides which method handles which opcode.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import logging
+import sys
+
+
+log = logging.getLogger("MC6809")
+
+
+class TableDispatchMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_tables()
+
+    def init_clone(self, origin):
+        super().init_clone(origin)
+        self._init_tables()
+
+    def _init_tables(self):
+        self.opcode_tables = self.op_collection.get_opcode_tables(illegal_func=self.illegal_instruction)
+        self.opcode_funcs, self.opcode_cycles = self.opcode_tables[0x00]
+        self.page2_funcs, self.page2_cycles = self.opcode_tables[0x10]
+        self.page3_funcs, self.page3_cycles = self.opcode_tables[0x11]
+
+        # The PAGE ops are normal table entries, that dispatch via the page tables:
+        self.opcode_funcs[0x10] = self._build_page_dispatcher(0x10, self.page2_funcs, self.page2_cycles)
+        self.opcode_funcs[0x11] = self._build_page_dispatcher(0x11, self.page3_funcs, self.page3_cycles)
+
+        # Overwrite the method with a closure, so that burst_run() etc. will use it:
+        self.get_and_call_next_op = self._build_dispatcher()
+
+    def _build_dispatcher(self):
+        # https://wiki.python.org/moin/PythonSpeed/PerformanceTips#Avoiding_dots...
+        cpu = self
+        program_counter = self.program_counter
+        read_byte = self.memory.read_byte
+        opcode_funcs = self.opcode_funcs
+        opcode_cycles = self.opcode_cycles
+
+        def get_and_call_next_op():
+            if cpu.interrupt_pending:
+                cpu.service_interrupts()  # Runs like a instruction
+                return
+            op_address = program_counter.value
+            opcode = read_byte(op_address)
+            program_counter.value = op_address + 1
+            cpu.last_op_address = op_address
+            opcode_funcs[opcode](opcode)
+            cpu.cycles += opcode_cycles[opcode]
+
+        return get_and_call_next_op
+
+    def _build_page_dispatcher(self, page, page_funcs, page_cycles):
+        cpu = self
+        program_counter = self.program_counter
+        read_byte = self.memory.read_byte
+        page_opcode = page << 8
+
+        def call_paged_op(opcode):
+            """ call op from page 2 or 3 """
+            op_address = program_counter.value
+            opcode2 = read_byte(op_address)
+            program_counter.value = op_address + 1
+            page_funcs[opcode2](page_opcode | opcode2)
+            cpu.cycles += page_cycles[opcode2]
+
+        return call_paged_op
+
+    def call_instruction_func(self, op_address, opcode):
+        self.last_op_address = op_address
+        page, index = divmod(opcode, 256)
+        try:
+            funcs, cycles = self.opcode_tables[page]
+        except KeyError:
+            return self.illegal_instruction(opcode)
+
+        funcs[index](opcode)
+        self.cycles += cycles[index]
+
+    def set_dispatch_trap(self, trap_func):
+        backup = self.opcode_funcs[:]
+        self.opcode_funcs[:] = [trap_func] * len(backup)
+        return backup
+
+    def restore_dispatch(self, backup):
+        self.opcode_funcs[:] = backup
+
+    def replace_opcode_funcs(self, funcs):
+        # The PAGE entries of the first table are the page dispatchers, so don't replace them:
+        assert 0x10 not in funcs and 0x11 not in funcs, "Can't replace the PAGE ops"
+        first_funcs = self.opcode_funcs if self._dispatch_trap_backup is None else self._dispatch_trap_backup
+        opcode_dict = self.opcode_dict
+        for opcode, func in funcs.items():
+            cycles, __ = opcode_dict[opcode]
+            opcode_dict[opcode] = (cycles, func)
+            page, index = divmod(opcode, 256)
+            if page:
+                self.opcode_tables[page][0][index] = func
+            else:
+                first_funcs[index] = func
+
+    def illegal_instruction(self, opcode):
+        msg = f"${self.last_op_address:x} *** UNKNOWN OP ${opcode:x}"
+        log.error(msg)
+        sys.exit(msg)
@@ -69,6 +69,9 @@ class CPUThreadedStatusMixin:
             status_thread.deamon = True
             status_thread.start()
 
+    def init_clone(self, origin):
+        pass  # The clone has no status thread
+
 
 class CPUTypeAssertMixin:
     """
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Compact binary trace format.
+
+    Formatting a text line for every instruction is very slow and creates
+    huge outputs. The binary trace stores a fixed-width record per
+    instruction and the text is created only on reading, see:
+        ./cli.py trace-dump
+
+    All values are Big-Endian:
+
+        header:
+            magic        8 Bytes  b"MC6809TR"
+            version      2 Bytes
+            record size  2 Bytes
+
+        records:
+            op address, opcode (incl. the page 2/3 prefix), op length,
+            op bytes (5 Bytes), A, B, DP, CC, X, Y, U, S, PC, cycles,
+            ea, m, flags (FLAG_EA/FLAG_M: ea/m are used)
+
+    The registers are the values after the instruction. The cycles are
+    the CPU cycles without the base cycles of the instruction: They are
+    added by the dispatcher after the call.
+
+    The records are packed into a preallocated buffer. A full buffer is
+    written by a background thread, while the CPU fills the next buffer.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import collections
+import logging
+import queue
+import struct
+import threading
+
+from MC6809.components.MC6809data.MC6809_data_utils import MC6809OP_DATA_DICT, get_indexed_operand_bytes
+from MC6809.components.MC6809data.MC6809_op_data import INDEXED, INDEXED_WORD
+from MC6809.utils.humanize import cc_value2txt
+
+
+log = logging.getLogger("MC6809")
+
+
+MAGIC = b"MC6809TR"
+VERSION = 1
+
+HEADER = struct.Struct(">8sHH")  # magic, version, record size
+RECORD = struct.Struct(">HHB5sBBBBHHHHHQHHB")
+
+FLAG_EA = 0x01
+FLAG_M = 0x02
+
+MAX_OP_BYTES = 5
+
+OP_LENGTHS = {opcode: op_data["bytes"] for opcode, op_data in MC6809OP_DATA_DICT.items()}
+
+# The op length of these opcodes depends on the postbyte, see: get_indexed_operand_bytes()
+INDEXED_OPCODES = frozenset(
+    opcode for opcode, op_data in MC6809OP_DATA_DICT.items() if op_data["addr_mode"] in (INDEXED, INDEXED_WORD)
+)
+
+TraceRecord = collections.namedtuple("TraceRecord", (
+    "op_address", "opcode", "op_length", "op_bytes",
+    "a", "b", "dp", "cc", "x", "y", "u", "s", "pc",
+    "cycles", "ea", "m", "flags",
+))
+
+
+class TraceWriter:
+    """
+    Write trace records into 'fp' via a background thread.
+    The caller must call close() at the end, fp is not closed.
+    """
+
+    def __init__(self, fp, buffer_records=16 * 1024, buffer_count=4):
+        self.fp = fp
+        self._buffer_size = buffer_records * RECORD.size
+        self._free_buffers = queue.Queue()
+        for __ in range(buffer_count - 1):
+            self._free_buffers.put(bytearray(self._buffer_size))
+        self._full_buffers = queue.Queue()
+
+        self._buffer = bytearray(self._buffer_size)
+        self._offset = 0
+        self.record_count = 0
+        self.closed = False
+        self._error = None
+
+        fp.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self._thread = threading.Thread(target=self._write_buffers, name="MC6809-Trace-Writer", daemon=True)
+        self._thread.start()
+
+    def _write_buffers(self):
+        while True:
+            buffer, size = self._full_buffers.get()
+            if buffer is None:
+                return
+            try:
+                if self._error is None:
+                    self.fp.write(memoryview(buffer)[:size])
+            except OSError as err:
+                self._error = err  # re-raised in the CPU thread
+            self._free_buffers.put(buffer)
+
+    def _check_error(self):
+        if self._error is not None:
+            raise OSError(f"Writing the trace failed: {self._error}") from self._error
+
+    def add_record(self, *values):
+        """
+        Add one record, the values are the TraceRecord fields.
+        """
+        RECORD.pack_into(self._buffer, self._offset, *values)
+        self._offset += RECORD.size
+        if self._offset == self._buffer_size:
+            self.record_count += self._buffer_size // RECORD.size
+            self._full_buffers.put((self._buffer, self._offset))
+            self._buffer = self._free_buffers.get()  # blocks, if the writer is too slow
+            self._offset = 0
+            self._check_error()
+
+    def add_cpu_record(self, cpu, op_address, opcode, ea=0, m=0, flags=0):
+        """
+        Add a record with the current CPU registers
+        """
+        mem = cpu.memory.buffer
+        op_length = OP_LENGTHS.get(opcode, 1)  # e.g.: a sample at a illegal opcode
+        if opcode in INDEXED_OPCODES:
+            # The indexed postbyte is the last byte of the op data "bytes"
+            op_length += get_indexed_operand_bytes(mem[(op_address + op_length - 1) & 0xffff])
+        self.add_record(
+            op_address, opcode, op_length,
+            bytes(mem[op_address:op_address + MAX_OP_BYTES]),
+            cpu.accu_a.value, cpu.accu_b.value, cpu.direct_page.value, cpu.get_cc_value(),
+            cpu.index_x.value, cpu.index_y.value,
+            cpu.user_stack_pointer.value, cpu.system_stack_pointer.value,
+            cpu.program_counter.value,
+            cpu.cycles, ea, m, flags,
+        )
+
+    def close(self):
+        """
+        Write all records and stop the background thread.
+        """
+        self.record_count += self._offset // RECORD.size
+        self._full_buffers.put((self._buffer, self._offset))
+        self._full_buffers.put((None, 0))
+        self._thread.join()
+        self._offset = 0
+        self.closed = True
+        self._check_error()
+        self.fp.flush()
+
+
+def iter_trace_records(fp, chunk_records=16 * 1024):
+    """
+    Yields TraceRecord instances from a binary trace file.
+    The file is read in chunks, so the size of the trace doesn't matter.
+    """
+    data = fp.read(HEADER.size)
+    if len(data) != HEADER.size:
+        raise ValueError("Trace file is truncated")
+    magic, version, record_size = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError(f"No MC6809 trace file: {magic!r}")
+    if version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"Unsupported trace version {version:d} (supported: {VERSION:d})")
+
+    while True:
+        data = fp.read(chunk_records * RECORD.size)
+        if not data:
+            return
+        if len(data) % RECORD.size:
+            raise ValueError("Trace file is truncated")
+        for values in RECORD.iter_unpack(data):
+            yield TraceRecord._make(values)
+
+
+def get_op_address_profile(records, count=20):
+    """
+    Returns the most traced/sampled op addresses as:
+        [(op address, mnemonic, record count), ...]
+    """
+    counter = collections.Counter()
+    opcodes = {}
+    for record in records:
+        counter[record.op_address] += 1
+        opcodes[record.op_address] = record.opcode
+    return [
+        (op_address, MC6809OP_DATA_DICT.get(opcodes[op_address], {}).get("mnemonic", "???"), record_count)
+        for op_address, record_count in counter.most_common(count)
+    ]
+
+
+def format_trace_record(record):
+    """
+    Returns a trace line in the format of the InstructionTrace output
+    """
+    op_data = MC6809OP_DATA_DICT.get(record.opcode)
+    mnemonic = op_data["mnemonic"] if op_data else "???"
+
+    kwargs_info = []
+    if record.flags & FLAG_EA:
+        kwargs_info.append(f"ea:{record.ea:04x}")
+    if record.flags & FLAG_M:
+        kwargs_info.append(f"m:{record.m:x}")
+
+    return (
+        f"{record.op_address:04x}| {record.op_bytes[:record.op_length].hex():<11} {mnemonic:<7}"
+        f" {' '.join(kwargs_info):<19}"
+        f" cc={record.cc:02x} a={record.a:02x} b={record.b:02x} dp={record.dp:02x}"
+        f" x={record.x:04x} y={record.y:04x} u={record.u:04x} s={record.s:04x}"
+        f" | {cc_value2txt(record.cc)} | cycles={record.cycles:d}"
+    )
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+
+"""
+    MC6809 - 6809 CPU emulator in Python
+    =======================================
+
+    Filter the binary trace by address ranges, mnemonics, a cycle window
+    and the call tree of a subroutine.
+
+    The filter switches the opcode functions of the CPU: Outside of the
+    filtered code the untraced functions are used, so this code runs at
+    normal speed. The entry into the filtered code is detected via the
+    read traps of the memory (on the opcode fetch) and via cycle events
+    for the cycle window. Inside, every instruction checks if the code
+    leaves the filter and switches back to the untraced functions.
+
+    The call tree of a subroutine starts on the fetch of its first opcode
+    and ends if the stack pointer is above the stack pointer at the entry,
+    e.g.: after the RTS. Interrupts in the call tree are traced, too.
+
+    The traps use the same memory debug traps as the breakpoints: Don't
+    set breakpoints or read watchpoints in the filtered address ranges.
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import logging
+
+from MC6809.components.MC6809data.MC6809_data_utils import MC6809OP_DATA_DICT
+
+
+log = logging.getLogger("MC6809")
+
+
+PAGE_OPCODES = (0x10, 0x11)  # The paged ops are filtered, not the PAGE ops itself
+
+
+class TraceFilter:
+    """
+    Write the binary trace only for the instructions, that match all given filters:
+
+        pc_ranges   ((start, end), ...) the addresses of the instructions (end inclusive)
+        mnemonics   e.g.: {"JSR", "RTS"}
+        cycles      (start, end) the CPU cycles window (end exclusive)
+        call_tree   the start address of a subroutine
+
+    The CPU must have a binary trace, see cfg "trace_file".
+    """
+
+    def __init__(self, cpu, pc_ranges=None, mnemonics=None, cycles=None, call_tree=None):
+        if cpu.trace_writer is None:
+            raise ValueError("The CPU has no binary trace, see: cfg 'trace_file'")
+        self.cpu = cpu
+        self.pc_ranges = tuple(pc_ranges) if pc_ranges is not None else None
+        self.mnemonics = frozenset(mnemonic.upper() for mnemonic in mnemonics) if mnemonics is not None else None
+        self.cycles = tuple(cycles) if cycles is not None else None
+        self.call_tree = call_tree
+
+        self.inside = False  # Are the filtered opcode functions active?
+        self._call_tree_stack = None  # The stack pointer at the entry of the call tree
+
+        # The CPU was created with the traced opcode functions:
+        self._origin_funcs = {
+            opcode: func for opcode, (__, func) in cpu.opcode_dict.items() if opcode not in PAGE_OPCODES
+        }
+        self._untraced_funcs = {}
+        self._inside_funcs = {}
+        for opcode, (__, untraced_func) in cpu.op_collection.get_untraced_opcode_dict().items():
+            if opcode in PAGE_OPCODES:
+                continue
+            self._untraced_funcs[opcode] = untraced_func
+            if self.mnemonics is None or MC6809OP_DATA_DICT[opcode]["mnemonic"] in self.mnemonics:
+                traced_func = self._origin_funcs[opcode]
+            else:
+                traced_func = untraced_func
+            self._inside_funcs[opcode] = self._build_inside_func(traced_func, untraced_func)
+
+        self._trap_ranges = list(self.pc_ranges or ())
+        if call_tree is not None:
+            self._trap_ranges.append((call_tree, call_tree))
+        for start, end in self._trap_ranges:
+            cpu.memory.add_read_trap(self._entry_trap, start, end)
+
+        self._events = []
+        if self.cycles is not None:
+            for deadline in self.cycles:
+                self._events.append(cpu.scheduler.add_event(deadline, self._update))
+
+        cpu.replace_opcode_funcs(self._untraced_funcs)
+        self._update()
+
+    def remove(self):
+        """
+        Remove the filter: All instructions will be traced again.
+        """
+        cpu = self.cpu
+        for start, end in self._trap_ranges:
+            cpu.memory.remove_read_trap(start, end)
+        for event in self._events:
+            cpu.scheduler.cancel(event)
+        cpu.replace_opcode_funcs(self._origin_funcs)
+        self.inside = False
+
+    def in_window(self):
+        return self.cycles is None or self.cycles[0] <= self.cpu.cycles < self.cycles[1]
+
+    def is_inside(self, address):
+        """
+        Is the instruction at 'address' in the filtered code?
+        The call tree is tracked outside of the cycle window, too.
+        """
+        if self.pc_ranges is not None and not any(start <= address <= end for start, end in self.pc_ranges):
+            return False
+
+        if self.call_tree is not None:
+            if self._call_tree_stack is None:
+                return False
+            if self.cpu.system_stack_pointer.value > self._call_tree_stack:
+                self._call_tree_stack = None  # returned from the call tree
+                return False
+            return True
+
+        return self.in_window()
+
+    def _build_inside_func(self, traced_func, untraced_func):
+        cpu = self.cpu
+        program_counter = cpu.program_counter
+        in_window = self.in_window
+        is_inside = self.is_inside
+        update = self._update
+
+        def filtered_op(opcode):
+            if in_window() and is_inside(cpu.last_op_address):
+                traced_func(opcode)
+            else:
+                untraced_func(opcode)
+            if not is_inside(program_counter.value):
+                update()  # Leave the filtered code
+
+        return filtered_op
+
+    def _update(self, cycles=None):
+        """
+        Switch the opcode functions, if the next instruction enters or leaves the filtered code
+        """
+        inside = self.is_inside(self.cpu.program_counter.value)
+        if inside != self.inside:
+            self.inside = inside
+            self.cpu.replace_opcode_funcs(self._inside_funcs if inside else self._untraced_funcs)
+
+    def _entry_trap(self, cycles, last_op_address, address, value):
+        cpu = self.cpu
+        if address != cpu.program_counter.value:
+            return  # No opcode fetch
+
+        if address == self.call_tree and self._call_tree_stack is None:
+            self._call_tree_stack = cpu.system_stack_pointer.value
+        if not self.inside:
+            self._update()
@@ -21,12 +21,29 @@
 
 
 import array
+import copy
+import hashlib
 import logging
 
 
 log = logging.getLogger("MC6809")
 
 
+# Page types of the page table (see Memory.page_types):
+PAGE_RAM = 0  # plain RAM: read and write directly
+PAGE_ROM = 1  # plain ROM: read directly, writes are ignored
+PAGE_HANDLERS = 2  # callbacks/middlewares, out of range or partial ROM: use the slow path
+
+PAGE_COUNT = 0x100
+PAGE_SHIFT = 8
+
+# The address -> function dicts of the callbacks and middlewares (without the debug traps):
+HANDLER_DICT_NAMES = (
+    "_read_byte_callbacks", "_read_word_callbacks", "_write_byte_callbacks", "_write_word_callbacks",
+    "_read_byte_middleware", "_write_byte_middleware", "_read_word_middleware", "_write_word_middleware",
+)
+
+
 class Memory:
     def __init__(self, cfg, read_bus_request_queue=None, read_bus_response_queue=None, write_bus_queue=None):
         self.cfg = cfg
@@ -68,7 +85,26 @@ class Memory:
 #        self._mem = bytearray(self.cfg.MEMORY_SIZE)
 
         # array consumes also less RAM than lists and it's a little bit faster:
-        self._mem = array.array("B", [0x00] * self.INTERNAL_SIZE)  # unsigned char
+        self._mem = array.array("B", bytes(self.INTERNAL_SIZE))  # unsigned char
+        self._mem_view = memoryview(self._mem)
+
+        # Read-only zero-copy export of the whole memory, e.g.: for hashing or numpy.frombuffer()
+        self.buffer = self._mem_view.toreadonly()
+
+        # One entry per 256 byte page: PAGE_RAM, PAGE_ROM or PAGE_HANDLERS
+        # The upper half covers addresses > $ffff (unmasked indexed addressing)
+        # and negative addresses, so they always use the slow path.
+        self._base_page_types = self._build_base_page_types()
+        self.page_types = self._base_page_types + bytearray([PAGE_HANDLERS] * PAGE_COUNT)
+        self._page_handler_count = [0] * PAGE_COUNT
+
+        # Functions that will be called with the changed address range
+        # after load() stored new data, e.g.: to invalidate translated code
+        self._load_callbacks = []
+
+        # SHA-256 over the address and the data of all loaded ROM files, e.g.: to check
+        # if a saved state fits to the ROMs. See: mc6809_save_state.py
+        self.rom_hash = hashlib.sha256().digest()
 
         if cfg and cfg.rom_cfg:
             for romfile in cfg.rom_cfg:
@@ -95,6 +131,11 @@ class Memory:
             if write_func:
                 self.add_write_byte_middleware(write_func, start_addr, end_addr)
 
+        # Debug traps are called with the read/written byte, but can't change it.
+        # Used for breakpoints and watchpoints, see: mc6809_breakpoints.py
+        self._read_traps = {}
+        self._write_traps = {}
+
         # init read/write word middlewares:
         self._read_word_middleware = {}
         self._write_word_middleware = {}
@@ -126,12 +167,57 @@ class Memory:
 
     # ---------------------------------------------------------------------------
 
+    def _build_base_page_types(self):
+        """
+        Page types without any handlers: Pages that are completely in the
+        ROM area are PAGE_ROM, pages that are only partly in the ROM area
+        must check the address range on write, so they use the slow path.
+        """
+        page_types = bytearray(PAGE_COUNT)
+        rom_start, rom_end = self.cfg.ROM_START, self.cfg.ROM_END
+        for page in range(PAGE_COUNT):
+            page_start = page << PAGE_SHIFT
+            page_end = page_start + 0xff
+            if rom_start <= page_start and page_end <= rom_end:
+                page_types[page] = PAGE_ROM
+            elif rom_start <= page_end and page_start <= rom_end:
+                page_types[page] = PAGE_HANDLERS
+        return page_types
+
+    def _add_page_handler(self, address):
+        page = address >> PAGE_SHIFT
+        if 0 <= page < PAGE_COUNT:
+            self._page_handler_count[page] += 1
+            self.page_types[page] = PAGE_HANDLERS
+
+    def _remove_page_handler(self, address):
+        page = address >> PAGE_SHIFT
+        if 0 <= page < PAGE_COUNT:
+            self._page_handler_count[page] -= 1
+            if not self._page_handler_count[page]:
+                self.page_types[page] = self._base_page_types[page]
+
     def _map_address_range(self, callbacks_dict, callback_func, start_addr, end_addr=None):
         if end_addr is None:
-            callbacks_dict[start_addr] = callback_func
-        else:
-            for addr in range(start_addr, end_addr + 1):
-                callbacks_dict[addr] = callback_func
+            end_addr = start_addr
+        for addr in range(start_addr, end_addr + 1):
+            if addr not in callbacks_dict:
+                self._add_page_handler(addr)
+            callbacks_dict[addr] = callback_func
+
+    def _unmap_address_range(self, callbacks_dict, start_addr, end_addr=None):
+        if end_addr is None:
+            end_addr = start_addr
+        for addr in range(start_addr, end_addr + 1):
+            if addr in callbacks_dict:
+                del callbacks_dict[addr]
+                self._remove_page_handler(addr)
+
+    def is_plain_page(self, address):
+        """
+        True if the page of the given address can be read without any handler.
+        """
+        return self.page_types[address >> PAGE_SHIFT] < PAGE_HANDLERS
 
     # ---------------------------------------------------------------------------
 
@@ -161,34 +247,78 @@ class Memory:
     def add_write_word_middleware(self, callback_func, start_addr, end_addr=None):
         self._map_address_range(self._write_word_middleware, callback_func, start_addr, end_addr)
 
+    def remove_read_byte_middleware(self, start_addr, end_addr=None):
+        self._unmap_address_range(self._read_byte_middleware, start_addr, end_addr)
+
+    def remove_write_byte_middleware(self, start_addr, end_addr=None):
+        self._unmap_address_range(self._write_byte_middleware, start_addr, end_addr)
+
+    def remove_read_word_middleware(self, start_addr, end_addr=None):
+        self._unmap_address_range(self._read_word_middleware, start_addr, end_addr)
+
+    def remove_write_word_middleware(self, start_addr, end_addr=None):
+        self._unmap_address_range(self._write_word_middleware, start_addr, end_addr)
+
+    def add_read_trap(self, callback_func, start_addr, end_addr=None):
+        self._map_address_range(self._read_traps, callback_func, start_addr, end_addr)
+
+    def add_write_trap(self, callback_func, start_addr, end_addr=None):
+        self._map_address_range(self._write_traps, callback_func, start_addr, end_addr)
+
+    def remove_read_trap(self, start_addr, end_addr=None):
+        self._unmap_address_range(self._read_traps, start_addr, end_addr)
+
+    def remove_write_trap(self, start_addr, end_addr=None):
+        self._unmap_address_range(self._write_traps, start_addr, end_addr)
+
+    def remove_handlers(self):
+        """
+        Remove all callbacks and middlewares, but not the debug traps.
+        e.g.: to replay a run without the periphery, see: mc6809_record_replay.py
+        """
+        for name in HANDLER_DICT_NAMES:
+            callbacks_dict = getattr(self, name)
+            for address in tuple(callbacks_dict):
+                self._unmap_address_range(callbacks_dict, address)
+
+    def add_load_callback(self, callback_func):
+        self._load_callbacks.append(callback_func)
+
     # ---------------------------------------------------------------------------
 
     def load(self, address, data):
         if isinstance(data, str):
             data = [ord(c) for c in data]
+        elif not isinstance(data, (bytes, bytearray, memoryview, list, tuple)):
+            data = list(data)  # e.g.: a generator: The length is needed in the error message
+
+        try:
+            data = bytes(data)
+        except ValueError as err:
+            raise OverflowError(
+                f"{err} - (load address was: ${address:04x} - data length: {len(data):d}Bytes)"
+            )
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("ROM load at $%04x: %s", address, data[:32].hex(" "))
 
-        log.debug("ROM load at $%04x: %s", address,
-                  ", ".join(f"${i:02x}" for i in data)
-                  )
-        for ea, datum in enumerate(data, address):
-            try:
-                self._mem[ea] = datum
-            except OverflowError as err:
-                raise OverflowError(
-                    f"{err} - datum=${datum:x} ea=${ea:04x}"
-                    f" (load address was: ${address:04x} - data length: {len(data):d}Bytes)"
-                )
+        self.poke_range(address, data)
 
     def load_file(self, romfile):
         data = romfile.get_data()
         self.load(romfile.address, data)
+        self.rom_hash = hashlib.sha256(self.rom_hash + romfile.address.to_bytes(2, "big") + bytes(data)).digest()
         log.critical("Load ROM file %r to $%04x", romfile.filepath, romfile.address)
 
     # ---------------------------------------------------------------------------
 
     def read_byte(self, address):
         self.cpu.cycles += 1
+        if self.page_types[address >> 8] < PAGE_HANDLERS:
+            return self._mem[address]
+        return self._read_byte_slow(address)
 
+    def _read_byte_slow(self, address):
         if address in self._read_byte_callbacks:
             byte = self._read_byte_callbacks[address](
                 self.cpu.cycles, self.cpu.last_op_address, address
@@ -197,6 +327,8 @@ class Memory:
                 f"Error: read byte callback for ${address:04x}"
                 f" func {self._read_byte_callbacks[address].__name__!r} has return None!"
             )
+            if address in self._read_traps:
+                self._read_traps[address](self.cpu.cycles, self.cpu.last_op_address, address, byte)
             return byte
 
         try:
@@ -218,6 +350,9 @@ class Memory:
                 f" func {self._read_byte_middleware[address].__name__!r} has return None!"
             )
 
+        if address in self._read_traps:
+            self._read_traps[address](self.cpu.cycles, self.cpu.last_op_address, address, byte)
+
 #        log.log(5, "%04x| (%i) read byte $%x from $%x",
 #            self.cpu.last_op_address, self.cpu.cycles,
 #            byte, address
@@ -225,6 +360,12 @@ class Memory:
         return byte
 
     def read_word(self, address):
+        if address & 0xff != 0xff and self.page_types[address >> 8] < PAGE_HANDLERS:
+            # Both bytes are in the same plain page
+            self.cpu.cycles += 2
+            mem = self._mem
+            return (mem[address] << 8) | mem[address + 1]
+
         if address in self._read_word_callbacks:
             word = self._read_word_callbacks[address](
                 self.cpu.cycles, self.cpu.last_op_address, address
@@ -242,7 +383,13 @@ class Memory:
 
     def write_byte(self, address, value):
         self.cpu.cycles += 1
+        if self.page_types[address >> 8] == PAGE_RAM:
+            # Note: array.array raises OverflowError for out of range values
+            self._mem[address] = value
+            return
+        self._write_byte_slow(address, value)
 
+    def _write_byte_slow(self, address, value):
         assert value >= 0, f"Write negative byte hex:{value:00x} dez:{value:d} to ${address:04x}"
         assert value <= 0xff, (
             f"Write out of range byte hex:{value:02x} dez:{value:d} to ${address:04x}"
@@ -261,6 +408,9 @@ class Memory:
                 f" func {self._write_byte_middleware[address].__name__!r} has return None!"
             )
 
+        if address in self._write_traps:
+            self._write_traps[address](self.cpu.cycles, self.cpu.last_op_address, address, value)
+
         if address in self._write_byte_callbacks:
             return self._write_byte_callbacks[address](
                 self.cpu.cycles, self.cpu.last_op_address, address, value
@@ -289,6 +439,14 @@ class Memory:
 #             raise RuntimeError(msg2)
 
     def write_word(self, address, word):
+        if address & 0xff != 0xff and self.page_types[address >> 8] == PAGE_RAM:
+            # Both bytes are in the same plain RAM page
+            self.cpu.cycles += 2
+            mem = self._mem
+            mem[address] = word >> 8
+            mem[address + 1] = word & 0xff
+            return
+
         assert word >= 0, f"Write negative word hex:{word:04x} dez:{word:d} to ${address:04x}"
         assert word <= 0xffff, (
             f"Write out of range word hex:{word:04x} dez:{word:d} to ${address:04x}"
@@ -313,16 +471,87 @@ class Memory:
         self.write_byte(address + 1, word & 0xff)
 
     # ---------------------------------------------------------------------------
+    # Side-effect-free access for tools (trace, dumps, control server etc.):
+    # No CPU cycles are counted and no callbacks/middlewares are called.
+
+    def _check_range(self, start, end):
+        if not 0 <= start <= end <= self.INTERNAL_SIZE:
+            raise IndexError(f"Address range ${start:04x}-${end:04x} is outside of the memory")
+
+    def peek(self, address):
+        return self._mem[address]
+
+    def peek_range(self, start, end):
+        """
+        Returns a read-only memoryview of the memory from start to end (exclusive)
+        """
+        self._check_range(start, end)
+        return self.buffer[start:end]
+
+    def poke_range(self, start, data):
+        """
+        Store the bytes directly into the memory, ROM areas included.
+        Only the load callbacks are called, e.g.: to invalidate translated code
+        """
+        data = bytes(data)  # raise ValueError for values outside of 0-255
+        end = start + len(data)
+        self._check_range(start, end)
+        self._mem_view[start:end] = data
+
+        if data:
+            for callback_func in self._load_callbacks:
+                callback_func(start, end - 1)
+
+    def snapshot(self):
+        """
+        Returns a copy of the complete memory as bytes
+        """
+        return self._mem.tobytes()
+
+    def restore(self, snapshot):
+        """
+        Restore the complete memory from a snapshot()
+        """
+        if len(snapshot) != self.INTERNAL_SIZE:
+            raise ValueError(f"Snapshot size {len(snapshot):d} Bytes != memory size {self.INTERNAL_SIZE:d} Bytes")
+        self.poke_range(0x0000, snapshot)
+
+    def clone(self):
+        """
+        Returns a independent copy of this memory, without __init__():
+        The ROM files are not loaded again, RAM and ROM are copied in one step.
+
+        The callbacks and middlewares (e.g.: of the periphery) are shared,
+        but the debug traps and the load callbacks belong to a CPU and are
+        not copied. See: CPUBase.clone()
+        """
+        memory = copy.copy(self)
+        memory._mem = self._mem[:]
+        memory._mem_view = memoryview(memory._mem)
+        memory.buffer = memory._mem_view.toreadonly()
+
+        memory.page_types = bytearray(self.page_types)
+        memory._page_handler_count = self._page_handler_count[:]
+        memory._load_callbacks = []
+
+        for name in HANDLER_DICT_NAMES:
+            setattr(memory, name, getattr(self, name).copy())
+
+        memory._read_traps = {}
+        memory._write_traps = {}
+        for traps in (self._read_traps, self._write_traps):
+            for address in traps:
+                memory._remove_page_handler(address)
+        return memory
 
     def get(self, start, end):
         """
         used in unittests
         """
-        return [self.read_byte(addr) for addr in range(start, end)]
+        return self.peek_range(start, end).tolist()
 
     def iter_bytes(self, start, end):
-        for addr in range(start, end):
-            yield addr, self.read_byte(addr)
+        return enumerate(self.peek_range(start, end), start)
 
     def get_dump(self, start, end):
         dump_lines = []
@@ -75,7 +75,10 @@ class BaseConfig:
 #         else:
         self.rom_cfg = self.DEFAULT_ROMS
 
-        if cfg_dict["trace"]:
+        # Write a binary trace into this file, see: mc6809_trace_file.py
+        self.trace_file = cfg_dict.get("trace_file")
+
+        if cfg_dict["trace"] or self.trace_file:
             self.trace = True
         else:
             self.trace = False
@@ -24,6 +24,8 @@ import threading
 import traceback
 from http.server import BaseHTTPRequestHandler, HTTPServer
 
+from MC6809.components.mc6809_disassembler import disassemble, iter_disassembly_lines
+
 
 log = logging.getLogger("MC6809")
 
@@ -67,11 +69,12 @@ class ControlHandler(BaseHTTPRequestHandler):
                     txt = traceback.format_exc()
                     self.response_500(f"Error call {f.__name__!r}: {err}", txt)
                 return
-        else:
-            self.response_404(f"url {self.path!r} doesn't match any urls")
+        self.response_404(f"url {self.path!r} doesn't match any urls")
 
     def response(self, s, status_code=200):
         log.critical("send %s response", status_code)
+        if isinstance(s, str):
+            s = s.encode("utf-8")
         self.send_response(status_code)
         self.send_header("Content-Length", str(len(s)))
         self.end_headers()
@@ -134,13 +137,10 @@ class ControlHandler(BaseHTTPRequestHandler):
 
     def get_disassemble(self, m):
         addr = int(m.group(1))
-        r = []
         n = 20
-        while n > 0:
-            dis, length = self.disassemble.disasm(addr)
-            r.append(dis)
-            addr += length
-            n -= 1
+        assembly = self.cpu.memory.peek_range(addr, min(addr + n * 5, 0x10000))  # A op is max. 5 bytes long
+        disassembly = disassemble(assembly, start_address=addr)
+        r = list(iter_disassembly_lines(disassembly, with_header=False))[:n]
         self.response(json.dumps(r))
 
     def get_memory_raw(self, m):
@@ -150,7 +150,7 @@ class ControlHandler(BaseHTTPRequestHandler):
             end = int(e)
         else:
             end = addr
-        self.response("".join(chr(self.cpu.read_byte(x)) for x in range(addr, end + 1)))
+        self.response(bytes(self.cpu.memory.peek_range(addr, end + 1)))
 
     def get_memory(self, m):
         addr = int(m.group(1), 16)
@@ -159,7 +159,7 @@ class ControlHandler(BaseHTTPRequestHandler):
             end = int(e, 16)
         else:
             end = addr
-        self.response(json.dumps(list(map(self.cpu.read_byte, list(range(addr, end + 1))))))
+        self.response(json.dumps(self.cpu.memory.peek_range(addr, end + 1).tolist()))
 
     def get_status(self, m):
         data = {
@@ -180,8 +180,7 @@ class ControlHandler(BaseHTTPRequestHandler):
         else:
             end = addr
         data = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
-        for i, a in enumerate(range(addr, end + 1)):
-            self.cpu.write_byte(a, data[i])
+        self.cpu.memory.poke_range(addr, data[:end + 1 - addr])
         self.response("")
 
     def post_memory_raw(self, m):
@@ -192,8 +191,7 @@ class ControlHandler(BaseHTTPRequestHandler):
         else:
             end = addr
         data = self.rfile.read(int(self.headers["Content-Length"]))
-        for i, a in enumerate(range(addr, end + 1)):
-            self.cpu.write_byte(a, data[i])
+        self.cpu.memory.poke_range(addr, data[:end + 1 - addr])
         self.response("")
 
     def post_debug(self, m):
@@ -230,8 +228,6 @@ def control_server_thread(cpu, cfg, control_server):
     for s in rs:
         if s is control_server:
             control_server._handle_request_noblock()
-        else:
-            pass
 
     if cpu.running:
         threading.Timer(interval=0.5,
@@ -33,7 +33,7 @@ class Test6809_Arithmetic(BaseCPUTestCase):
     def test_ADDA_immediate(self):
         # expected values are: 1 up to 255 then wrap around to 0 and up to 4
         excpected_values = list(range(1, 256))
-        excpected_values += list(range(0, 5))
+        excpected_values += list(range(5))
 
         self.cpu.accu_a.set(0x00)  # start value
         for i in range(260):
@@ -110,7 +110,7 @@ class Test6809_Arithmetic(BaseCPUTestCase):
                 self.assertEqual(self.cpu.V, 0)
 
     def test_ADDD1(self):
-        areas = list(range(0, 3)) + ["..."] + list(range(0x7ffd, 0x8002)) + ["..."] + list(range(0xfffd, 0x10002))
+        areas = list(range(3)) + ["..."] + list(range(0x7ffd, 0x8002)) + ["..."] + list(range(0xfffd, 0x10002))
         for i in areas:
             if i == "...":
                 #                 print "..."
@@ -275,7 +275,7 @@ loop:
     def test_INC_memory(self):
         # expected values are: 1 up to 255 then wrap around to 0 and up to 4
         excpected_values = list(range(1, 256))
-        excpected_values += list(range(0, 5))
+        excpected_values += list(range(5))
 
         self.cpu.memory.write_byte(0x4500, 0x0)  # start value
         for i in range(260):
@@ -314,7 +314,7 @@ loop:
     def test_INCB(self):
         # expected values are: 1 up to 255 then wrap around to 0 and up to 4
         excpected_values = list(range(1, 256))
-        excpected_values += list(range(0, 5))
+        excpected_values += list(range(5))
 
         for i in range(260):
             self.cpu_test_run(start=0x1000, end=None, mem=[
@@ -555,8 +555,8 @@ loop:
         self.assertEqual(self.cpu.get_cc_info(), "EFHI....")
 
     def test_ORCC(self):
-        a_areas = list(range(0, 3)) + ["..."] + list(range(0x7e, 0x83)) + ["..."] + list(range(0xfd, 0x100))
-        b_areas = list(range(0, 3)) + ["..."] + list(range(0x7e, 0x83)) + ["..."] + list(range(0xfd, 0x100))
+        a_areas = list(range(3)) + ["..."] + list(range(0x7e, 0x83)) + ["..."] + list(range(0xfd, 0x100))
+        b_areas = list(range(3)) + ["..."] + list(range(0x7e, 0x83)) + ["..."] + list(range(0xfd, 0x100))
         for a in a_areas:
             if a == "...":
                 #                print "..."
@@ -577,8 +577,8 @@ loop:
                 self.assertEqualHex(r, expected_value)
 
     def test_ANDCC(self):
-        a_areas = list(range(0, 3)) + ["..."] + list(range(0x7e, 0x83)) + ["..."] + list(range(0xfd, 0x100))
-        b_areas = list(range(0, 3)) + ["..."] + list(range(0x7e, 0x83)) + ["..."] + list(range(0xfd, 0x100))
+        a_areas = list(range(3)) + ["..."] + list(range(0x7e, 0x83)) + ["..."] + list(range(0xfd, 0x100))
+        b_areas = list(range(3)) + ["..."] + list(range(0x7e, 0x83)) + ["..."] + list(range(0xfd, 0x100))
         for a in a_areas:
             if a == "...":
                 #                print "..."
@@ -601,8 +601,8 @@ loop:
     def test_ABX(self):
         self.cpu.set_cc(0xff)
 
-        x_areas = list(range(0, 3)) + ["..."] + list(range(0x7ffd, 0x8002)) + ["..."] + list(range(0xfffd, 0x10000))
-        b_areas = list(range(0, 3)) + ["..."] + list(range(0x7e, 0x83)) + ["..."] + list(range(0xfd, 0x100))
+        x_areas = list(range(3)) + ["..."] + list(range(0x7ffd, 0x8002)) + ["..."] + list(range(0xfffd, 0x10000))
+        b_areas = list(range(3)) + ["..."] + list(range(0x7e, 0x83)) + ["..."] + list(range(0xfd, 0x100))
 
         for x in x_areas:
             if x == "...":
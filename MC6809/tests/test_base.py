@@ -78,6 +78,7 @@ class BaseTestCase(unittest.TestCase):
 
 
 class BaseCPUTestCase(BaseTestCase):
+    CPU_CLASS = CPU
     UNITTEST_CFG_DICT = {
         "verbosity": None,
         "display_cycle": False,
@@ -93,7 +94,7 @@ class BaseCPUTestCase(BaseTestCase):
     def setUp(self):
         cfg = TestCfg(self.UNITTEST_CFG_DICT)
         memory = Memory(cfg)
-        self.cpu = CPU(memory, cfg)
+        self.cpu = self.CPU_CLASS(memory, cfg)
 
     def cpu_test_run(self, start, end, mem):
         for cell in mem:
@@ -119,7 +120,7 @@ class BaseCPUTestCase(BaseTestCase):
     def assertMemory(self, start, mem):
         for index, should_byte in enumerate(mem):
             address = start + index
-            is_byte = self.cpu.memory.read_byte(address)
+            is_byte = self.cpu.memory.peek(address)
 
             msg = f"${is_byte:02x} is not ${should_byte:02x} at address ${address:04x} (index: {index:d})"
             self.assertEqual(is_byte, should_byte, msg)
@@ -143,12 +144,31 @@ class BaseStackTestCase(BaseCPUTestCase):
 #         self.cc = ConditionCodeRegister()
 
 
+def cpu_variant_test_cases(cpu_class, prefix, *modules):
+    """
+    Create a variant of every CPU test case in the given test modules,
+    that runs against 'cpu_class'. Used to run the existing tests
+    against alternative CPU implementations.
+    """
+    test_cases = {}
+    for module in modules:
+        for name, test_class in vars(module).items():
+            if (
+                isinstance(test_class, type)
+                and issubclass(test_class, BaseCPUTestCase)
+                and test_class.__module__ == module.__name__
+            ):
+                variant_name = f"{prefix}{name}"
+                test_cases[variant_name] = type(variant_name, (test_class,), {"CPU_CLASS": cpu_class})
+    return test_cases
+
+
 def print_cpu_state_data(state):
     print(f"cpu state data {state.__class__.__name__!r} (ID:{id(state):d}):")
     for k, v in sorted(state.items()):
         if k == "RAM":
             # v = ",".join(["$%x" % i for i in v])
-            print("\tSHA from RAM:", hashlib.sha224(repr(v)).hexdigest())
+            print("\tSHA from RAM:", hashlib.sha224(v).hexdigest())
             continue
         if isinstance(v, int):
             v = f"${v:x}"
@@ -0,0 +1,213 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the basic block translation cache
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.cpu6809 import CPU, CPUBlockCache
+from MC6809.components.memory import Memory
+from MC6809.tests import test_6809_program
+from MC6809.tests.test_base import BaseStackTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class BlockCacheTestCase(BaseStackTestCase):
+    CPU_CLASS = CPUBlockCache
+
+    def test_block_ends_on_branch(self):
+        self.cpu_test_run(start=0x4000, end=None, mem=[
+            0x86, 0x05,  # 4000|   LDA #5
+            0x4A,        # 4002| L DECA
+            0x26, 0xFD,  # 4003|   BNE L
+            0x12,        # 4005|   NOP
+        ])
+        self.assertEqualHexByte(self.cpu.accu_a.value, 0x00)
+        self.assertEqual(self.cpu._block_ranges[0x4000], (0x4000, 0x4004))
+        self.assertEqual(self.cpu._block_ranges[0x4002], (0x4002, 0x4004))
+
+        # The end address $4006 is inside of the NOP block: The NOP was executed as single op
+        block_start, block_end = self.cpu._block_ranges[0x4005]
+        self.assertLess(block_start, 0x4006)
+        self.assertGreaterEqual(block_end, 0x4006)
+        self.assertEqual(self.cpu.program_counter.value, 0x4006)
+
+    def test_same_result_as_op_by_op(self):
+        mem = [
+            0x10, 0x8E, 0x00, 0x08,  # LDY #8
+            0x86, 0x12,  # LDA #$12
+            0xC6, 0x34,  # LDB #$34
+            0x97, 0x20,  # STA <$20
+            0xF7, 0x30, 0x00,  # STB $3000
+            0x0C, 0x20,  # INC <$20
+            0xDB, 0x20,  # ADDB <$20
+            0xFC, 0x30, 0x00,  # LDD $3000
+            0x1E, 0x89,  # EXG A,B
+            0x34, 0x06,  # PSHS D
+            0x11, 0x83, 0x00, 0x01,  # CMPU #1
+            0x31, 0x3F,  # LEAY -1,Y
+            0x26, 0xE6,  # BNE (LDA #$12)
+        ]
+        self.assert_same_result_as_cpu(mem)
+
+    def assert_same_result_as_cpu(self, mem):
+        # The end address must be behind the block, otherwise it will be executed op by op:
+        mem = [*mem, 0x20, 0x00]  # BRA +0
+        self.cpu_test_run(start=0x4000, end=None, mem=mem)
+
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        cpu = CPU(Memory(cfg), cfg)
+        cpu.system_stack_pointer.set(self.INITIAL_SYSTEM_STACK_ADDR)
+        cpu.user_stack_pointer.set(self.INITIAL_USER_STACK_ADDR)
+        cpu.memory.load(0x4000, mem)
+        cpu.test_run(0x4000, 0x4000 + len(mem))
+
+        self.assertEqual(self.cpu.get_state(), cpu.get_state())
+        self.assertEqual(self.cpu.memory.get(0x0000, 0x4100), cpu.memory.get(0x0000, 0x4100))
+
+    def test_indexed_5bit_offset(self):
+        self.assert_same_result_as_cpu([
+            0x8E, 0x30, 0x00,  # LDX #$3000
+            0x86, 0x4C,  # LDA #$4C
+            0xA7, 0x04,  # STA 4,X
+            0xE6, 0x04,  # LDB 4,X
+            0x5C,  # INCB
+        ])
+
+    def test_indexed_8bit_offset(self):
+        self.assert_same_result_as_cpu([
+            0x8E, 0x30, 0x00,  # LDX #$3000
+            0x86, 0x12,  # LDA #$12
+            0xA7, 0x88, 0x4C,  # STA $4C,X
+            0xE6, 0x88, 0x4C,  # LDB $4C,X ($4C is INCA, if executed as opcode)
+            0x5C,  # INCB
+        ])
+
+    def test_indexed_16bit_offset(self):
+        self.assert_same_result_as_cpu([
+            0x8E, 0x30, 0x00,  # LDX #$3000
+            0x86, 0x12,  # LDA #$12
+            0xA7, 0x89, 0x0C, 0x4C,  # STA $0C4C,X
+            0x10, 0xAE, 0x89, 0x0C, 0x4C,  # LDY $0C4C,X
+            0x5C,  # INCB
+        ])
+
+    def test_indexed_pc_relative(self):
+        self.assert_same_result_as_cpu([
+            0xA6, 0x8C, 0x05,  # LDA 5,PCR (8-bit offset)
+            0xE6, 0x8D, 0x00, 0x02,  # LDB 2,PCR (16-bit offset)
+            0x4C,  # INCA
+            0x5C,  # INCB
+            0x12,  # NOP
+        ])
+
+    def test_indexed_extended_indirect(self):
+        self.assert_same_result_as_cpu([
+            0xCC, 0x30, 0x00,  # LDD #$3000
+            0xFD, 0x20, 0x00,  # STD $2000
+            0x86, 0x4C,  # LDA #$4C
+            0xA7, 0x9F, 0x20, 0x00,  # STA [$2000]
+            0xE6, 0x9F, 0x20, 0x00,  # LDB [$2000]
+            0x10, 0xAE, 0x9F, 0x20, 0x00,  # LDY [$2000]
+            0x5C,  # INCB
+        ])
+
+    def test_write_into_running_block(self):
+        mem = [
+            0x86, 0x99,  # 4000| LDA #$99
+            0xB7, 0x40, 0x07,  # 4002| STA $4007 (the operand of the LDB)
+            0x12,  # 4005| NOP
+            0xC6, 0x00,  # 4006| LDB #$00
+            0x12,  # 4007| NOP
+        ]
+        self.assert_same_result_as_cpu(mem)
+        self.assertEqualHexByte(self.cpu.accu_b.value, 0x99)
+
+        # Run the block via burst_run(), without the end address in the block:
+        self.cpu.memory.load(0x4000, mem + [0x20, 0xFE])  # 4009| BRA *
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.accu_b.set(0x00)
+        self.cpu.get_and_call_next_block()
+        self.assertEqual(self.cpu.program_counter.value, 0x4005)
+        self.assertIsNone(self.cpu.modified_block)
+        self.cpu.get_and_call_next_block()
+        self.assertEqualHexByte(self.cpu.accu_b.value, 0x99)
+
+    def test_self_modifying_code(self):
+        self.cpu_test_run(start=0x4000, end=None, mem=[
+            0x86, 0x01,  # LDA #1
+            0x20, 0x00,  # BRA +0
+        ])
+        self.assertEqualHexByte(self.cpu.accu_a.value, 0x01)
+        self.assertIn(0x4000, self.cpu.block_cache)
+
+        self.cpu.memory.write_byte(0x4001, 0x02)  # change the immediate value
+        self.assertNotIn(0x4000, self.cpu.block_cache)
+
+        self.cpu.test_run(start=0x4000, end=0x4004)
+        self.assertEqualHexByte(self.cpu.accu_a.value, 0x02)
+
+    def test_load_invalidates_blocks(self):
+        self.cpu_test_run(start=0x4000, end=None, mem=[0x86, 0x01, 0x20, 0x00])
+        self.assertEqualHexByte(self.cpu.accu_a.value, 0x01)
+
+        self.cpu_test_run(start=0x4000, end=None, mem=[0xC6, 0x03, 0x20, 0x00])
+        self.assertEqualHexByte(self.cpu.accu_b.value, 0x03)
+
+    def test_existing_write_middleware(self):
+        calls = []
+
+        def middleware(cycles, last_op_address, address, value):
+            calls.append((address, value))
+            return value + 1
+
+        self.cpu.memory.add_write_byte_middleware(middleware, 0x4001)
+        self.cpu_test_run(start=0x4000, end=None, mem=[0x86, 0x01, 0x20, 0x00])
+
+        self.cpu.memory.write_byte(0x4001, 0x04)
+        self.assertEqual(calls, [(0x4001, 0x04)])
+        self.assertEqual(self.cpu.memory.read_byte(0x4001), 0x05)
+
+        # Our middleware is removed and the origin one is restored:
+        self.assertIs(self.cpu.memory._write_byte_middleware[0x4001], middleware)
+        self.assertNotIn(0x4000, self.cpu.memory._write_byte_middleware)
+
+    def test_run_until(self):
+        mem = [
+            0x8E, 0x30, 0x00,  # 4000|   LDX #$3000
+            0xC6, 0x40,  # 4003|   LDB #$40
+            0xE7, 0x80,  # 4005| L STB ,X+
+            0x4C,  # 4007|   INCA
+            0x5A,  # 4008|   DECB
+            0x26, 0xFA,  # 4009|   BNE L
+            0x20, 0xF3,  # 400b|   BRA $4000
+        ]
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        cpu = CPU(Memory(cfg), cfg)
+        cpu.system_stack_pointer.set(self.INITIAL_SYSTEM_STACK_ADDR)
+        cpu.user_stack_pointer.set(self.INITIAL_USER_STACK_ADDR)
+        calls = {}
+        for test_cpu in (self.cpu, cpu):
+            test_cpu.memory.load(0x4000, mem)
+            test_cpu.program_counter.set(0x4000)
+            test_cpu.cycles = 0
+            calls[test_cpu] = []
+            test_cpu.add_sync_callback(500, calls[test_cpu].append)
+
+            # The end address is inside of the loop block:
+            self.assertEqual(test_cpu.run_until(pc=0x4008), "pc")
+            self.assertGreaterEqual(test_cpu.run_cycles(5000), 5000)
+            self.assertEqual(test_cpu.run_until(pc=0x400b, cycles=test_cpu.cycles + 10000), "pc")
+
+        # Exactly the same stops and cycle events as op by op:
+        self.assertEqual(self.cpu.get_state(), cpu.get_state())
+        self.assertEqual(calls[self.cpu], calls[cpu])
+        self.assertIn(0x4005, self.cpu.block_cache)
+
+
+class BlockCacheProgramTestCase(test_6809_program.Test6809_Program):
+    CPU_CLASS = CPUBlockCache
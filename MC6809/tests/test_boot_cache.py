@@ -0,0 +1,116 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the boot snapshot cache
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from MC6809.components.cpu6809 import CPU
+from MC6809.components.mc6809_boot_cache import SNAPSHOT_SUFFIX, BootSnapshotCache
+from MC6809.components.memory import Memory
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class ROMFile:
+    def __init__(self, address, data):
+        self.filepath = f"<test rom ${address:04x}>"
+        self.address = address
+        self.data = bytes(data)
+
+    def get_data(self):
+        return self.data
+
+
+BOOT_ROM = ROMFile(0x8000, [
+    0x8E, 0x10, 0x00,  # 8000|   LDX #$1000
+    0x30, 0x1F,  # 8003| L LEAX -1,X
+    0x26, 0xFC,  # 8005|   BNE L
+    0x20, 0xFE,  # 8007| R BRA R
+])
+RESET_VECTOR = ROMFile(0xFFFE, [0x80, 0x00])
+
+
+class BootCfg(TestCfg):
+    DEFAULT_ROMS = (BOOT_ROM, RESET_VECTOR)
+
+
+class NoBootCPU(CPU):
+    def reset(self):
+        raise AssertionError("Booted again!")
+
+
+class BootSnapshotCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name)
+        self.cache = BootSnapshotCache(self.path)
+        self.cfg = BootCfg(BaseCPUTestCase.UNITTEST_CFG_DICT)
+
+    def get_snapshots(self):
+        return sorted(self.path.glob(f"*{SNAPSHOT_SUFFIX}"))
+
+    def test_boot_to_pc(self):
+        cpu = self.cache.boot(CPU, self.cfg, pc=0x8007)
+        self.assertEqual(cpu.index_x.value, 0)
+        self.assertEqual(len(self.get_snapshots()), 1)
+
+        cached_cpu = self.cache.boot(NoBootCPU, self.cfg, pc=0x8007)
+        self.assertEqual(cached_cpu.get_state(), cpu.get_state())
+
+    def test_boot_cycles(self):
+        cpu = self.cache.boot(CPU, self.cfg, cycles=1000)
+        cached_cpu = self.cache.boot(NoBootCPU, self.cfg, cycles=1000)
+        self.assertEqual(cached_cpu.get_state(), cpu.get_state())
+
+        with self.assertRaisesRegex(AssertionError, "Booted again"):
+            self.cache.boot(NoBootCPU, self.cfg, cycles=2000)
+
+    def test_other_roms(self):
+        self.cache.boot(CPU, self.cfg, pc=0x8007)
+
+        class OtherBootCfg(BootCfg):
+            DEFAULT_ROMS = (ROMFile(0x8000, [0x12, 0x20, 0xFE]), RESET_VECTOR)
+
+        cfg = OtherBootCfg(BaseCPUTestCase.UNITTEST_CFG_DICT)
+        key = self.cache.get_key(cfg, Memory(cfg), pc=0x8001)
+        self.assertNotEqual(key, self.cache.get_key(self.cfg, Memory(self.cfg), pc=0x8001))
+        with self.assertRaisesRegex(AssertionError, "Booted again"):
+            self.cache.boot(NoBootCPU, cfg, pc=0x8001)
+
+    def test_invalid_snapshot(self):
+        cpu = self.cache.boot(CPU, self.cfg, pc=0x8007)
+        snapshot, = self.get_snapshots()
+        snapshot.write_bytes(b"broken")
+        with self.assertLogs("MC6809", level="WARNING"):
+            new_cpu = self.cache.boot(CPU, self.cfg, pc=0x8007)
+        self.assertEqual(new_cpu.get_state(), cpu.get_state())
+        self.assertNotEqual(snapshot.read_bytes(), b"broken")
+
+    def test_eviction(self):
+        self.cache.boot(CPU, self.cfg, cycles=100)
+        snapshot_size = self.get_snapshots()[0].stat().st_size
+        self.cache.max_size = snapshot_size * 2
+
+        for cycles in (200, 300, 400):
+            self.cache.boot(CPU, self.cfg, cycles=cycles)
+        self.assertEqual(len(self.get_snapshots()), 2)
+        self.cache.boot(NoBootCPU, self.cfg, cycles=400)  # the last one still exists
+
+    def test_pc_not_reached(self):
+        with self.assertRaisesRegex(RuntimeError, "not reached"):
+            self.cache.boot(CPU, self.cfg, pc=0x9000, cycles=1000)
+        self.assertEqual(self.get_snapshots(), [])
+
+    def test_no_target(self):
+        with self.assertRaises(ValueError):
+            self.cache.boot(CPU, self.cfg)
@@ -0,0 +1,142 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test breakpoints and watchpoints
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.cpu6809 import CPUBlockCache, CPUFast, CPUTableDispatch
+from MC6809.components.mc6809_breakpoints import BREAKPOINT, WATCHPOINT
+from MC6809.components.memory import PAGE_HANDLERS, PAGE_RAM
+from MC6809.tests.test_base import BaseCPUTestCase
+
+
+class BreakpointTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpu.memory.load(0x4000, [
+            0x4F,  # 4000|   CLRA
+            0x4C,  # 4001| L INCA
+            0xB7, 0x50, 0x00,  # 4002|   STA $5000
+            0xF6, 0x50, 0x10,  # 4005|   LDB $5010
+            0x20, 0xF7,  # 4008|   BRA L
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.cycles = 0
+
+    def run_cpu(self):
+        self.cpu.outer_burst_op_count = 10
+        self.cpu.burst_run()
+        return self.cpu.debug_hit
+
+    def test_breakpoint(self):
+        self.cpu.add_breakpoint(0x4005)
+        self.assertEqual(self.cpu.memory.page_types[0x40], PAGE_HANDLERS)
+
+        hit = self.run_cpu()
+        self.assertEqual(hit.kind, BREAKPOINT)
+        self.assertEqual(hit.address, 0x4005)
+        self.assertEqual(hit.value, 0xF6)
+
+        # Stopped before the LDB:
+        self.assertEqual(self.cpu.program_counter.value, 0x4005)
+        self.assertEqual(self.cpu.cycles, 3 + 3 + 9)  # CLRA + INCA + STA
+        self.assertEqual(hit.cycles, self.cpu.cycles)
+        self.assertEqual(self.cpu.accu_a.value, 1)
+
+        # Resume runs the LDB and stops in the next loop:
+        self.cpu.debug_hit = None
+        hit = self.run_cpu()
+        self.assertEqual(hit.point.hits, 2)
+        self.assertEqual(self.cpu.program_counter.value, 0x4005)
+        self.assertEqual(self.cpu.accu_a.value, 2)
+
+        self.cpu.remove_breakpoint(0x4005)
+        self.assertEqual(self.cpu.memory._read_traps, {})
+
+    def test_conditional_breakpoint(self):
+        self.cpu.add_breakpoint(0x4002, condition="a == 5 and mem[0x5000] == 4")
+        hit = self.run_cpu()
+        self.assertEqual(hit.point.hits, 1)
+        self.assertEqual(self.cpu.program_counter.value, 0x4002)
+        self.assertEqual(self.cpu.accu_a.value, 5)
+
+    def test_write_watchpoint(self):
+        self.cpu.add_watchpoint(0x5000, write=True, condition="value == 3")
+        hit = self.run_cpu()
+        self.assertEqual(hit.kind, WATCHPOINT)
+        self.assertEqual(hit.address, 0x5000)
+        self.assertEqual(hit.value, 3)
+        self.assertEqual(hit.op_address, 0x4002)
+
+        # Stopped after the STA:
+        self.assertEqual(self.cpu.program_counter.value, 0x4005)
+        self.assertEqual(self.cpu.memory.peek(0x5000), 3)
+
+        self.cpu.debug_hit = None
+        cycles = self.cpu.cycles
+        self.cpu.run_cycles(10)  # condition is false for the next writes
+        self.assertIsNone(self.cpu.debug_hit)
+        self.assertGreater(self.cpu.cycles, cycles)
+
+    def test_read_watchpoint(self):
+        watchpoint = self.cpu.add_watchpoint(0x5008, 0x5010, read=True, write=False)
+        self.cpu.memory.load(0x5010, [0x42])
+        hit = self.run_cpu()
+        self.assertEqual(hit.point, watchpoint)
+        self.assertEqual(hit.value, 0x42)
+        self.assertEqual(self.cpu.program_counter.value, 0x4008)  # after the LDB
+        self.assertEqual(self.cpu.accu_b.value, 0x42)
+
+        self.cpu.remove_watchpoint(watchpoint)
+        self.assertEqual(self.cpu.memory.page_types[0x50], PAGE_RAM)
+        self.cpu.debug_hit = None
+        self.assertIsNone(self.run_cpu())
+
+    def test_read_watchpoint_on_opcode(self):
+        watchpoint = self.cpu.add_watchpoint(0x4005, read=True, write=False)
+        hit = self.run_cpu()
+        self.assertEqual(hit.point, watchpoint)
+        self.assertEqual(hit.value, 0xF6)
+        self.assertEqual(self.cpu.program_counter.value, 0x4005)  # before the LDB
+        self.assertEqual(self.cpu.accu_a.value, 1)
+
+        # Resume runs the LDB and stops in the next loop:
+        hit = self.run_cpu()
+        self.assertEqual(hit.point.hits, 2)
+        self.assertEqual(self.cpu.program_counter.value, 0x4005)
+        self.assertEqual(self.cpu.accu_a.value, 2)
+
+        # The hit of the last stop is cleared on the next run:
+        self.cpu.remove_watchpoint(watchpoint)
+        self.assertIsNone(self.run_cpu())
+
+    def test_run_until(self):
+        self.cpu.add_breakpoint(0x4008)
+        self.assertEqual(self.cpu.run_until(cycles=1000), BREAKPOINT)
+        self.assertEqual(self.cpu.program_counter.value, 0x4008)
+
+        self.cpu.clear_breakpoints()
+        self.assertEqual(self.cpu.run_until(cycles=1000), "cycles")
+
+
+class TableDispatchBreakpointTestCase(BreakpointTestCase):
+    CPU_CLASS = CPUTableDispatch
+
+
+class BlockCacheBreakpointTestCase(BreakpointTestCase):
+    CPU_CLASS = CPUBlockCache
+
+    def test_blocks_end_before_breakpoint(self):
+        self.cpu.add_breakpoint(0x4005)
+        self.run_cpu()
+        self.assertEqual(self.cpu._block_ranges[0x4000], (0x4000, 0x4004))
+        self.assertIsNone(self.cpu.block_cache[0x4005])
+
+
+class FastBreakpointTestCase(BreakpointTestCase):
+    CPU_CLASS = CPUFast
@@ -0,0 +1,125 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the packed condition code register and the 8-bit ALU flag tables
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import itertools
+
+from MC6809.components.cpu6809 import CPUPackedFlags
+from MC6809.components.mc6809_cc_packed import get_alu_flag_tables
+from MC6809.tests import (
+    test_6809_address_modes,
+    test_6809_arithmetic,
+    test_6809_arithmetic_shift,
+    test_6809_branch_instructions,
+    test_6809_program,
+    test_6809_register_changes,
+    test_6809_StoreLoad,
+    test_accumulators,
+    test_condition_code_register,
+    test_cpu6809,
+)
+from MC6809.tests.test_base import BaseCPUTestCase, cpu_variant_test_cases
+
+
+class ALUFlagTablesTestCase(BaseCPUTestCase):
+    """
+    Check the tables exhaustively against the update_*() methods
+    of the normal CPU.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tables = get_alu_flag_tables()
+
+    def test_add_flags(self):
+        table = self.tables["add"]
+        for carry, a, b in itertools.product((0, 1), range(0x100), range(0x100)):
+            self.cpu.set_cc(0x00)
+            self.cpu.update_HNZVC_8(a, b, a + b + carry)
+            if table[carry << 16 | a << 8 | b] != self.cpu.get_cc_value():
+                self.fail(f"ADD {a=:02x} {b=:02x} {carry=}")
+
+    def test_sub_flags(self):
+        table = self.tables["sub"]
+        for carry, a, b in itertools.product((0, 1), range(0x100), range(0x100)):
+            self.cpu.set_cc(0x00)
+            self.cpu.update_NZVC_8(a, b, a - b - carry)
+            if table[carry << 16 | a << 8 | b] != self.cpu.get_cc_value():
+                self.fail(f"SUB {a=:02x} {b=:02x} {carry=}")
+
+    def test_inc_dec_flags(self):
+        for a in range(0x100):
+            self.cpu.set_cc(0x00)
+            self.cpu.INC(a)
+            self.assertEqualHex(self.tables["inc"][a], self.cpu.get_cc_value(), f"INC {a=:02x}")
+
+            self.cpu.set_cc(0x00)
+            self.cpu.DEC(a)
+            self.assertEqualHex(self.tables["dec"][a], self.cpu.get_cc_value(), f"DEC {a=:02x}")
+
+    def test_daa(self):
+        results, flags = self.tables["daa"]
+        for c, h, a in itertools.product((0, 1), (0, 1), range(0x100)):
+            self.cpu.set_cc(h << 5 | c)
+            self.cpu.accu_a.set(a)
+            self.cpu.instruction_DAA(opcode=0x19)
+            index = c << 9 | h << 8 | a
+            self.assertEqualHex(results[index] & 0xff, self.cpu.accu_a.value, f"DAA {a=:02x} {h=} {c=}")
+            self.assertEqualHex(
+                flags[index] | c, self.cpu.get_cc_value() & 0x0d, f"DAA {a=:02x} {h=} {c=}"
+            )
+
+
+class PackedFlagsTestCase(BaseCPUTestCase):
+    CPU_CLASS = CPUPackedFlags
+
+    def test_flag_attributes(self):
+        self.cpu.set_cc(0x00)
+        self.cpu.E = 1
+        self.cpu.C = 1
+        self.assertEqualHex(self.cpu.cc, 0x81)
+        self.cpu.set_cc(0x1ff)
+        self.assertEqual(
+            (self.cpu.E, self.cpu.F, self.cpu.H, self.cpu.I, self.cpu.N, self.cpu.Z, self.cpu.V, self.cpu.C),
+            (1, 1, 1, 1, 1, 1, 1, 1),
+        )
+        self.cpu.I = 0
+        self.assertEqualHex(self.cpu.get_cc_value(), 0xef)
+
+    def test_adc_sbc(self):
+        self.cpu_test_run(start=0x4000, end=None, mem=[
+            0x1c, 0x00,  # ANDCC #$00
+            0x86, 0xff,  # LDA #$ff
+            0x8b, 0x01,  # ADDA #$01 -> $00 + carry
+            0x89, 0x10,  # ADCA #$10 -> $11
+            0x80, 0x12,  # SUBA #$12 -> $ff + borrow
+            0x82, 0x00,  # SBCA #$00 -> $fe
+            0x1f, 0xa9,  # TFR CC,B
+        ])
+        self.assertEqualHex(self.cpu.accu_a.value, 0xfe)
+        self.assertEqualHex(self.cpu.accu_b.value, 0x08)
+
+
+globals().update(
+    cpu_variant_test_cases(
+        CPUPackedFlags,
+        "Packed",
+        test_6809_address_modes,
+        test_6809_arithmetic,
+        test_6809_arithmetic_shift,
+        test_6809_branch_instructions,
+        test_6809_program,
+        test_6809_register_changes,
+        test_6809_StoreLoad,
+        test_accumulators,
+        test_condition_code_register,
+        test_cpu6809,
+    )
+)
@@ -0,0 +1,95 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the switch between the normal and the speed limited CPU
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import tempfile
+from pathlib import Path
+
+from MC6809.components.cpu6809 import CPUSpeedLimit
+from MC6809.components.mc6809_interrupt import FIRQ_LINE, IRQ_LINE, NMI_LINE
+from MC6809.components.mc6809_trace_file import iter_trace_records
+from MC6809.components.memory import Memory
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class ChangeCPUTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpu.memory.load(0x4000, [
+            0x12,  # 4000| NOP
+            0x20, 0xFD,  # 4001| BRA $4000
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.cycles = 0
+
+    def test_state(self):
+        self.cpu.run_cycles(1000)
+        state = self.cpu.get_state()
+        cpu = self.cpu.to_speed_limit()
+        self.assertIsInstance(cpu, CPUSpeedLimit)
+        self.assertFalse(self.cpu.running)
+        self.assertEqual(cpu.get_state(), state)
+
+        cpu = cpu.to_normal()
+        self.assertIsInstance(cpu, self.CPU_CLASS)
+        self.assertEqual(cpu.get_state(), state)
+
+    def test_cycle_events(self):
+        calls = []
+        self.cpu.add_sync_callback(100, calls.append)
+        self.cpu.run_cycles(1000)
+        self.assertEqual(len(calls), 10)
+
+        cpu = self.cpu.to_speed_limit()
+        self.assertEqual(len(self.cpu.scheduler), 0)
+        cpu.run_cycles(1000)
+        self.assertEqual(len(calls), 20)
+
+        cpu = cpu.to_normal()
+        cpu.run_cycles(1000)
+        self.assertEqual(len(calls), 30)
+
+    def test_interrupt_lines(self):
+        self.cpu.irq_enabled = True
+        self.cpu.set_cc(0x50)  # IRQ and FIRQ masked
+        self.cpu.assert_irq()
+        self.cpu.assert_firq()
+        self.cpu.assert_nmi()
+        self.cpu.interrupt_lines &= ~NMI_LINE  # The NMI was serviced, but the line is still high
+
+        cpu = self.cpu.to_speed_limit()
+        self.assertTrue(cpu.irq_enabled)
+        self.assertEqual(cpu.interrupt_lines, IRQ_LINE | FIRQ_LINE)
+        self.assertEqual(cpu.interrupt_pending, 0)
+        cpu.assert_nmi()
+        self.assertEqual(cpu.interrupt_pending, 0)  # no new edge
+
+        cpu.set_cc(0x10)
+        self.assertEqual(cpu.interrupt_pending, FIRQ_LINE)
+
+    def test_trace_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            trace_file = Path(temp_dir, "test.trace")
+            cfg = TestCfg(dict(self.UNITTEST_CFG_DICT, trace_file=str(trace_file)))
+            cpu = self.CPU_CLASS(Memory(cfg), cfg)
+            cpu.memory.load(0x4000, [0x12, 0x20, 0xFD])  # NOP / BRA $4000
+            cpu.program_counter.set(0x4000)
+            cpu.test_run2(start=0x4000, count=10)
+            trace_writer = cpu.trace_writer
+
+            cpu = cpu.to_speed_limit()
+            self.assertIs(cpu.trace_writer, trace_writer)
+            cpu.test_run2(start=0x4000, count=10)
+            cpu.close_trace()
+            self.assertTrue(trace_writer.fp.closed)
+
+            with trace_file.open("rb") as fp:
+                self.assertEqual(len(list(iter_trace_records(fp))), 20)
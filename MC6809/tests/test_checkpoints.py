@@ -0,0 +1,100 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the seek to a CPU cycle via checkpoints
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.cpu6809 import CPUBlockCache
+from MC6809.components.mc6809_checkpoints import CheckpointTimeline
+from MC6809.components.memory import Memory
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class CheckpointTimelineTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        self.reference_cpu = self.CPU_CLASS(Memory(cfg), cfg)
+        for cpu in (self.cpu, self.reference_cpu):
+            cpu.memory.load(0xfff8, [0x50, 0x00])  # IRQ vector
+            cpu.memory.load(0x5000, [
+                0x7C, 0x02, 0x00,  # 5000| INC $0200
+                0x3B,  # 5003| RTI
+            ])
+            cpu.memory.load(0x4000, [
+                0x8E, 0x00, 0x00,  # 4000| S LDX #$0000
+                0x4C,  # 4003| L INCA
+                0xA7, 0x89, 0x10, 0x00,  # 4004|   STA $1000,X
+                0x30, 0x01,  # 4008|   LEAX 1,X
+                0x8C, 0x08, 0x00,  # 400a|   CMPX #$0800
+                0x26, 0xF4,  # 400d|   BNE L
+                0x20, 0xEF,  # 400f|   BRA S
+            ])
+            cpu.program_counter.set(0x4000)
+            cpu.system_stack_pointer.set(0x0F00)
+            cpu.set_cc(0x00)
+            cpu.cycles = 0
+            cpu.irq_enabled = True
+            cpu.add_cycle_event(700, lambda cycles, cpu=cpu: cpu.irq(), period=700)
+
+    def get_reference_state(self, cycles):
+        self.assertLessEqual(self.reference_cpu.cycles, cycles)
+        self.reference_cpu.run_until(cycles=cycles)
+        return self.reference_cpu.get_state()
+
+    def test_seek(self):
+        timeline = CheckpointTimeline(self.cpu, interval=1000)
+        CheckpointTimeline(self.reference_cpu, interval=1000)  # same cycle events
+        self.cpu.run_cycles(50000)
+        self.assertEqual(len(timeline), 51)
+
+        for cycles in (123, 4567, 4600, 33333, 45000):
+            with self.subTest(cycles=cycles):
+                self.assertEqual(timeline.seek(cycles), self.get_reference_state(cycles)["cycles"])
+                self.assertEqual(self.cpu.get_state(), self.reference_cpu.get_state())
+
+        # Back to the end of the run, via the newest checkpoint:
+        self.cpu.memory.write_byte(0x3000, 0xff)  # not in the recorded run
+        timeline.seek(50000)
+        self.assertEqual(self.cpu.get_state(), self.get_reference_state(50000))
+
+        with self.assertRaises(ValueError):
+            timeline.seek(-1)
+
+    def test_only_changed_pages(self):
+        timeline = CheckpointTimeline(self.cpu, interval=1000)
+        self.cpu.run_cycles(20000)
+        checkpoints = list(timeline._checkpoints.values())
+        self.assertEqual(len(checkpoints[0].pages), 256)
+        for checkpoint in checkpoints[1:]:
+            # A part of the STA area, the counter and the stack:
+            self.assertLessEqual(len(checkpoint.pages), 5)
+
+    def test_max_checkpoints(self):
+        timeline = CheckpointTimeline(self.cpu, interval=1000, max_checkpoints=5)
+        CheckpointTimeline(self.reference_cpu, interval=1000)
+        self.cpu.run_cycles(10000)
+        self.assertEqual(len(timeline), 5)
+        timeline.seek(7500)  # The checkpoint at ~7000 is now the recently used one
+        used_cycles = timeline._checkpoint_cycles[1]
+        self.assertLessEqual(used_cycles, 7500)
+
+        self.cpu.run_cycles(6000)  # three new checkpoints
+        self.assertEqual(len(timeline), 5)
+        self.assertEqual(timeline._checkpoint_cycles[:2], [0, used_cycles])
+
+        # The removed checkpoints are merged into the following ones:
+        for cycles in (2500, 7500, 9500, 12500):
+            with self.subTest(cycles=cycles):
+                timeline.seek(cycles)
+                self.assertEqual(self.cpu.get_state(), self.get_reference_state(cycles))
+
+
+class BlockCacheCheckpointTimelineTestCase(CheckpointTimelineTestCase):
+    CPU_CLASS = CPUBlockCache
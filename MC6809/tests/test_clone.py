@@ -0,0 +1,146 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test cpu.clone()
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from unittest import mock
+
+from MC6809.components.cpu6809 import (
+    CPUBlockCache,
+    CPUDelayLoop,
+    CPUFast,
+    CPUIdleLoop,
+    CPULazyFlags,
+    CPUPackedFlags,
+    CPUReverse,
+    CPUTableDispatch,
+)
+from MC6809.components.cpu_utils.instruction_caller import OpCollection
+from MC6809.components.mc6809_interrupt import IRQ_LINE
+from MC6809.components.memory import PAGE_RAM
+from MC6809.tests.test_base import BaseCPUTestCase
+
+
+class CloneTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpu.memory.load(0x4000, [
+            0x86, 0x00,  # 4000|   LDA #$00
+            0x4C,  # 4002| L INCA
+            0xB7, 0x02, 0x00,  # 4003|   STA $0200
+            0x20, 0xFA,  # 4006|   BRA L
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.cycles = 0
+
+    def test_same_state(self):
+        self.cpu.run_cycles(200)
+        clone = self.cpu.clone()
+        self.assertIsInstance(clone, type(self.cpu))
+        self.assertIsNot(clone.memory, self.cpu.memory)
+        self.assertEqual(clone.get_state(), self.cpu.get_state())
+        self.assertEqual(clone.last_op_address, self.cpu.last_op_address)
+
+    def test_independent(self):
+        self.cpu.run_cycles(200)
+        clone = self.cpu.clone()
+        state = self.cpu.get_state()
+
+        clone.accu_b.set(0x12)
+        clone.memory.write_byte(0x0300, 0x34)
+        clone.run_cycles(500)
+        self.assertEqual(self.cpu.get_state(), state)
+
+        self.cpu.index_x.set(0x1234)
+        self.assertEqual(clone.index_x.value, 0x0000)
+        self.assertEqual(clone.memory.peek(0x0300), 0x34)
+
+    def test_same_run(self):
+        self.cpu.run_cycles(200)
+        clone = self.cpu.clone()
+        self.cpu.run_cycles(1000)
+        clone.run_cycles(1000)
+        self.assertEqual(clone.get_state(), self.cpu.get_state())
+
+    def test_breakpoints_not_copied(self):
+        self.cpu.add_breakpoint(0x4006)
+        self.cpu.add_watchpoint(0x0200)
+        clone = self.cpu.clone()
+        self.assertEqual(clone.memory.page_types[0x02], PAGE_RAM)
+        self.assertEqual(clone.memory.page_types[0x40], PAGE_RAM)
+        self.assertEqual(clone.run_until(cycles=1000), "cycles")
+        self.assertEqual(self.cpu.run_until(cycles=1000), "watchpoint")
+
+    def test_interrupt_lines(self):
+        self.cpu.assert_irq()
+        clone = self.cpu.clone()
+        self.assertEqual(clone.interrupt_pending, IRQ_LINE)
+        clone.release_irq()
+        self.assertEqual(self.cpu.interrupt_pending, IRQ_LINE)
+
+    def test_ops_not_collected(self):
+        with mock.patch.object(OpCollection, "_collect_ops", side_effect=AssertionError):
+            clone = self.cpu.clone()
+        self.assertIsNot(clone.op_collection, self.cpu.op_collection)
+        for cycles, func in clone.opcode_dict.values():
+            instruction = getattr(func, "__self__", None)  # None for the closures, e.g.: of the fast ops
+            if instruction is not None:
+                self.assertIs(instruction.cpu, clone)
+
+
+class TableDispatchCloneTestCase(CloneTestCase):
+    CPU_CLASS = CPUTableDispatch
+
+
+class BlockCacheCloneTestCase(CloneTestCase):
+    CPU_CLASS = CPUBlockCache
+
+    def test_code_watch_not_copied(self):
+        self.cpu.test_run(start=0x4000, end=0x4006)
+        self.assertIn(0x4000, self.cpu.block_cache)
+        clone = self.cpu.clone()
+        self.assertEqual(clone.block_cache, {})
+        self.assertEqual(clone.memory._write_byte_middleware, {})
+        self.assertEqual(clone.memory.page_types[0x40], PAGE_RAM)
+
+
+class FastCloneTestCase(CloneTestCase):
+    CPU_CLASS = CPUFast
+
+
+class LazyFlagsCloneTestCase(CloneTestCase):
+    CPU_CLASS = CPULazyFlags
+
+
+class PackedFlagsCloneTestCase(CloneTestCase):
+    CPU_CLASS = CPUPackedFlags
+
+
+class IdleLoopCloneTestCase(CloneTestCase):
+    CPU_CLASS = CPUIdleLoop
+
+
+class DelayLoopCloneTestCase(CloneTestCase):
+    CPU_CLASS = CPUDelayLoop
+
+
+class ReverseCloneTestCase(CloneTestCase):
+    CPU_CLASS = CPUReverse
+
+    def test_step_back(self):
+        self.cpu.run_cycles(500)
+        clone = self.cpu.clone()
+        state = clone.get_state()
+        clone.run_cycles(200)
+        self.assertNotEqual(clone.memory.peek(0x0200), self.cpu.memory.peek(0x0200))
+
+        # Only the steps of the clone are logged, in the log of the clone:
+        self.assertLess(clone.undo_steps, self.cpu.undo_steps)
+        clone.step_back(clone.undo_steps)
+        self.assertEqual(clone.get_state(), state)
@@ -172,9 +172,9 @@ class Test6809_CC(BaseCPUTestCase):
             self.assertEqual(status_byte, i)
 
     def test_AND(self):
-        excpected_values = list(range(0, 128))
-        excpected_values += list(range(0, 128))
-        excpected_values += list(range(0, 4))
+        excpected_values = list(range(128))
+        excpected_values += list(range(128))
+        excpected_values += list(range(4))
 
         for i in range(260):
             self.cpu.accu_a.set(i)
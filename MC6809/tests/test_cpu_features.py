@@ -0,0 +1,106 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the combinations of the CPU features
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import itertools
+import unittest
+
+from MC6809.components.cpu6809 import (
+    CPU,
+    CPU_FEATURES,
+    CPUBlockCache,
+    CPUFast,
+    get_cpu_class,
+)
+from MC6809.components.memory import Memory
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+PROGRAM = [
+    0xCE, 0x10, 0x00,  # 4000|     LDU #$1000
+    0x8E, 0x00, 0x40,  # 4003|     LDX #$0040
+    0xA8, 0xC0,  # 4006| BL: EORA ,U+      ; CRC16 of $1000-$103f
+    0x10, 0x8E, 0x00, 0x08,  # 4008| LDY #8
+    0x58,  # 400c| RL: ASLB
+    0x49,  # 400d|     ROLA
+    0x24, 0x04,  # 400e| BCC CL
+    0x88, 0x10,  # 4010| EORA #$10
+    0xC8, 0x21,  # 4012| EORB #$21
+    0x31, 0x3F,  # 4014| CL: LEAY -1,Y
+    0x26, 0xF4,  # 4016|     BNE RL
+    0x30, 0x1F,  # 4018|     LEAX -1,X
+    0x26, 0xEA,  # 401a|     BNE BL
+    0xFD, 0x02, 0x00,  # 401c| STD $0200
+    0x8E, 0x04, 0x00,  # 401f| LDX #$0400
+    0x30, 0x1F,  # 4022| DL: LEAX -1,X     ; delay loop
+    0x26, 0xFC,  # 4024|     BNE DL
+    0xB6, 0x03, 0x00,  # 4026| W: LDA $0300 ; idle loop, until the cycle event set $0300
+    0x27, 0xFB,  # 4029|     BEQ W
+    0x7C, 0x02, 0x01,  # 402b| INC $0201
+    0x20, 0xFE,  # 402e|     BRA *
+]
+
+
+class CPUFeaturesTestCase(unittest.TestCase):
+    def test_get_cpu_class(self):
+        self.assertIs(get_cpu_class(), CPU)
+        self.assertIs(get_cpu_class("fast"), CPUFast)
+        self.assertIs(get_cpu_class("block_cache", "block_cache"), CPUBlockCache)
+
+        cpu_class = get_cpu_class("idle_loop", "block_cache")
+        self.assertIs(get_cpu_class("block_cache", "idle_loop"), cpu_class)
+        self.assertEqual(cpu_class.__name__, "CPUBlockCacheIdleLoop")
+        self.assertTrue(issubclass(cpu_class, CPU))
+
+    def test_invalid_features(self):
+        with self.assertRaisesRegex(ValueError, "Unknown CPU feature 'turbo'"):
+            get_cpu_class("fast", "turbo")
+        with self.assertRaisesRegex(ValueError, "fast, lazy_flags can't be combined"):
+            get_cpu_class("lazy_flags", "fast")
+        with self.assertRaisesRegex(ValueError, "block_cache, reverse can't be combined"):
+            get_cpu_class("reverse", "block_cache", "idle_loop")
+
+    def run_program(self, cpu_class):
+        cfg = TestCfg(BaseCPUTestCase.UNITTEST_CFG_DICT)
+        cpu = cpu_class(Memory(cfg), cfg)
+        cpu.memory.load(0x1000, range(0x40))
+        cpu.memory.load(0x4000, PROGRAM)
+        cpu.program_counter.set(0x4000)
+        cpu.cycles = 0
+
+        calls = []
+        cpu.add_sync_callback(500, calls.append)
+        cpu.add_cycle_event(60000, lambda cycles: cpu.memory.poke_range(0x0300, [0x01]))
+        self.assertEqual(cpu.run_until(pc=0x402e, cycles=200000), "pc")
+        cpu.run_cycles(1000)
+        return cpu, calls
+
+    def test_combinations(self):
+        cpu, calls = self.run_program(CPU)
+        state = cpu.get_state()
+        # The CRC16 $2bf5 of $1000-$103f and the INC after the idle loop:
+        self.assertEqual(state["RAM"][0x0200:0x0202], bytes([0x2b, 0xf6]))
+        self.assertGreater(state["cycles"], 60000)
+
+        for count in (2, 3, 4):
+            for features in itertools.combinations(CPU_FEATURES, count):
+                try:
+                    cpu_class = get_cpu_class(*features)
+                except ValueError:
+                    continue
+                with self.subTest(features=features):
+                    cpu, cpu_calls = self.run_program(cpu_class)
+
+                    # Exactly the same result as without the features:
+                    self.assertEqual(cpu.get_state(), state)
+                    self.assertEqual(cpu_calls, calls)
+                    if "idle_loop" in features or "delay_loop" in features:
+                        self.assertGreater(cpu.skipped_cycles, 10000)
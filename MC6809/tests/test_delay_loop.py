@@ -0,0 +1,93 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the closed-form fast-forward of delay loops
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.cpu6809 import CPU, CPUDelayLoop
+from MC6809.components.memory import Memory
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class DelayLoopTestCase(BaseCPUTestCase):
+    CPU_CLASS = CPUDelayLoop
+
+    def setUp(self):
+        super().setUp()
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        self.normal_cpu = CPU(Memory(cfg), cfg)
+
+    def run_both(self, mem, events=(), end=0x4000 + 0x10):
+        calls = {}
+        for cpu in (self.cpu, self.normal_cpu):
+            cpu.memory.load(0x4000, mem)
+            cpu.program_counter.set(0x4000)
+            cpu.cycles = 0
+            calls[cpu] = cpu_calls = []
+            for cycles in events:
+                cpu.add_cycle_event(cycles, cpu_calls.append)
+            self.assertEqual(cpu.run_until(pc=end), "pc")
+
+        # Exactly the same result as without fast-forward:
+        self.assertEqual(self.cpu.get_state(), self.normal_cpu.get_state())
+        self.assertEqual(calls[self.cpu], calls[self.normal_cpu])
+        return calls[self.cpu]
+
+    def test_leax(self):
+        self.run_both(mem=[
+            0x8E, 0xFF, 0xFF,  # 4000|   LDX #$FFFF
+            0x30, 0x1F,  # 4003| L LEAX -1,X
+            0x26, 0xFC,  # 4005|   BNE L
+            0x4C,  # 4007|   INCA
+            0x20, 0x07,  # 4008|   BRA $4011
+        ], end=0x4011)
+        self.assertEqual(self.cpu.index_x.value, 0)
+        self.assertEqual(self.cpu.accu_a.value, 1)
+        self.assertGreater(self.cpu.skipped_cycles, 0xFFF0 * 11)
+
+    def test_decb_flags(self):
+        for start in (0x00, 0x01, 0x02, 0x80, 0x81, 0xFF):
+            with self.subTest(start=start):
+                self.run_both(mem=[
+                    0xC6, start,  # 4000|   LDB #start
+                    0x5A,  # 4002| L DECB
+                    0x26, 0xFD,  # 4003|   BNE L
+                    0x20, 0x09,  # 4005|   BRA $4010
+                ], end=0x4010)
+                self.assertEqual(self.cpu.accu_b.value, 0)
+
+    def test_lbne(self):
+        self.run_both(mem=[
+            0xC6, 0x10,  # 4000|   LDB #$10
+            0x5A,  # 4002| L DECB
+            0x10, 0x26, 0xFF, 0xFB,  # 4003|   LBNE L
+        ], end=0x4007)
+        self.assertEqual(self.cpu.skipped_cycles, 0)
+
+    def test_leay_with_events(self):
+        calls = self.run_both(mem=[
+            0x10, 0x8E, 0x10, 0x00,  # 4000|   LDY #$1000
+            0x31, 0x3F,  # 4004| L LEAY -1,Y
+            0x26, 0xFC,  # 4006|   BNE L
+            0x20, 0x08,  # 4008|   BRA $4012
+        ], events=[1000, 1001, 5000, 30000], end=0x4012)
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(self.cpu.index_y.value, 0)
+
+    def test_breakpoint_in_loop(self):
+        self.cpu.add_breakpoint(0x4002, condition="b == 3")
+        self.cpu.memory.load(0x4000, [
+            0xC6, 0x10,  # 4000|   LDB #$10
+            0x5A,  # 4002| L DECB
+            0x26, 0xFD,  # 4003|   BNE L
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.assertEqual(self.cpu.run_until(pc=0x4005), "breakpoint")
+        self.assertEqual(self.cpu.accu_b.value, 3)
+        self.assertEqual(self.cpu.skipped_cycles, 0)
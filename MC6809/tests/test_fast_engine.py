@@ -0,0 +1,112 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the fast engine with generated concrete functions per opcode
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import io
+from pathlib import Path
+
+from MC6809.components.cpu6809 import CPU, CPUFast
+from MC6809.components.cpu_utils import instruction_fast
+from MC6809.components.cpu_utils.Instruction_generator import generate_fast_code
+from MC6809.components.MC6809data.MC6809_data_utils import MC6809OP_DATA_DICT
+from MC6809.components.memory import Memory
+from MC6809.tests import (
+    test_6809_address_modes,
+    test_6809_arithmetic,
+    test_6809_arithmetic_shift,
+    test_6809_branch_instructions,
+    test_6809_program,
+    test_6809_register_changes,
+    test_6809_StoreLoad,
+    test_accumulators,
+    test_condition_code_register,
+    test_cpu6809,
+)
+from MC6809.tests.test_base import BaseCPUTestCase, cpu_variant_test_cases
+from MC6809.tests.test_config import TestCfg
+
+
+class FastEngineTestCase(BaseCPUTestCase):
+    CPU_CLASS = CPUFast
+
+    def test_generated_code_up_to_date(self):
+        f = io.StringIO()
+        generate_fast_code(f)
+        self.assertEqual(
+            f.getvalue(),
+            Path(instruction_fast.__file__).read_text(),
+            "instruction_fast.py is outdated: Please run Instruction_generator.py",
+        )
+
+    def test_all_ops_replaced(self):
+        for op_code, (cycles, func) in self.cpu.opcode_dict.items():
+            if MC6809OP_DATA_DICT[op_code]["addr_mode"] is None:
+                continue  # RESET, PAGE 1/2
+            self.assertTrue(func.__name__.startswith(f"op_{op_code:02x}_"), func.__name__)
+
+    def test_trace_use_normal_ops(self):
+        cfg = TestCfg(dict(self.UNITTEST_CFG_DICT, trace=True))
+        cpu = CPUFast(Memory(cfg), cfg)
+        __, func = cpu.opcode_dict[0x86]
+        self.assertFalse(func.__name__.startswith("op_"))
+
+    def test_lea_zero_flag_with_wrap_around(self):
+        self.cpu.index_x.set(0xffff)
+        self.cpu_test_run(start=0x4000, end=None, mem=[
+            0x30, 0x01,  # LEAX 1,X
+        ])
+        self.assertEqualHex(self.cpu.index_x.value, 0x0000)
+        self.assertEqual(self.cpu.Z, 1)
+
+    def test_same_state_as_normal_cpu(self):
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        cpu = CPU(Memory(cfg), cfg)
+        mem = [
+            0x10, 0xce, 0x50, 0x00,  # LDS #$5000
+            0xcc, 0x80, 0x7f,  # LDD #$807f
+            0xed, 0xe3,  # STD ,--S
+            0x8e, 0x00, 0x03,  # LDX #$0003
+            0x8d, 0x0b,  # BSR +11
+            0x30, 0x1f,  # LEAX -1,X
+            0x26, 0xfa,  # BNE -6
+            0x10, 0xa3, 0xe1,  # CMPD ,S++
+            0x1f, 0x8b,  # TFR A,DP
+            0x20, 0x09,  # BRA +9
+            # subroutine:
+            0x8b, 0x55,  # ADDA #$55
+            0xc2, 0x11,  # SBCB #$11
+            0x0c, 0x10,  # INC $10 (direct page)
+            0x19,  # DAA
+            0x39,  # RTS
+            0x12,  # NOP
+            0x12,  # NOP
+        ]
+        cpu.memory.load(0x4000, mem)
+        cpu.test_run(start=0x4000, end=0x4000 + len(mem))
+        self.cpu_test_run(start=0x4000, end=0x4000 + len(mem), mem=mem)
+        self.assertEqual(self.cpu.get_state(), cpu.get_state())
+
+
+globals().update(
+    cpu_variant_test_cases(
+        CPUFast,
+        "Fast",
+        test_6809_address_modes,
+        test_6809_arithmetic,
+        test_6809_arithmetic_shift,
+        test_6809_branch_instructions,
+        test_6809_program,
+        test_6809_register_changes,
+        test_6809_StoreLoad,
+        test_accumulators,
+        test_condition_code_register,
+        test_cpu6809,
+    )
+)
@@ -0,0 +1,121 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the idle loop fast-forward
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.cpu6809 import CPU, CPUIdleLoop
+from MC6809.components.memory import Memory
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class IdleLoopTestCase(BaseCPUTestCase):
+    CPU_CLASS = CPUIdleLoop
+
+    def setUp(self):
+        super().setUp()
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        self.normal_cpu = CPU(Memory(cfg), cfg)
+
+    def run_both(self, mem, events, run_cycles):
+        calls = {}
+        for cpu in (self.cpu, self.normal_cpu):
+            cpu.memory.load(0x4000, mem)
+            cpu.program_counter.set(0x4000)
+            cpu.cycles = 0
+            calls[cpu] = cpu_calls = []
+            for cycles, func in events:
+                def callback(cycles, cpu=cpu, func=func, cpu_calls=cpu_calls):
+                    cpu_calls.append(cycles)
+                    func(cpu)
+
+                cpu.add_cycle_event(cycles, callback)
+            cpu.run_cycles(run_cycles)
+
+        # Exactly the same result as without fast-forward:
+        self.assertEqual(self.cpu.get_state(), self.normal_cpu.get_state())
+        self.assertEqual(calls[self.cpu], calls[self.normal_cpu])
+        return calls[self.cpu]
+
+    def test_branch_to_itself(self):
+        calls = self.run_both(
+            mem=[0x20, 0xFE],  # 4000| BRA *
+            events=[(10000, lambda cpu: None), (20000, lambda cpu: None)],
+            run_cycles=30000,
+        )
+        self.assertEqual(len(calls), 2)
+        self.assertGreater(self.cpu.skipped_cycles, 29000)
+
+    def test_polling_loop(self):
+        calls = self.run_both(
+            mem=[
+                0xB6, 0x50, 0x00,  # 4000| L LDA $5000
+                0x2A, 0xFB,  # 4003|   BPL L
+                0x4C,  # 4005|   INCA
+                0x20, 0xFE,  # 4006|   BRA *
+            ],
+            events=[(5000, lambda cpu: cpu.memory.poke_range(0x5000, [0x80]))],
+            run_cycles=6000,
+        )
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cpu.accu_a.value, 0x81)
+        self.assertEqual(self.cpu.program_counter.value, 0x4006)
+        self.assertGreater(self.cpu.skipped_cycles, 4500)
+
+    def test_loop_with_write(self):
+        self.run_both(
+            mem=[
+                0xB7, 0x50, 0x00,  # 4000| L STA $5000
+                0x20, 0xFB,  # 4003|   BRA L
+            ],
+            events=[(5000, lambda cpu: None)],
+            run_cycles=6000,
+        )
+        self.assertEqual(self.cpu.skipped_cycles, 0)
+
+    def test_inspected_once(self):
+        self.cpu.memory.load(0x4000, [
+            0xB7, 0x50, 0x00,  # 4000| L STA $5000
+            0x20, 0xFB,  # 4003|   BRA L
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.run_cycles(1000)
+        self.assertEqual(self.cpu._no_idle_loops, {0x4003})
+        self.assertEqual(self.cpu.skipped_cycles, 0)
+
+        # The loaded code is inspected again:
+        self.cpu.memory.load(0x4000, [0xB6])  # 4000| L LDA $5000
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.run_cycles(1000)
+        self.assertEqual(self.cpu._no_idle_loops, set())
+        self.assertGreater(self.cpu.skipped_cycles, 900)
+
+    def test_run_end_is_deadline(self):
+        self.run_both(mem=[0x20, 0xFE], events=[], run_cycles=1000)
+        self.assertGreater(self.cpu.skipped_cycles, 900)
+
+    def test_no_deadline(self):
+        self.cpu.memory.load(0x4000, [0x20, 0xFE])  # BRA *
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.outer_burst_op_count = 1
+        self.cpu.burst_run()  # 100 ops
+        self.assertEqual(self.cpu.cycles, 100 * 5)
+        self.assertEqual(self.cpu.skipped_cycles, 0)
+
+    def test_burst_run(self):
+        calls = []
+        self.cpu.memory.load(0x4000, [0x20, 0xFE])  # BRA *
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.add_cycle_event(1000, calls.append, period=1000)
+        self.cpu.outer_burst_op_count = 1
+        self.cpu.burst_run()  # 100 ops
+        self.assertGreater(len(calls), 10)
+        for index, cycles in enumerate(calls, 1):
+            self.assertGreaterEqual(cycles, index * 1000)
+            self.assertLess(cycles, index * 1000 + 5)
@@ -0,0 +1,182 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the interrupt lines and the software interrupts
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from unittest import mock
+
+from MC6809.components.cpu6809 import CPUBlockCache, CPUFast, CPUPackedFlags, CPUTableDispatch
+from MC6809.components.mc6809_interrupt import FIRQ_LINE, IRQ_LINE
+from MC6809.tests.test_base import BaseCPUTestCase
+
+
+HANDLERS = {  # vector -> handler address
+    0xfff2: 0x5500,  # SWI3
+    0xfff4: 0x5400,  # SWI2
+    0xfff6: 0x5100,  # FIRQ
+    0xfff8: 0x5000,  # IRQ
+    0xfffa: 0x5300,  # SWI
+    0xfffc: 0x5200,  # NMI
+}
+
+
+class InterruptTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        for vector, handler in HANDLERS.items():
+            self.cpu.memory.load(vector, [handler >> 8, handler & 0xff])
+            self.cpu.memory.load(handler, [
+                0x7C, handler >> 8 & 0x0f, 0x00,  # INC $0n00 (count the calls)
+                0x3B,  # RTI
+            ])
+        self.cpu.memory.load(0x4000, [
+            0x5C,  # 4000| L INCB
+            0x20, 0xFD,  # 4001|   BRA L
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.system_stack_pointer.set(0x1000)
+        self.cpu.set_cc(0x00)
+        self.cpu.cycles = 0
+
+    def run_to(self, pc):
+        return self.cpu.run_until(pc=pc, cycles=self.cpu.cycles + 1000)
+
+    def assertHandlerCalls(self, handler, count):
+        self.assertEqual(self.cpu.memory.peek((handler >> 8 & 0x0f) << 8), count)
+
+    def test_irq(self):
+        self.cpu.set_cc(0x10)  # IRQ masked
+        self.cpu.assert_irq()
+        self.assertEqual(self.cpu.interrupt_pending, 0)
+        self.cpu.run_cycles(100)
+        self.assertHandlerCalls(0x5000, 0)
+
+        self.cpu.set_cc(0x00)
+        self.assertEqual(self.cpu.interrupt_pending, IRQ_LINE)
+        self.assertEqual(self.run_to(0x5000), "pc")
+        self.assertEqual(self.cpu.system_stack_pointer.value, 0x1000 - 12)  # entire state pushed
+        self.assertEqual(self.cpu.memory.peek(0x1000 - 12), 0x80)  # pushed CC: E set, I clear
+        self.assertEqual(self.cpu.get_cc_value() & 0x50, 0x10)  # I set, F not
+        self.assertEqual(self.cpu.interrupt_pending, 0)
+
+        # Level triggered: The handler is called again, until the line is released:
+        self.cpu.run_cycles(100)
+        self.assertGreater(self.cpu.memory.peek(0x0000), 1)
+        self.cpu.release_irq()
+        self.cpu.run_until(pc=0x4000)
+        calls = self.cpu.memory.peek(0x0000)
+        self.cpu.run_cycles(100)
+        self.assertHandlerCalls(0x5000, calls)
+
+    def test_firq(self):
+        self.cpu.accu_b.set(0x10)
+        self.cpu.assert_firq()
+        self.assertEqual(self.cpu.interrupt_pending, FIRQ_LINE)
+        self.assertEqual(self.run_to(0x5100), "pc")
+        self.assertEqual(self.cpu.system_stack_pointer.value, 0x1000 - 3)  # PC and CC pushed
+        self.assertEqual(self.cpu.get_cc_value() & 0xd0, 0x50)  # E clear, I and F set
+
+        self.cpu.release_firq()
+        self.cpu.accu_b.set(0x00)
+        self.assertEqual(self.run_to(0x4000), "pc")
+        self.assertEqual(self.cpu.accu_b.value, 0x00)  # not restored by RTI
+        self.assertEqual(self.cpu.system_stack_pointer.value, 0x1000)
+        self.assertHandlerCalls(0x5100, 1)
+
+    def test_nmi(self):
+        self.cpu.set_cc(0x50)  # NMI can't be masked
+        self.cpu.assert_nmi()
+        self.cpu.assert_nmi()  # edge triggered: no second NMI
+        self.assertEqual(self.run_to(0x5200), "pc")
+        self.assertEqual(self.run_to(0x4000), "pc")
+        self.cpu.run_cycles(100)
+        self.assertHandlerCalls(0x5200, 1)
+
+        self.cpu.release_nmi()
+        self.cpu.assert_nmi()
+        self.cpu.run_cycles(100)
+        self.assertHandlerCalls(0x5200, 2)
+
+    def test_priority(self):
+        self.cpu.assert_irq()
+        self.cpu.assert_firq()
+        self.cpu.assert_nmi()
+        self.cpu.test_run2(start=0x4000, count=2)  # the NMI entry and the INC in the handler
+        self.assertHandlerCalls(0x5200, 1)
+        self.assertHandlerCalls(0x5100, 0)
+        self.assertHandlerCalls(0x5000, 0)
+
+    def test_assert_by_event(self):
+        self.cpu.add_cycle_event(50, lambda cycles: self.cpu.assert_irq())
+        self.assertEqual(self.run_to(0x5000), "pc")
+        self.assertGreaterEqual(self.cpu.cycles, 50)
+        self.assertLess(self.cpu.cycles, 100)
+
+    def test_irq_func(self):
+        self.cpu.irq()  # irq_enabled is False
+        self.assertEqual(self.cpu.program_counter.value, 0x4000)
+
+        self.cpu.irq_enabled = True
+        self.cpu.set_cc(0x10)  # IRQ masked
+        self.cpu.irq()
+        self.assertEqual(self.cpu.program_counter.value, 0x4000)
+
+        # The registers are pushed depending on E and CC is not changed:
+        self.cpu.set_cc(0x00)
+        self.cpu.irq()
+        self.assertEqual(self.cpu.program_counter.value, 0x5000)
+        self.assertEqual(self.cpu.system_stack_pointer.value, 0x1000 - 3)  # PC and CC pushed
+        self.assertEqual(self.cpu.get_cc_value(), 0x00)
+
+        self.cpu.set_cc(0x80)
+        self.cpu.irq()
+        self.assertEqual(self.cpu.system_stack_pointer.value, 0x1000 - 3 - 12)  # entire state pushed
+        self.assertEqual(self.cpu.get_cc_value(), 0x80)
+
+    def test_irq_enabled_class_attribute(self):
+        self.assertNotIn("irq_enabled", self.cpu.__dict__)
+        with mock.patch.object(self.CPU_CLASS, "irq_enabled", True):
+            self.cpu.irq()
+        self.assertEqual(self.cpu.program_counter.value, 0x5000)
+
+    def test_software_interrupts(self):
+        for code, handler, cc_mask in (
+            ([0x3F], 0x5300, 0x50),  # SWI
+            ([0x10, 0x3F], 0x5400, 0x00),  # SWI2
+            ([0x11, 0x3F], 0x5500, 0x00),  # SWI3
+        ):
+            with self.subTest(handler=hex(handler)):
+                self.cpu.memory.load(0x4100, code + [0x12])  # SWIx + NOP
+                self.cpu.set_cc(0x00)
+                self.cpu.accu_a.set(0x12)
+                self.cpu.program_counter.set(0x4100)
+                self.assertEqual(self.run_to(handler), "pc")
+                self.assertEqual(self.cpu.system_stack_pointer.value, 0x1000 - 12)
+                self.assertEqual(self.cpu.get_cc_value() & 0xd0, 0x80 | cc_mask)
+
+                self.cpu.accu_a.set(0x00)
+                self.assertEqual(self.run_to(0x4100 + len(code)), "pc")
+                self.assertEqual(self.cpu.accu_a.value, 0x12)  # restored by RTI
+                self.assertHandlerCalls(handler, 1)
+
+
+class TableDispatchInterruptTestCase(InterruptTestCase):
+    CPU_CLASS = CPUTableDispatch
+
+
+class BlockCacheInterruptTestCase(InterruptTestCase):
+    CPU_CLASS = CPUBlockCache
+
+
+class PackedFlagsInterruptTestCase(InterruptTestCase):
+    CPU_CLASS = CPUPackedFlags
+
+
+class FastInterruptTestCase(InterruptTestCase):
+    CPU_CLASS = CPUFast
@@ -0,0 +1,114 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the lazy condition code evaluation:
+    Run the existing CPU tests again with CPULazyFlags
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import itertools
+
+from MC6809.components.cpu6809 import CPU, CPULazyFlags
+from MC6809.components.memory import Memory
+from MC6809.tests import (
+    test_6809_address_modes,
+    test_6809_arithmetic,
+    test_6809_arithmetic_shift,
+    test_6809_branch_instructions,
+    test_6809_program,
+    test_6809_register_changes,
+    test_6809_StoreLoad,
+    test_accumulators,
+    test_condition_code_register,
+    test_cpu6809,
+)
+from MC6809.tests.test_base import BaseCPUTestCase, cpu_variant_test_cases
+from MC6809.tests.test_config import TestCfg
+
+
+class LazyFlagsTestCase(BaseCPUTestCase):
+    CPU_CLASS = CPULazyFlags
+
+    def test_update_is_pending(self):
+        self.cpu.set_cc(0x00)
+        self.cpu.clear_NZVC()
+        self.cpu.update_NZVC_8(a=0x80, b=0x80, r=0x100)
+        self.assertEqual(self.cpu._lazy_mask, 0x0e)  # The carry is set directly
+        self.assertEqual(self.cpu.C, 1)
+        self.assertEqual(self.cpu.get_cc_value(), 0x07)  # materialize the flags
+        self.assertEqual(self.cpu._lazy_mask, 0x00)
+        self.assertEqual(self.cpu.Z, 1)
+
+    def test_partial_overwrite(self):
+        # ADDA set H, but a following LDA doesn't touch H and C
+        self.cpu.set_cc(0x00)
+        self.cpu.clear_HNZVC()
+        self.cpu.update_HNZVC_8(a=0x0f, b=0x01, r=0x10)
+        self.cpu.clear_NZV()
+        self.cpu.update_NZ0_8(r=0x80)
+        self.assertEqualHex(self.cpu.get_cc_value(), 0x28)
+
+    def test_set_cc_discard_pending(self):
+        self.cpu.clear_NZVC()
+        self.cpu.update_0100()
+        self.cpu.set_cc(0xff)
+        self.assertEqualHex(self.cpu.get_cc_value(), 0xff)
+
+    def test_same_as_eager(self):
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        eager = CPU(Memory(cfg), cfg)
+
+        for cpu in (eager, self.cpu):
+            cpu.set_cc(0x00)
+        for a, b in itertools.product(range(0, 0x100, 7), repeat=2):
+            r = a + b
+            for cpu in (eager, self.cpu):
+                cpu.clear_HNZVC()
+                cpu.update_HNZVC_8(a, b, r)
+                cpu.clear_NZV()
+                cpu.update_NZ0_8(r & 0xff)
+            self.assertEqual(self.cpu.get_cc_value(), eager.get_cc_value(), f"{a=} {b=}")
+
+    def test_program_result(self):
+        self.cpu_test_run(start=0x4000, end=None, mem=[
+            0x86, 0x7f,  # LDA #$7f
+            0x8b, 0x01,  # ADDA #$01 -> overflow
+            0x29, 0x02,  # BVS +2
+            0x86, 0x00,  # LDA #$00 (skipped)
+            0x1f, 0xa9,  # TFR CC,B
+        ])
+        self.assertEqualHex(self.cpu.accu_a.value, 0x80)
+        self.assertEqualHex(self.cpu.accu_b.value, 0x2a)
+
+    def test_shift_keeps_pending_flags(self):
+        # LSRA doesn't touch H and V of the pending ADDA flags
+        self.cpu_test_run(start=0x4000, end=None, mem=[
+            0x86, 0x7f,  # LDA #$7f
+            0x8b, 0x01,  # ADDA #$01 -> H and V set
+            0x44,        # LSRA
+            0x1f, 0xa9,  # TFR CC,B
+        ])
+        self.assertEqualHex(self.cpu.accu_a.value, 0x40)
+        self.assertEqualHex(self.cpu.accu_b.value, 0x22)
+
+
+globals().update(
+    cpu_variant_test_cases(
+        CPULazyFlags,
+        "Lazy",
+        test_6809_address_modes,
+        test_6809_arithmetic,
+        test_6809_arithmetic_shift,
+        test_6809_branch_instructions,
+        test_6809_program,
+        test_6809_register_changes,
+        test_6809_StoreLoad,
+        test_accumulators,
+        test_condition_code_register,
+        test_cpu6809,
+    )
+)
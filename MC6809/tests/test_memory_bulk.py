@@ -0,0 +1,74 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test bulk load, buffer export and snapshot/restore of the memory
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import hashlib
+
+from MC6809.tests.test_base import BaseCPUTestCase
+
+
+class MemoryBulkTestCase(BaseCPUTestCase):
+    def test_load(self):
+        load_calls = []
+        self.cpu.memory.add_load_callback(lambda start, end: load_calls.append((start, end)))
+
+        self.cpu.memory.load(0x1000, [0x01, 0x02, 0x03])
+        self.cpu.memory.load(0x2000, b"\x04\x05")
+        self.cpu.memory.load(0x3000, "AB")
+        self.cpu.memory.load(0x4000, (value for value in (0x06, 0x07)))
+        self.assertEqual(self.cpu.memory.get(0x1000, 0x1003), [0x01, 0x02, 0x03])
+        self.assertEqual(self.cpu.memory.get(0x2000, 0x2002), [0x04, 0x05])
+        self.assertEqual(self.cpu.memory.get(0x3000, 0x3002), [0x41, 0x42])
+        self.assertEqual(self.cpu.memory.get(0x4000, 0x4002), [0x06, 0x07])
+        self.assertEqual(
+            load_calls, [(0x1000, 0x1002), (0x2000, 0x2001), (0x3000, 0x3001), (0x4000, 0x4001)]
+        )
+
+    def test_load_invalid_data(self):
+        with self.assertRaises(OverflowError):
+            self.cpu.memory.load(0x1000, [0x01, 0x100])
+        self.assertEqual(self.cpu.memory.peek(0x1000), 0x00)  # nothing stored
+
+        with self.assertRaisesRegex(OverflowError, "data length: 3Bytes"):
+            self.cpu.memory.load(0x1000, (value * 0x80 for value in range(3)))
+
+        with self.assertRaises(IndexError):
+            self.cpu.memory.load(0xffff, [0x01, 0x02])
+
+    def test_buffer(self):
+        memory = self.cpu.memory
+        self.assertEqual(len(memory.buffer), 0x10000)
+        self.assertTrue(memory.buffer.readonly)
+
+        memory.load(0x1234, [0xab])
+        self.assertEqual(memory.buffer[0x1234], 0xab)  # no copy: changes are visible
+        self.assertEqual(hashlib.sha1(memory.buffer).hexdigest(), hashlib.sha1(memory.snapshot()).hexdigest())
+
+    def test_snapshot_restore(self):
+        memory = self.cpu.memory
+        memory.load(0x1000, [0x01, 0x02])
+        snapshot = memory.snapshot()
+        self.assertIsInstance(snapshot, bytes)
+
+        memory.load(0x1000, [0xff, 0xff])
+        memory.restore(snapshot)
+        self.assertEqual(memory.get(0x1000, 0x1002), [0x01, 0x02])
+
+        with self.assertRaises(ValueError):
+            memory.restore(b"\x00")
+
+    def test_get_set_state(self):
+        self.cpu.memory.load(0x4000, [0x12, 0x34])
+        state = self.cpu.get_state()
+        self.assertEqual(state["RAM"][0x4000:0x4002], b"\x12\x34")
+
+        self.cpu.memory.load(0x4000, [0x00, 0x00])
+        self.cpu.set_state(state)
+        self.assertEqual(self.cpu.memory.get(0x4000, 0x4002), [0x12, 0x34])
@@ -0,0 +1,113 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the page table of the memory map
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.memory import PAGE_HANDLERS, PAGE_RAM, PAGE_ROM, Memory
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class MemoryPagesTestCase(BaseCPUTestCase):
+    def test_initial_page_types(self):
+        page_types = self.cpu.memory.page_types
+        self.assertEqual(page_types[0x00], PAGE_RAM)
+        self.assertEqual(page_types[0x7f], PAGE_RAM)
+        self.assertEqual(page_types[0x80], PAGE_ROM)
+        self.assertEqual(page_types[0xff], PAGE_ROM)
+
+        # Addresses outside of $0000-$ffff use the slow path:
+        self.assertEqual(page_types[0x100], PAGE_HANDLERS)
+        self.assertEqual(page_types[-1 >> 8], PAGE_HANDLERS)
+
+    def test_partial_rom_page(self):
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        cfg.ROM_START = 0x8080
+        memory = Memory(cfg)
+        memory.cpu = self.cpu
+        self.assertEqual(memory.page_types[0x7f], PAGE_RAM)
+        self.assertEqual(memory.page_types[0x80], PAGE_HANDLERS)
+        self.assertEqual(memory.page_types[0x81], PAGE_ROM)
+
+        memory.write_byte(0x8000, 0x12)
+        memory.write_byte(0x8080, 0x34)
+        self.assertEqual(memory._mem[0x8000], 0x12)
+        self.assertEqual(memory._mem[0x8080], 0x00)  # write into ROM ignored
+
+    def test_rom_write_ignored(self):
+        self.cpu.memory.write_byte(0x9000, 0x12)
+        self.cpu.memory.write_word(0x9010, 0x3456)
+        self.assertEqual(self.cpu.memory.read_byte(0x9000), 0x00)
+        self.assertEqual(self.cpu.memory.read_word(0x9010), 0x0000)
+
+    def test_word_fast_path(self):
+        memory = self.cpu.memory
+        self.cpu.cycles = 0
+        memory.write_word(0x1000, 0x1234)
+        self.assertEqual(self.cpu.cycles, 2)
+        self.assertEqual(memory.read_word(0x1000), 0x1234)
+        self.assertEqual(self.cpu.cycles, 4)
+        self.assertEqual(memory.read_byte(0x1000), 0x12)
+        self.assertEqual(memory.read_byte(0x1001), 0x34)
+        self.assertEqual(self.cpu.cycles, 6)
+
+    def test_word_across_pages(self):
+        memory = self.cpu.memory
+        memory.add_read_byte_middleware(lambda cycles, last_op_address, address, byte: 0xff, 0x1100)
+
+        self.cpu.cycles = 0
+        memory.write_word(0x10ff, 0x1234)
+        self.assertEqual(memory.read_word(0x10ff), 0x12ff)
+        self.assertEqual(self.cpu.cycles, 4)
+
+    def test_callback_marks_page_slow(self):
+        memory = self.cpu.memory
+        calls = []
+
+        def write_callback(cycles, last_op_address, address, value):
+            calls.append((address, value))
+
+        memory.add_write_byte_callback(write_callback, 0x20fe, 0x2101)
+        self.assertEqual(memory.page_types[0x1f], PAGE_RAM)
+        self.assertEqual(memory.page_types[0x20], PAGE_HANDLERS)
+        self.assertEqual(memory.page_types[0x21], PAGE_HANDLERS)
+        self.assertEqual(memory.page_types[0x22], PAGE_RAM)
+        self.assertFalse(memory.is_plain_page(0x2000))
+
+        memory.write_byte(0x20ff, 0x12)
+        memory.write_word(0x2100, 0x3456)
+        memory.write_byte(0x2102, 0x78)
+        self.assertEqual(calls, [(0x20ff, 0x12), (0x2100, 0x34), (0x2101, 0x56)])
+        self.assertEqual(memory._mem[0x2102], 0x78)
+
+    def test_remove_middleware(self):
+        memory = self.cpu.memory
+
+        def middleware(cycles, last_op_address, address, value):
+            return value + 1
+
+        memory.add_write_byte_middleware(middleware, 0x3000, 0x3001)
+        memory.add_write_byte_middleware(middleware, 0x3001)  # replace: no extra handler
+        memory.write_byte(0x3000, 0x10)
+        self.assertEqual(memory.read_byte(0x3000), 0x11)
+
+        memory.remove_write_byte_middleware(0x3000)
+        self.assertEqual(memory.page_types[0x30], PAGE_HANDLERS)
+        memory.remove_write_byte_middleware(0x3001)
+        self.assertEqual(memory.page_types[0x30], PAGE_RAM)
+        self.assertEqual(memory._write_byte_middleware, {})
+
+        memory.write_byte(0x3000, 0x10)
+        self.assertEqual(memory.read_byte(0x3000), 0x10)
+
+    def test_out_of_range_value(self):
+        with self.assertRaises(OverflowError):
+            self.cpu.memory.write_byte(0x1000, 0x100)
+        with self.assertRaises(OverflowError):
+            self.cpu.memory.write_word(0x1000, -1)
@@ -0,0 +1,89 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the side-effect-free peek/poke memory access
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.cpu6809 import CPUBlockCache
+from MC6809.components.mc6809_disassembler import disassemble
+from MC6809.tests.test_base import BaseCPUTestCase
+
+
+class MemoryPeekTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        self.memory = self.cpu.memory
+        self.memory.load(0x1000, [0x12, 0x34, 0x56, 0x78])
+
+        self.calls = []
+        self.memory.add_read_byte_callback(self.read_callback, 0x1000, 0x1003)
+
+    def read_callback(self, cycles, last_op_address, address):
+        self.calls.append(address)
+        return 0xff
+
+    def test_peek(self):
+        self.cpu.cycles = 0
+        self.assertEqual(self.memory.peek(0x1001), 0x34)
+        self.assertEqual(bytes(self.memory.peek_range(0x1000, 0x1004)), b"\x12\x34\x56\x78")
+        self.assertEqual(self.memory.get(0x1000, 0x1003), [0x12, 0x34, 0x56])
+        self.assertEqual(list(self.memory.iter_bytes(0x1002, 0x1004)), [(0x1002, 0x56), (0x1003, 0x78)])
+        self.assertEqual(len(self.memory.get_dump(0x1000, 0x1004)), 4)
+        self.assertEqual(self.cpu.cycles, 0)
+        self.assertEqual(self.calls, [])
+
+    def test_peek_range_is_read_only(self):
+        view = self.memory.peek_range(0x1000, 0x1004)
+        with self.assertRaises(TypeError):
+            view[0] = 0x00
+
+    def test_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.memory.peek_range(-1, 0x10)
+        with self.assertRaises(IndexError):
+            self.memory.peek_range(0xfff0, 0x10001)
+        with self.assertRaises(IndexError):
+            self.memory.poke_range(0xffff, b"\x01\x02")
+
+    def test_poke_range(self):
+        write_calls = []
+        self.memory.add_write_byte_callback(lambda *args: write_calls.append(args), 0x2000, 0x2003)
+
+        self.cpu.cycles = 0
+        self.memory.poke_range(0x2000, [0x01, 0x02, 0x03])
+        self.memory.poke_range(0x9000, b"\xab")  # ROM is writeable, too
+        self.assertEqual(self.memory.get(0x2000, 0x2003), [0x01, 0x02, 0x03])
+        self.assertEqual(self.memory.peek(0x9000), 0xab)
+        self.assertEqual(self.cpu.cycles, 0)
+        self.assertEqual(write_calls, [])
+
+        with self.assertRaises(ValueError):
+            self.memory.poke_range(0x2000, [0x100])
+
+    def test_disassemble_peek_range(self):
+        self.memory.poke_range(0x2000, [0x86, 0x05, 0x12])  # LDA #5 ; NOP
+        disassembly = disassemble(self.memory.peek_range(0x2000, 0x2003), start_address=0x2000)
+        self.assertEqual(
+            [(line.effective_address, line.op_info["mnemonic"]) for line in disassembly.lines],
+            [(0x2000, "LDA"), (0x2002, "NOP")],
+        )
+
+
+class BlockCachePokeTestCase(BaseCPUTestCase):
+    CPU_CLASS = CPUBlockCache
+
+    def test_poke_invalidates_blocks(self):
+        self.cpu_test_run(start=0x4000, end=None, mem=[
+            0x86, 0x05,  # 4000| LDA #5
+            0x12,        # 4002| NOP
+        ])
+        self.assertEqualHexByte(self.cpu.accu_a.value, 0x05)
+
+        self.cpu.memory.poke_range(0x4001, [0x07])
+        self.cpu.test_run(start=0x4000, end=0x4003)
+        self.assertEqualHexByte(self.cpu.accu_a.value, 0x07)
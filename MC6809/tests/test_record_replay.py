@@ -0,0 +1,126 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the deterministic record and replay of the external inputs
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import io
+import random
+
+from MC6809.components.cpu6809 import CPUBlockCache, CPUFast, CPUTableDispatch
+from MC6809.components.mc6809_record_replay import HEADER, RECORD, InputRecorder, InputReplayer, ReplayError
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class RecordReplayTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        cpu = self.cpu
+        cpu.memory.load(0xfff8, [0x50, 0x00])  # IRQ vector
+        cpu.memory.load(0xfff6, [0x51, 0x00])  # FIRQ vector
+        cpu.memory.load(0x5000, [
+            0x7C, 0x02, 0x00,  # 5000| INC $0200
+            0x3B,  # 5003| RTI
+        ])
+        cpu.memory.load(0x5100, [
+            0x7C, 0x02, 0x01,  # 5100| INC $0201
+            0xB6, 0xFF, 0x02,  # 5103| LDA $FF02 (releases the FIRQ)
+            0x3B,  # 5106| RTI
+        ])
+        cpu.memory.load(0x4000, [
+            0x1C, 0x00,  # 4000|   ANDCC #$00
+            0xB6, 0xFF, 0x00,  # 4002| L LDA $FF00
+            0xAB, 0x80,  # 4005|   ADDA ,X+
+            0xB7, 0xFF, 0x01,  # 4007|   STA $FF01
+            0xA7, 0x89, 0x10, 0x00,  # 400a|   STA $1000,X
+            0x20, 0xF2,  # 400e|   BRA L
+        ])
+        cpu.program_counter.set(0x4000)
+        cpu.system_stack_pointer.set(0x0F00)
+        cpu.index_x.set(0x0000)
+        cpu.cycles = 0
+
+        # The periphery:
+        self.random = random.Random(6809)
+        self.written = []
+        cpu.irq_enabled = True
+        cpu.memory.add_read_byte_callback(self.read_device, 0xFF00)
+        cpu.memory.add_write_byte_callback(self.write_device, 0xFF01)
+        cpu.memory.add_read_byte_callback(self.read_firq_device, 0xFF02)
+        cpu.add_cycle_event(1000, lambda cycles: cpu.irq(), period=1000)
+        cpu.add_cycle_event(1500, lambda cycles: cpu.assert_firq(), period=3000)
+
+    def read_device(self, cycles, last_op_address, address):
+        return self.random.randrange(256)
+
+    def write_device(self, cycles, last_op_address, address, value):
+        self.written.append(value)
+
+    def read_firq_device(self, cycles, last_op_address, address):
+        self.cpu.release_firq()
+        return 0
+
+    def record(self, cycles=20000):
+        fp = io.BytesIO()
+        recorder = InputRecorder(self.cpu, fp)
+        self.cpu.run_cycles(cycles)
+        recorder.stop()
+        fp.seek(0)
+        return fp
+
+    def test_replay(self):
+        fp = self.record()
+        self.assertGreater(self.cpu.memory.peek(0x0200), 10)  # IRQ calls
+        self.assertGreater(self.cpu.memory.peek(0x0201), 3)  # FIRQ calls
+
+        replayer = InputReplayer(fp, self.cfg, cpu_class=self.CPU_CLASS)
+        cpu = replayer.run()
+        self.assertIsNot(cpu, self.cpu)
+        self.assertEqual(cpu.get_state(), self.cpu.get_state())
+
+    def test_recorder_stop(self):
+        self.record()
+        written = len(self.written)
+        self.cpu.run_cycles(1000)
+        self.assertGreater(len(self.written), written)  # the periphery is still connected
+        self.assertIsNone(self.cpu.line_recorder)
+
+    def test_bound_line_func(self):
+        assert_firq = self.cpu.assert_firq  # bound before the recording starts
+        self.cpu.add_cycle_event(700, lambda cycles: assert_firq(), period=3000)
+        fp = self.record()
+        cpu = InputReplayer(fp, self.cfg, cpu_class=self.CPU_CLASS).run()
+        self.assertEqual(cpu.get_state(), self.cpu.get_state())
+
+    def test_divergence(self):
+        data = bytearray(self.record().getvalue())
+        end = len(data) - RECORD.size * 20
+        data[end:end + RECORD.size] = RECORD.pack(1, 123, 0xFF00, 0)
+        replayer = InputReplayer(io.BytesIO(data), self.cfg, cpu_class=self.CPU_CLASS)
+        with self.assertRaisesRegex(ReplayError, "diverged"):
+            replayer.run()
+
+    def test_invalid_recording(self):
+        data = self.record().getvalue()
+        for invalid_data in (b"", b"no recording" * 10, data[:-3], data[:-RECORD.size], data[:HEADER.size + 10]):
+            with self.subTest(invalid_data=invalid_data[:20]), self.assertRaises(ValueError):
+                InputReplayer(io.BytesIO(invalid_data), self.cfg)
+
+
+class TableDispatchRecordReplayTestCase(RecordReplayTestCase):
+    CPU_CLASS = CPUTableDispatch
+
+
+class BlockCacheRecordReplayTestCase(RecordReplayTestCase):
+    CPU_CLASS = CPUBlockCache
+
+
+class FastRecordReplayTestCase(RecordReplayTestCase):
+    CPU_CLASS = CPUFast
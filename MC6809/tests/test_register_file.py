@@ -0,0 +1,103 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the register file with plain integers
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.cpu6809 import CPU
+from MC6809.components.mc6809_register_file import RegisterFileMixin
+from MC6809.components.MC6809data.MC6809_op_data import REG_D, REG_PC, REG_X
+from MC6809.components.memory import Memory
+from MC6809.tests import (
+    test_6809_address_modes,
+    test_6809_arithmetic,
+    test_6809_arithmetic_shift,
+    test_6809_branch_instructions,
+    test_6809_program,
+    test_6809_register_changes,
+    test_6809_StoreLoad,
+    test_accumulators,
+    test_condition_code_register,
+    test_cpu6809,
+)
+from MC6809.tests.test_base import BaseCPUTestCase, cpu_variant_test_cases
+from MC6809.tests.test_config import TestCfg
+
+
+class RegisterFileCPU(RegisterFileMixin, CPU):
+    """
+    The register file without the fast ops: It's only the storage of CPUFast,
+    but all ops must work with the register views.
+    """
+
+
+class RegisterFileTestCase(BaseCPUTestCase):
+    CPU_CLASS = RegisterFileCPU
+
+    def test_views(self):
+        self.cpu.accu_d.set(0x1234)
+        self.assertEqualHex(self.cpu.registers.a, 0x12)
+        self.assertEqualHex(self.cpu.registers.b, 0x34)
+
+        self.cpu.register_str2object[REG_X].set(0x12345)
+        self.assertEqualHex(self.cpu.registers.x, 0x2345)
+
+        self.cpu.registers.pc = 0x4000
+        self.assertEqualHex(self.cpu.register_str2object[REG_PC].value, 0x4000)
+        self.assertEqualHex(self.cpu.register_str2object[REG_D].value, 0x1234)
+
+    def test_tfr_exg(self):
+        self.cpu_test_run(start=0x4000, end=None, mem=[
+            0xcc, 0x12, 0x34,  # LDD #$1234
+            0x1f, 0x01,  # TFR D,X
+            0x8e, 0xab, 0xcd,  # LDX #$abcd
+            0x1e, 0x89,  # EXG A,B
+            0x1e, 0x01,  # EXG D,X
+        ])
+        self.assertEqualHex(self.cpu.registers.x, 0x3412)
+        self.assertEqualHex(self.cpu.registers.a, 0xab)
+        self.assertEqualHex(self.cpu.registers.b, 0xcd)
+
+    def test_same_state_as_value_storage(self):
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        cpu = CPU(Memory(cfg), cfg)
+        mem = [
+            0x10, 0xce, 0x50, 0x00,  # LDS #$5000
+            0xcc, 0x80, 0x7f,  # LDD #$807f
+            0x34, 0x06,  # PSHS D
+            0x8e, 0x00, 0x10,  # LDX #$0010
+            0x30, 0x1f,  # LEAX -1,X
+            0x26, 0xfc,  # BNE -4
+            0x35, 0x10,  # PULS X
+            0x3a,  # ABX
+        ]
+        cpu.memory.load(0x4000, mem)
+        cpu.test_run(start=0x4000, end=0x4000 + len(mem))
+        self.cpu_test_run(start=0x4000, end=0x4000 + len(mem), mem=mem)
+        self.assertEqual(self.cpu.get_state(), cpu.get_state())
+
+        self.cpu.set_state(cpu.get_state())
+        self.assertEqual(self.cpu.get_state(), cpu.get_state())
+
+
+globals().update(
+    cpu_variant_test_cases(
+        RegisterFileCPU,
+        "RegisterFile",
+        test_6809_address_modes,
+        test_6809_arithmetic,
+        test_6809_arithmetic_shift,
+        test_6809_branch_instructions,
+        test_6809_program,
+        test_6809_register_changes,
+        test_6809_StoreLoad,
+        test_accumulators,
+        test_condition_code_register,
+        test_cpu6809,
+    )
+)
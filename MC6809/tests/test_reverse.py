@@ -0,0 +1,98 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the reverse execution via the undo log
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.cpu6809 import CPUReverse
+from MC6809.tests.test_base import BaseCPUTestCase
+
+
+class ReverseTestCase(BaseCPUTestCase):
+    CPU_CLASS = CPUReverse
+
+    def setUp(self):
+        super().setUp()
+        self.cpu.memory.load(0xfff8, [0x50, 0x00])  # IRQ vector
+        self.cpu.memory.load(0x5000, [
+            0x7C, 0x02, 0x00,  # 5000| INC $0200
+            0x3B,  # 5003| RTI
+        ])
+        self.cpu.memory.load(0x4000, [
+            0x8E, 0x10, 0x00,  # 4000|   LDX #$1000
+            0x4C,  # 4003| L INCA
+            0xA7, 0x80,  # 4004|   STA ,X+
+            0xED, 0x81,  # 4006|   STD ,X++
+            0x34, 0x16,  # 4008|   PSHS X,B,A
+            0x35, 0x16,  # 400a|   PULS A,B,X
+            0x20, 0xF5,  # 400c|   BRA L
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.system_stack_pointer.set(0x0F00)
+        self.cpu.set_cc(0x00)
+        self.cpu.cycles = 0
+
+    def run_steps(self, count):
+        states = []
+        for __ in range(count):
+            states.append(self.cpu.get_state())
+            self.cpu.get_and_call_next_op()
+        return states
+
+    def test_step_back(self):
+        states = self.run_steps(200)
+        for state in reversed(states):
+            self.assertEqual(self.cpu.step_back(), 1)
+            self.assertEqual(self.cpu.get_state(), state)
+        self.assertEqual(self.cpu.step_back(), 0)
+
+    def test_step_back_interrupt(self):
+        states = self.run_steps(10)
+        self.cpu.assert_irq()
+        states += self.run_steps(1)  # interrupt entry
+        self.cpu.release_irq()
+        states += self.run_steps(9)
+        self.assertEqual(self.cpu.memory.peek(0x0200), 1)
+        self.assertEqual(self.cpu.step_back(20), 20)
+        self.assertEqual(self.cpu.get_state(), states[0])
+
+        # The IRQ line belongs to the periphery and is not undone:
+        self.run_steps(20)
+        self.assertEqual(self.cpu.memory.peek(0x0200), 0)
+
+    def test_step_back_and_run_again(self):
+        self.run_steps(100)
+        state = self.cpu.get_state()
+        self.cpu.step_back(50)
+        self.run_steps(50)
+        self.assertEqual(self.cpu.get_state(), state)
+        self.assertEqual(self.cpu.step_back(100), 100)
+
+    def test_depth(self):
+        self.cpu.set_undo_depth(10)
+        states = self.run_steps(100)
+        self.assertEqual(self.cpu.step_back(20), 10)
+        self.assertEqual(self.cpu.get_state(), states[-10])
+
+    def test_write_log_limit(self):
+        self.cpu.set_undo_depth(100, writes_per_step=1)
+        states = self.run_steps(100)
+        steps = self.cpu.undo_steps
+        self.assertLess(steps, 100)
+        self.assertGreater(steps, 10)
+        self.assertEqual(self.cpu.step_back(100), steps)
+        self.assertEqual(self.cpu.get_state(), states[-steps])
+
+    def test_run_back_to_last_write(self):
+        states = self.run_steps(100)
+        self.assertTrue(self.cpu.run_back_to_last_write(0x1000))  # written only one time by STA ,X+
+        self.assertEqual(self.cpu.get_state(), states[2])
+        self.assertEqual(self.cpu.program_counter.value, 0x4004)
+
+        self.assertFalse(self.cpu.run_back_to_last_write(0x2000))
+        self.assertEqual(self.cpu.get_state(), states[2])
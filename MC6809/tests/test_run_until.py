@@ -0,0 +1,89 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test run_cycles() and run_until()
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.cpu6809 import CPUBlockCache, CPUFast, CPUTableDispatch
+from MC6809.components.cpu_utils.run_loop import get_run_loop
+from MC6809.tests.test_base import BaseCPUTestCase
+
+
+class RunUntilTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpu.memory.load(0x4000, [
+            0x4F,  # 4000|   CLRA       ; 2+1 cycles
+            0x4C,  # 4001| L INCA       ; 2+1 cycles
+            0xB7, 0x50, 0x00,  # 4002|   STA $5000  ; 5+4 cycles
+            0x20, 0xFA,  # 4005|   BRA L      ; 3+2 cycles
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.cycles = 0
+
+    def test_run_cycles(self):
+        self.assertEqual(self.cpu.run_cycles(3), 3)  # CLRA
+        self.assertEqual(self.cpu.program_counter.value, 0x4001)
+
+        # Stop at the first instruction boundary at or past the end:
+        self.assertEqual(self.cpu.run_cycles(4), 3 + 9)  # INCA + STA
+        self.assertEqual(self.cpu.program_counter.value, 0x4005)
+        self.assertEqual(self.cpu.cycles, 15)
+
+        self.assertEqual(self.cpu.run_cycles(0), 0)
+        self.assertEqual(self.cpu.cycles, 15)
+
+        self.assertEqual(self.cpu.run_cycles(5 * 17), 5 * 17)  # 5 loops a 17 cycles
+        self.assertEqual(self.cpu.program_counter.value, 0x4005)
+        self.assertEqual(self.cpu.accu_a.value, 6)
+
+    def test_run_until_pc(self):
+        self.assertEqual(self.cpu.run_until(pc=0x4005), "pc")
+        self.assertEqual(self.cpu.accu_a.value, 1)
+        self.assertEqual(self.cpu.run_until(pc=0x4000, cycles=200), "cycles")
+        self.assertGreaterEqual(self.cpu.cycles, 200)
+
+    def test_run_until_memory(self):
+        self.assertEqual(self.cpu.run_until(memory_equals=(0x5000, 10)), "memory")
+        self.assertEqual(self.cpu.program_counter.value, 0x4005)
+        self.assertEqual(self.cpu.accu_a.value, 10)
+
+    def test_run_until_cycles(self):
+        self.assertEqual(self.cpu.run_until(cycles=50), "cycles")
+        self.assertGreaterEqual(self.cpu.cycles, 50)
+        self.assertEqual(self.cpu.run_until(pc=0x4002, memory_equals=(0x5000, 0xff)), "pc")
+
+    def test_cycle_events(self):
+        calls = []
+        self.cpu.add_cycle_event(20, calls.append, period=20)
+        self.cpu.run_cycles(100)
+        self.assertEqual(len(calls), 5)
+        for index, cycles in enumerate(calls, 1):
+            self.assertGreaterEqual(cycles, index * 20)
+            self.assertLess(cycles, index * 20 + 9)
+
+    def test_no_condition(self):
+        with self.assertRaises(ValueError):
+            self.cpu.run_until()
+
+    def test_compiled_loops(self):
+        run_loop = get_run_loop(check_pc=True, check_memory=False)
+        self.assertIs(get_run_loop(check_pc=True, check_memory=False), run_loop)
+        self.assertIsNot(get_run_loop(check_pc=False, check_memory=False), run_loop)
+
+
+class TableDispatchRunUntilTestCase(RunUntilTestCase):
+    CPU_CLASS = CPUTableDispatch
+
+
+class BlockCacheRunUntilTestCase(RunUntilTestCase):
+    CPU_CLASS = CPUBlockCache
+
+
+class FastRunUntilTestCase(RunUntilTestCase):
+    CPU_CLASS = CPUFast
@@ -0,0 +1,86 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the statistical sampling of the CPU state
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import io
+import signal
+import time
+import unittest
+
+from MC6809.components.cpu6809 import CPUBlockCache
+from MC6809.components.mc6809_sampling import InstructionSampler
+from MC6809.components.mc6809_trace_file import TraceWriter, get_op_address_profile, iter_trace_records
+from MC6809.tests.test_base import BaseCPUTestCase
+
+
+class InstructionSamplerTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpu.memory.load(0x4000, [
+            0x4C,  # 4000| L INCA
+            0x10, 0x8E, 0x12, 0x34,  # 4001|   LDY #$1234
+            0x20, 0xF9,  # 4005|   BRA L
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.cycles = 0
+        self.fp = io.BytesIO()
+        self.writer = TraceWriter(self.fp)
+
+    def get_records(self):
+        self.writer.close()
+        self.fp.seek(0)
+        return list(iter_trace_records(self.fp))
+
+    def test_cycles(self):
+        sampler = InstructionSampler(self.cpu, self.writer, cycles=1000)
+        self.cpu.run_until(cycles=10000)
+        sampler.stop()
+        self.cpu.run_until(cycles=20000)
+        self.assertEqual(sampler.sample_count, 10)
+
+        records = self.get_records()
+        self.assertEqual(len(records), 10)
+        for number, record in enumerate(records, 1):
+            self.assertGreaterEqual(record.cycles, number * 1000)
+            self.assertLess(record.cycles, number * 1000 + 10)
+            self.assertEqual(record.pc, record.op_address)
+            self.assertIn((record.op_address, record.opcode), ((0x4000, 0x4c), (0x4001, 0x108e), (0x4005, 0x20)))
+
+        profile = get_op_address_profile(records)
+        self.assertEqual({op_address for op_address, __, __ in profile} - {0x4000, 0x4001, 0x4005}, set())
+        self.assertEqual(sum(record_count for __, __, record_count in profile), 10)
+
+    @unittest.skipUnless(hasattr(signal, "setitimer"), "No signal.setitimer()")
+    def test_interval(self):
+        origin_handler = signal.getsignal(signal.SIGALRM)
+        sampler = InstructionSampler(self.cpu, self.writer, interval=0.001, check_cycles=100)
+        end_time = time.monotonic() + 5
+        while sampler.sample_count < 3 and time.monotonic() < end_time:
+            self.cpu.run_cycles(1000)
+        sampler.stop()
+        self.assertIs(signal.getsignal(signal.SIGALRM), origin_handler)
+        self.assertEqual(signal.getitimer(signal.ITIMER_REAL), (0.0, 0.0))
+
+        records = self.get_records()
+        self.assertGreaterEqual(len(records), 3)
+        self.assertEqual(len(records), sampler.sample_count)
+        cycles = [record.cycles for record in records]
+        self.assertEqual(cycles, sorted(cycles))
+
+    def test_invalid_args(self):
+        with self.assertRaises(ValueError):
+            InstructionSampler(self.cpu, self.writer)
+        with self.assertRaises(ValueError):
+            InstructionSampler(self.cpu, self.writer, cycles=100, interval=0.1)
+        self.writer.close()
+
+
+class BlockCacheInstructionSamplerTestCase(InstructionSamplerTestCase):
+    CPU_CLASS = CPUBlockCache
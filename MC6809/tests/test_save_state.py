@@ -0,0 +1,113 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the binary save state format
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import io
+import tempfile
+from pathlib import Path
+
+from MC6809.components.cpu6809 import CPUBlockCache, CPUFast, CPUTableDispatch
+from MC6809.components.mc6809_interrupt import IRQ_LINE, WAIT_CWAI
+from MC6809.components.mc6809_save_state import HEADER
+from MC6809.components.memory import Memory
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class SaveStateTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        self.cpu.memory.load(0x4000, [
+            0x86, 0x00,  # 4000|   LDA #$00
+            0x4C,  # 4002| L INCA
+            0xB7, 0x02, 0x00,  # 4003|   STA $0200
+            0x20, 0xFA,  # 4006|   BRA L
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.cycles = 0
+        self.cpu.run_cycles(1000)
+
+    def save(self, compress=True):
+        fp = io.BytesIO()
+        self.cpu.save_state(fp, compress=compress)
+        fp.seek(0)
+        return fp
+
+    def test_save_load(self):
+        for compress in (True, False):
+            with self.subTest(compress=compress):
+                cpu = self.CPU_CLASS.load_state(self.save(compress), self.cfg)
+                self.assertIsInstance(cpu, self.CPU_CLASS)
+                self.assertEqual(cpu.get_state(), self.cpu.get_state())
+                self.assertEqual(cpu.last_op_address, self.cpu.last_op_address)
+
+                cpu.run_cycles(1000)
+                self.cpu.run_cycles(1000)
+                self.assertEqual(cpu.get_state(), self.cpu.get_state())
+
+    def test_skip_zero_pages(self):
+        # Only the code page and $0200 are stored:
+        self.assertLess(len(self.save(compress=False).getvalue()), 2 * (1 + 256) + 100)
+
+    def test_restore_clears_memory(self):
+        fp = self.save()
+        state = self.cpu.get_state()
+        self.cpu.memory.write_byte(0x1234, 0x56)
+        self.cpu.accu_b.set(0x78)
+        self.cpu.restore_state(fp)
+        self.assertEqual(self.cpu.get_state(), state)
+
+    def test_interrupt_state(self):
+        self.cpu.wait_state = WAIT_CWAI
+        self.cpu.set_cc(0x00)
+        self.cpu.assert_irq()
+        cpu = self.CPU_CLASS.load_state(self.save(), self.cfg)
+        self.assertEqual(cpu.wait_state, WAIT_CWAI)
+        self.assertEqual(cpu.interrupt_pending, IRQ_LINE)
+
+    def test_trace_file_not_truncated(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            trace_file = Path(temp_dir, "test.trace")
+            cfg = TestCfg(dict(self.UNITTEST_CFG_DICT, trace_file=str(trace_file)))
+            cpu = self.CPU_CLASS(Memory(cfg), cfg)
+            cpu.close_trace()
+            size = trace_file.stat().st_size
+
+            cpu = self.CPU_CLASS.load_state(self.save(), cfg)
+            self.assertIsNone(cpu.trace_writer)
+            self.assertEqual(trace_file.stat().st_size, size)
+
+    def test_other_rom(self):
+        data = bytearray(self.save().getvalue())
+        data[HEADER.size - 1] ^= 0xff  # change the ROM hash
+        with self.assertRaisesRegex(ValueError, "ROMs"):
+            self.cpu.restore_state(io.BytesIO(data))
+
+    def test_invalid_data(self):
+        data = self.save().getvalue()
+        for invalid_data in (b"", b"no save state" * 10, data[:-5], data[:HEADER.size] + b"xxx"):
+            with self.subTest(invalid_data=invalid_data[:20]), self.assertRaises(ValueError):
+                self.cpu.restore_state(io.BytesIO(invalid_data))
+
+        with self.assertRaisesRegex(ValueError, "fit to 2 pages"):
+            self.cpu.restore_state(io.BytesIO(self.save(compress=False).getvalue() + b"x"))
+
+
+class TableDispatchSaveStateTestCase(SaveStateTestCase):
+    CPU_CLASS = CPUTableDispatch
+
+
+class BlockCacheSaveStateTestCase(SaveStateTestCase):
+    CPU_CLASS = CPUBlockCache
+
+
+class FastSaveStateTestCase(SaveStateTestCase):
+    CPU_CLASS = CPUFast
@@ -0,0 +1,168 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the cycle event scheduler
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import unittest
+
+from MC6809.components.cpu6809 import CPU, CPUBlockCache
+from MC6809.components.mc6809_scheduler import NO_DEADLINE, CycleScheduler
+from MC6809.components.memory import Memory
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class CycleSchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = CycleScheduler()
+        self.calls = []
+
+    def callback(self, name):
+        return lambda cycles: self.calls.append((name, cycles))
+
+    def test_order(self):
+        self.scheduler.add_event(30, self.callback("c"))
+        self.scheduler.add_event(10, self.callback("a"))
+        self.scheduler.add_event(20, self.callback("b1"))
+        self.scheduler.add_event(20, self.callback("b2"))
+        self.assertEqual(self.scheduler.next_deadline, 10)
+        self.assertEqual(len(self.scheduler), 4)
+
+        self.scheduler.run_due(25)
+        self.assertEqual(self.calls, [("a", 25), ("b1", 25), ("b2", 25)])
+        self.assertEqual(self.scheduler.next_deadline, 30)
+
+    def test_periodic(self):
+        event = self.scheduler.add_event(10, self.callback("tick"), period=10)
+        self.scheduler.run_due(10)
+        self.scheduler.run_due(21)
+        self.assertEqual(self.calls, [("tick", 10), ("tick", 21)])
+        self.assertEqual(event.deadline, 30)
+        self.assertTrue(event.pending)
+
+        # Missed periods are called, too:
+        self.scheduler.run_due(55)
+        self.assertEqual(self.calls[2:], [("tick", 55), ("tick", 55), ("tick", 55)])
+        self.assertEqual(self.scheduler.next_deadline, 60)
+
+    def test_cancel(self):
+        event = self.scheduler.add_event(10, self.callback("a"))
+        self.scheduler.add_event(20, self.callback("b"))
+        self.scheduler.cancel(event)
+        self.assertFalse(event.pending)
+        self.assertEqual(self.scheduler.next_deadline, 20)
+
+        self.scheduler.run_due(100)
+        self.assertEqual(self.calls, [("b", 100)])
+        self.assertEqual(self.scheduler.next_deadline, NO_DEADLINE)
+
+    def test_reschedule_from_callback(self):
+        def callback(cycles):
+            self.calls.append(cycles)
+            if len(self.calls) < 3:
+                self.scheduler.reschedule(event, cycles + 5)
+
+        event = self.scheduler.add_event(10, callback)
+        for cycles in range(10, 40):
+            self.scheduler.run_due(cycles)
+        self.assertEqual(self.calls, [10, 15, 20])
+        self.assertFalse(event.pending)
+
+    def test_cancel_periodic_from_callback(self):
+        def callback(cycles):
+            self.calls.append(cycles)
+            self.scheduler.cancel(event)
+
+        event = self.scheduler.add_event(10, callback, period=10)
+        self.scheduler.run_due(100)
+        self.assertEqual(self.calls, [100])
+        self.assertEqual(self.scheduler.next_deadline, NO_DEADLINE)
+
+    def test_invalid_period(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.add_event(10, self.callback("a"), period=0)
+
+    def test_get_set_events(self):
+        self.scheduler.add_event(20, self.callback("b"))
+        self.scheduler.add_event(10, self.callback("tick"), period=10)
+        self.scheduler.add_event(20, self.callback("c"))
+        events = self.scheduler.get_events()
+        self.assertEqual([deadline for deadline, __ in events], [10, 20, 20])
+
+        self.scheduler.run_due(35)
+        self.scheduler.add_event(50, self.callback("d"))
+        self.scheduler.set_events(events)
+        self.assertEqual(self.scheduler.next_deadline, 10)
+        self.assertEqual(len(self.scheduler), 3)
+
+        self.calls.clear()
+        self.scheduler.run_due(20)
+        self.assertEqual(self.calls, [("tick", 20), ("b", 20), ("c", 20), ("tick", 20)])
+
+
+class CPUSchedulerTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpu.memory.load(0x4000, [
+            0x12,  # 4000| NOP
+            0x20, 0xFD,  # 4001| BRA $4000
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.cycles = 0
+        self.calls = []
+
+    def test_exact_deadline(self):
+        for deadline in (5, 1000, 50000):
+            self.cpu.add_cycle_event(deadline, self.calls.append)
+        self.cpu.outer_burst_op_count = 25  # 2500 ops -> 10000 cycles
+        self.cpu.burst_run()
+
+        # A NOP+BRA loop needs (2+1) + (3+2) cycles: The events are called after max. one op
+        self.assertEqual(len(self.calls), 2)
+        self.assertGreaterEqual(self.calls[0], 5)
+        self.assertLess(self.calls[0], 5 + 5)
+        self.assertGreaterEqual(self.calls[1], 1000)
+        self.assertLess(self.calls[1], 1000 + 5)
+
+    def test_cancel_from_write_callback(self):
+        event = self.cpu.add_cycle_event(50, self.calls.append)
+
+        def write_callback(cycles, last_op_address, address, value):
+            self.cpu.scheduler.cancel(event)  # e.g.: a device stops its timer
+
+        self.cpu.memory.add_write_byte_callback(write_callback, 0x2000)
+        self.cpu.memory.load(0x4000, [
+            0xB7, 0x20, 0x00,  # 4000| STA $2000
+            0x20, 0xFB,  # 4003| BRA $4000
+        ])
+        self.cpu.outer_burst_op_count = 10
+        self.cpu.burst_run()  # must not run forever without a deadline
+        self.assertEqual(self.calls, [])
+        self.assertGreater(self.cpu.cycles, 50)
+
+    def test_sync_callback(self):
+        self.cpu.add_sync_callback(100, self.calls.append)
+        self.cpu.test_run2(start=0x4000, count=99)  # 396 cycles
+        self.assertEqual(len(self.calls), 3)
+        # The period doesn't drift: The deadlines are 100, 200 and 300
+        for cycles_since_last_call in self.calls:
+            self.assertAlmostEqual(cycles_since_last_call, 100, delta=5)
+        self.assertAlmostEqual(sum(self.calls), 300, delta=5)
+
+    def test_per_instance(self):
+        self.cpu.add_sync_callback(100, self.calls.append)
+
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        cpu = CPU(Memory(cfg), cfg)
+        self.assertEqual(len(cpu.scheduler), 0)
+        self.assertEqual(len(self.cpu.scheduler), 1)
+
+
+class BlockCacheSchedulerTestCase(CPUSchedulerTestCase):
+    CPU_CLASS = CPUBlockCache
@@ -0,0 +1,65 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the opcode dispatch via dense lookup tables
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.cpu6809 import CPU, CPUTableDispatch
+from MC6809.components.memory import Memory
+from MC6809.tests import test_6809_program
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class TableDispatchTestCase(BaseCPUTestCase):
+    CPU_CLASS = CPUTableDispatch
+
+    def test_tables_match_opcode_dict(self):
+        for op_code, (cycles, func) in self.cpu.opcode_dict.items():
+            if op_code in (0x10, 0x11):
+                continue  # replaced by the page dispatcher
+            page, index = divmod(op_code, 256)
+            funcs, cycles_table = self.cpu.opcode_tables[page]
+            self.assertIs(funcs[index], func)
+            self.assertEqual(cycles_table[index], cycles)
+
+    def test_unused_slots_are_illegal(self):
+        self.assertEqual(self.cpu.opcode_funcs[0x01], self.cpu.illegal_instruction)
+        self.assertEqual(self.cpu.page2_funcs[0x00], self.cpu.illegal_instruction)
+        self.assertEqual(self.cpu.page3_funcs[0xff], self.cpu.illegal_instruction)
+
+    def test_illegal_op(self):
+        with self.assertRaises(SystemExit) as cm:
+            self.cpu_test_run(start=0x4000, end=None, mem=[0x01])
+        self.assertEqual(str(cm.exception), "$4000 *** UNKNOWN OP $1")
+
+        with self.assertRaises(SystemExit) as cm:
+            self.cpu_test_run(start=0x4000, end=None, mem=[0x10, 0x00])
+        self.assertEqual(str(cm.exception), "$4000 *** UNKNOWN OP $1000")
+
+    def test_same_cycles_as_dict_dispatch(self):
+        mem = [
+            0x10, 0x8E, 0x00, 0x08,  # LDY #8
+            0x8E, 0x12, 0x34,  # LDX #$1234
+            0x11, 0x8C, 0x12, 0x34,  # CMPS #$1234
+            0x31, 0x3F,  # LEAY -1,Y
+            0x26, 0xFC,  # BNE -4
+        ]
+        self.cpu_test_run(start=0x4000, end=None, mem=mem)
+
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        dict_cpu = CPU(Memory(cfg), cfg)
+        dict_cpu.memory.load(0x4000, mem)
+        dict_cpu.test_run(0x4000, 0x4000 + len(mem))
+
+        self.assertEqual(self.cpu.cycles, dict_cpu.cycles)
+        self.assertEqual(self.cpu.get_state(), dict_cpu.get_state())
+
+
+class TableDispatchProgramTestCase(test_6809_program.Test6809_Program):
+    CPU_CLASS = CPUTableDispatch
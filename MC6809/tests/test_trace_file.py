@@ -0,0 +1,116 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the binary trace format
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from MC6809.components.mc6809_trace_file import (
+    FLAG_EA,
+    FLAG_M,
+    RECORD,
+    TraceWriter,
+    format_trace_record,
+    iter_trace_records,
+)
+from MC6809.components.memory import Memory
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class TraceWriterTestCase(unittest.TestCase):
+    def test_records(self):
+        fp = io.BytesIO()
+        writer = TraceWriter(fp, buffer_records=3, buffer_count=2)
+        for count in range(10):
+            writer.add_record(
+                0x4000 + count, 0x86, 2, b"\x86\x12",
+                0x12, 0, 0, 0x50, 1, 2, 3, 4, 0x4002 + count,
+                count * 2, 0, 0x12, FLAG_M,
+            )
+        writer.close()
+        self.assertEqual(writer.record_count, 10)
+
+        fp.seek(0)
+        records = list(iter_trace_records(fp))
+        self.assertEqual(len(records), 10)
+        self.assertEqual([record.op_address for record in records], list(range(0x4000, 0x400a)))
+        self.assertEqual(records[9].cycles, 18)
+        self.assertEqual(records[9].op_bytes, b"\x86\x12\x00\x00\x00")
+        self.assertEqual(
+            format_trace_record(records[0]),
+            "4000| 8612        LDA     m:12                "
+            "cc=50 a=12 b=00 dp=00 x=0001 y=0002 u=0003 s=0004 | .F.I.... | cycles=0"
+        )
+
+    def test_invalid_file(self):
+        with self.assertRaises(ValueError):
+            list(iter_trace_records(io.BytesIO(b"no trace file")))
+
+        fp = io.BytesIO()
+        writer = TraceWriter(fp)
+        writer.add_record(0x4000, 0x12, 1, b"\x12", 0, 0, 0, 0, 0, 0, 0, 0, 0x4001, 0, 0, 0, 0)
+        writer.close()
+        with self.assertRaises(ValueError):
+            list(iter_trace_records(io.BytesIO(fp.getvalue()[:-1])))
+
+
+class CPUBinaryTraceTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.trace_file = Path(temp_dir.name, "test.trace")
+
+        cfg = TestCfg(dict(self.UNITTEST_CFG_DICT, trace_file=str(self.trace_file)))
+        self.cpu = self.CPU_CLASS(Memory(cfg), cfg)
+        self.addCleanup(self.cpu.close_trace)
+
+    def test_trace(self):
+        self.cpu.memory.load(0x4000, [
+            0x86, 0x12,  # 4000| LDA #$12
+            0x10, 0x8E, 0x12, 0x34,  # 4002| LDY #$1234
+            0xA7, 0x89, 0x10, 0x00,  # 4006| STA $1000,X
+            0x20, 0xF4,  # 400a| BRA $4000
+        ])
+        self.cpu.test_run2(start=0x4000, count=5)
+        self.cpu.close_trace()
+
+        with self.trace_file.open("rb") as f:
+            records = list(iter_trace_records(f))
+        self.assertEqual(
+            [(record.op_address, record.opcode) for record in records],
+            [(0x4000, 0x86), (0x4002, 0x108e), (0x4006, 0xa7), (0x400a, 0x20), (0x4000, 0x86)],
+        )
+        lda, ldy, sta, bra, __ = records
+        self.assertEqual((lda.a, lda.m, lda.flags), (0x12, 0x12, FLAG_M))
+        self.assertEqual((ldy.y, ldy.op_bytes[:ldy.op_length]), (0x1234, b"\x10\x8e\x12\x34"))
+        self.assertEqual((sta.ea, sta.flags), (0x1000, FLAG_EA))
+        self.assertEqual(sta.op_bytes[:sta.op_length], b"\xa7\x89\x10\x00")  # incl. the 16 bit offset
+        self.assertLess(ldy.cycles, sta.cycles)
+        self.assertEqual((bra.ea, bra.pc), (0x4000, 0x4000))
+        self.assertEqual(self.trace_file.stat().st_size, 12 + 5 * RECORD.size)
+
+    def test_close_trace(self):
+        fp = self.cpu.trace_writer.fp
+        self.cpu.close_trace()
+        self.assertTrue(fp.closed)
+        self.cpu.close_trace()  # a second call does nothing
+
+    def test_no_trace(self):
+        self.cpu.close_trace()
+        self.assertEqual(self.trace_file.stat().st_size, 12)  # only the header
+
+        cfg = self.cpu.cfg
+        cpu = self.CPU_CLASS(Memory(cfg), cfg, trace=False)
+        self.assertIsNone(cpu.trace_writer)
+        self.assertEqual(self.trace_file.stat().st_size, 12)  # not truncated
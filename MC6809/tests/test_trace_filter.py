@@ -0,0 +1,109 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the filters of the binary trace
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+import tempfile
+from pathlib import Path
+
+from MC6809.components.cpu6809 import CPUFast, CPUTableDispatch
+from MC6809.components.mc6809_trace_file import iter_trace_records
+from MC6809.components.mc6809_trace_filter import TraceFilter
+from MC6809.components.memory import Memory
+from MC6809.tests.test_base import BaseCPUTestCase
+from MC6809.tests.test_config import TestCfg
+
+
+class TraceFilterTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.trace_file = Path(temp_dir.name, "test.trace")
+
+        cfg = TestCfg(dict(self.UNITTEST_CFG_DICT, trace_file=str(self.trace_file)))
+        self.cpu = self.CPU_CLASS(Memory(cfg), cfg)
+        self.addCleanup(self.cpu.close_trace)
+
+        self.cpu.memory.load(0x4000, [
+            0x4C,  # 4000| MAIN INCA
+            0xBD, 0x41, 0x00,  # 4001| JSR SUB1
+            0x20, 0xFA,  # 4004| BRA MAIN
+        ])
+        self.cpu.memory.load(0x4100, [
+            0x5C,  # 4100| SUB1 INCB
+            0xBD, 0x42, 0x00,  # 4101| JSR SUB2
+            0x39,  # 4104| RTS
+        ])
+        self.cpu.memory.load(0x4200, [
+            0x10, 0x8E, 0x12, 0x34,  # 4200| SUB2 LDY #$1234
+            0x39,  # 4204| RTS
+        ])
+        self.cpu.system_stack_pointer.set(0x1000)
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.cycles = 0
+
+    def get_traced_addresses(self, op_count=5 * 8):
+        # One MAIN loop are 8 instructions
+        self.cpu.test_run2(start=0x4000, count=op_count)
+        self.cpu.close_trace()
+        with self.trace_file.open("rb") as f:
+            return [record.op_address for record in iter_trace_records(f)]
+
+    def test_without_filter(self):
+        self.assertEqual(self.get_traced_addresses(op_count=8), [
+            0x4000, 0x4001, 0x4100, 0x4101, 0x4200, 0x4204, 0x4104, 0x4004,
+        ])
+
+    def test_pc_ranges(self):
+        trace_filter = TraceFilter(self.cpu, pc_ranges=[(0x4200, 0x42ff), (0x4004, 0x4004)])
+        self.assertFalse(trace_filter.inside)
+        self.assertEqual(self.get_traced_addresses(), [0x4200, 0x4204, 0x4004] * 5)
+
+    def test_mnemonics(self):
+        TraceFilter(self.cpu, mnemonics={"jsr", "LDY"})
+        self.assertEqual(self.get_traced_addresses(), [0x4001, 0x4101, 0x4200] * 5)
+
+    def test_cycles(self):
+        # One MAIN loop are 62 cycles
+        TraceFilter(self.cpu, cycles=(62, 62 * 2))
+        self.assertEqual(self.get_traced_addresses(), [
+            0x4000, 0x4001, 0x4100, 0x4101, 0x4200, 0x4204, 0x4104, 0x4004,
+        ])
+
+    def test_call_tree(self):
+        TraceFilter(self.cpu, call_tree=0x4100, mnemonics={"INCA", "INCB", "LDY", "RTS"})
+        self.assertEqual(self.get_traced_addresses(), [0x4100, 0x4200, 0x4204, 0x4104] * 5)
+
+    def test_call_tree_and_cycles(self):
+        # The second loop: LDY at cycle 94, RTS at 103, the third loop: LDY at 156
+        TraceFilter(self.cpu, call_tree=0x4200, cycles=(100, 160))
+        self.assertEqual(self.get_traced_addresses(), [0x4204, 0x4200])
+
+    def test_remove(self):
+        trace_filter = TraceFilter(self.cpu, pc_ranges=[(0x4200, 0x42ff)])
+        self.cpu.test_run2(start=0x4000, count=8)
+        trace_filter.remove()
+        self.assertEqual(self.get_traced_addresses(op_count=8), [
+            0x4200, 0x4204,
+            0x4000, 0x4001, 0x4100, 0x4101, 0x4200, 0x4204, 0x4104, 0x4004,
+        ])
+
+    def test_without_binary_trace(self):
+        cfg = TestCfg(self.UNITTEST_CFG_DICT)
+        with self.assertRaises(ValueError):
+            TraceFilter(self.CPU_CLASS(Memory(cfg), cfg), mnemonics={"JSR"})
+
+
+class TableDispatchTraceFilterTestCase(TraceFilterTestCase):
+    CPU_CLASS = CPUTableDispatch
+
+
+class FastTraceFilterTestCase(TraceFilterTestCase):
+    CPU_CLASS = CPUFast
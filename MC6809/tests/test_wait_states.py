@@ -0,0 +1,116 @@
+"""
+    6809 unittests
+    ~~~~~~~~~~~~~~
+
+    Test the wait states of SYNC and CWAI
+
+    :copyleft: 2013-2015 by the MC6809 team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+
+from MC6809.components.cpu6809 import CPUBlockCache, CPUFast, CPUTableDispatch
+from MC6809.components.mc6809_interrupt import WAIT_CWAI, WAIT_SYNC
+from MC6809.tests.test_base import BaseCPUTestCase
+
+
+class WaitStateTestCase(BaseCPUTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpu.irq_enabled = True
+        self.cpu.memory.load(0xfff8, [0x50, 0x00])  # IRQ vector
+        self.cpu.memory.load(0x5000, [
+            0x7C, 0x02, 0x00,  # 5000| INC $0200
+            0x3B,  # 5003| RTI
+        ])
+        self.cpu.system_stack_pointer.set(0x1000)
+        self.cpu.cycles = 0
+
+    def add_irq_event(self, cycles):
+        calls = []
+
+        def callback(cycles):
+            calls.append(cycles)
+            self.cpu.irq()
+
+        self.cpu.add_cycle_event(cycles, callback)
+        return calls
+
+    def test_sync(self):
+        self.cpu.memory.load(0x4000, [
+            0x13,  # 4000| SYNC
+            0x5C,  # 4001| INCB
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.set_cc(0x00)  # IRQ enabled
+        calls = self.add_irq_event(10000)
+
+        self.assertEqual(self.cpu.run_until(pc=0x5000), "pc")
+        self.assertEqual(calls, [10000])  # cycles jumped straight to the event
+        self.assertLess(self.cpu.cycles, 10000 + 50)
+        self.assertIsNone(self.cpu.wait_state)
+
+        self.assertEqual(self.cpu.run_until(pc=0x4002), "pc")
+        self.assertEqual(self.cpu.memory.peek(0x0200), 1)  # handler called
+        self.assertEqual(self.cpu.accu_b.value, 1)  # returned behind the SYNC
+
+    def test_sync_with_masked_interrupt(self):
+        self.cpu.memory.load(0x4000, [
+            0x13,  # 4000| SYNC
+            0x5C,  # 4001| INCB
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.set_cc(0x10)  # IRQ masked
+        self.add_irq_event(500)
+
+        self.assertEqual(self.cpu.run_until(pc=0x4002), "pc")
+        self.assertEqual(self.cpu.memory.peek(0x0200), 0)  # no handler call
+        self.assertEqual(self.cpu.accu_b.value, 1)
+        self.assertEqual(self.cpu.system_stack_pointer.value, 0x1000)
+
+    def test_sync_until_end_of_run(self):
+        self.cpu.memory.load(0x4000, [0x13])  # SYNC
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.run_cycles(100000)
+        self.assertEqual(self.cpu.wait_state, WAIT_SYNC)
+        self.assertEqual(self.cpu.program_counter.value, 0x4000)
+        self.assertLess(self.cpu.cycles, 100000 + 10)
+
+    def test_cwai(self):
+        self.cpu.memory.load(0x4000, [
+            0x3C, 0xEF,  # 4000| CWAI #$EF
+            0x5C,  # 4002| INCB
+        ])
+        self.cpu.program_counter.set(0x4000)
+        self.cpu.set_cc(0xff)
+        self.cpu.accu_b.set(0x41)
+
+        calls = self.add_irq_event(1000)
+        self.cpu.run_cycles(500)
+        self.assertEqual(self.cpu.wait_state, WAIT_CWAI)
+        # The entire state is pushed once:
+        self.assertEqual(self.cpu.system_stack_pointer.value, 0x1000 - 12)
+        self.assertEqual(self.cpu.memory.peek(0x1000 - 12), 0xEF)  # CC with E and without I
+        self.assertEqual(self.cpu.memory.peek(0x1000 - 2), 0x40)  # PC behind CWAI
+        self.assertEqual(self.cpu.memory.peek(0x1000 - 1), 0x02)
+
+        self.assertEqual(self.cpu.run_until(pc=0x5000), "pc")
+        self.assertEqual(calls, [1000])
+        self.assertEqual(self.cpu.system_stack_pointer.value, 0x1000 - 12)  # no second push
+
+        self.assertEqual(self.cpu.run_until(pc=0x4003), "pc")
+        self.assertEqual(self.cpu.memory.peek(0x0200), 1)
+        self.assertEqual(self.cpu.accu_b.value, 0x42)
+        self.assertEqual(self.cpu.system_stack_pointer.value, 0x1000)
+
+
+class TableDispatchWaitStateTestCase(WaitStateTestCase):
+    CPU_CLASS = CPUTableDispatch
+
+
+class BlockCacheWaitStateTestCase(WaitStateTestCase):
+    CPU_CLASS = CPUBlockCache
+
+
+class FastWaitStateTestCase(WaitStateTestCase):
+    CPU_CLASS = CPUFast
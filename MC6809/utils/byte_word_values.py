@@ -94,7 +94,7 @@ def bin2hexline(data, add_addr=True, width=16):
     0144 d0 71 41 da d8 09                               .qA...
     """
     assert isinstance(data, bytes), (
-        f"is type: {type(data)} and not bytes/str: {repr(data)}"
+        f"is type: {type(data)} and not bytes/str: {data!r}"
     )
 
     addr = 0